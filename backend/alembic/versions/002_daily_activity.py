@@ -0,0 +1,53 @@
+"""daily activity rollup
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create daily_activity rollup table
+    op.create_table(
+        'daily_activity',
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('questions_attempted', sa.Integer(), nullable=False),
+        sa.Column('accepted_questions', sa.Integer(), nullable=False),
+        sa.Column('total_submissions', sa.Integer(), nullable=False),
+        sa.Column('easy_count', sa.Integer(), nullable=False),
+        sa.Column('medium_count', sa.Integer(), nullable=False),
+        sa.Column('hard_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('date')
+    )
+
+    # Populate it from existing submissions
+    op.execute("""
+        INSERT INTO daily_activity (
+            date, questions_attempted, accepted_questions, total_submissions,
+            easy_count, medium_count, hard_count
+        )
+        SELECT
+            DATE(s.submitted_at),
+            COUNT(DISTINCT s.question_id),
+            COUNT(DISTINCT CASE WHEN s.status = 'Accepted' THEN s.question_id END),
+            COUNT(*),
+            COUNT(DISTINCT CASE WHEN s.status = 'Accepted' AND q.difficulty = 'easy' THEN s.question_id END),
+            COUNT(DISTINCT CASE WHEN s.status = 'Accepted' AND q.difficulty = 'medium' THEN s.question_id END),
+            COUNT(DISTINCT CASE WHEN s.status = 'Accepted' AND q.difficulty = 'hard' THEN s.question_id END)
+        FROM submissions s
+        JOIN questions q ON s.question_id = q.id
+        GROUP BY DATE(s.submitted_at)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_activity')
@@ -0,0 +1,67 @@
+"""streak state
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create single-row streak_state table
+    op.create_table(
+        'streak_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('current_start', sa.Date(), nullable=True),
+        sa.Column('current_length', sa.Integer(), nullable=False),
+        sa.Column('best_length', sa.Integer(), nullable=False),
+        sa.Column('last_active_date', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Populate it from the daily_activity rollup
+    op.execute("""
+        WITH active_days AS (
+            SELECT date AS solve_date
+            FROM daily_activity
+            WHERE accepted_questions > 0
+        ),
+        streak_groups AS (
+            SELECT
+                solve_date,
+                DATE(solve_date, '-' || ROW_NUMBER() OVER (ORDER BY solve_date) || ' days') AS group_start
+            FROM active_days
+        ),
+        streaks AS (
+            SELECT
+                MIN(solve_date) AS streak_start,
+                MAX(solve_date) AS streak_end,
+                COUNT(*) AS streak_length
+            FROM streak_groups
+            GROUP BY group_start
+        )
+        INSERT INTO streak_state (
+            id, current_start, current_length, best_length, last_active_date
+        )
+        SELECT
+            1,
+            streak_start,
+            streak_length,
+            (SELECT MAX(streak_length) FROM streaks),
+            streak_end
+        FROM streaks
+        ORDER BY streak_end DESC
+        LIMIT 1
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('streak_state')
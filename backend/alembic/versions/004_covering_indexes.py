@@ -0,0 +1,35 @@
+"""covering indexes for stats queries
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Accepted submissions per question (total solved, top tags)
+    op.create_index('idx_submissions_status_question',
+                    'submissions', ['status', 'question_id'])
+
+    # Accepted submissions in a date range (tag stats)
+    op.create_index('idx_submissions_status_submitted_question',
+                    'submissions', ['status', 'submitted_at', 'question_id'])
+
+    # Questions per tag
+    op.create_index('idx_question_tags_tag_question',
+                    'question_tags', ['tag_id', 'question_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_question_tags_tag_question')
+    op.drop_index('idx_submissions_status_submitted_question')
+    op.drop_index('idx_submissions_status_question')
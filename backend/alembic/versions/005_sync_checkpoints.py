@@ -0,0 +1,38 @@
+"""sync checkpoints
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create sync_checkpoints table for resumable backfills
+    op.create_table(
+        'sync_checkpoints',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('title_slug', sa.String(), nullable=True),
+        sa.Column('cursor_offset', sa.Integer(), nullable=False),
+        sa.Column('last_key', sa.String(), nullable=True),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.Column('completed', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sync_checkpoints')
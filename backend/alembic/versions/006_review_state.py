@@ -0,0 +1,155 @@
+"""review state
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from datetime import timedelta
+
+# Schedules written per insert while populating the table
+POPULATE_CHUNK = 500
+
+# SM-2 parameters as of this revision. The fold below is a frozen copy of
+# backend/reviews.py so later changes to the app never change what this
+# migration produces
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+LAPSE_EASE_PENALTY = 0.2
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+LAPSE_INTERVAL_DAYS = 1.0
+MAX_INTERVAL_DAYS = 365.0
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create review_state table for the spaced-repetition queue
+    op.create_table(
+        'review_state',
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('repetitions', sa.Integer(), nullable=False),
+        sa.Column('interval_days', sa.Float(), nullable=False),
+        sa.Column('ease', sa.Float(), nullable=False),
+        sa.Column('lapses', sa.Integer(), nullable=False),
+        sa.Column('failed_attempts', sa.Integer(), nullable=False),
+        sa.Column('last_submission_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_reviewed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('next_due', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('question_id')
+    )
+
+    # Due reviews in order
+    op.create_index('idx_review_state_next_due', 'review_state', ['next_due'])
+
+    # Populate it from existing submissions. The schedule is a sequential
+    # fold over each question's history, so it is computed in Python
+    populate_review_state(op.get_bind())
+
+
+def populate_review_state(connection) -> None:
+    """Fold every question's submissions into its review schedule, as
+    ``rebuild_review_state`` did at this revision."""
+    submissions = sa.table(
+        'submissions',
+        sa.column('question_id', sa.Integer()),
+        sa.column('submitted_at', sa.DateTime()),
+        sa.column('status', sa.String()),
+    )
+    review_state = sa.table(
+        'review_state',
+        sa.column('question_id', sa.Integer()),
+        sa.column('repetitions', sa.Integer()),
+        sa.column('interval_days', sa.Float()),
+        sa.column('ease', sa.Float()),
+        sa.column('lapses', sa.Integer()),
+        sa.column('failed_attempts', sa.Integer()),
+        sa.column('last_submission_at', sa.DateTime(timezone=True)),
+        sa.column('last_reviewed_at', sa.DateTime(timezone=True)),
+        sa.column('next_due', sa.DateTime(timezone=True)),
+    )
+
+    result = connection.execute(
+        sa.select(submissions.c.question_id, submissions.c.submitted_at,
+                  submissions.c.status)
+        .order_by(submissions.c.question_id, submissions.c.submitted_at)
+    )
+    states = []
+    state = None
+    for row in result:
+        if state is None or state['question_id'] != row.question_id:
+            if state is not None:
+                states.append(state)
+            state = _new_state(row.question_id)
+        _apply_submission(state, row.submitted_at, row.status)
+        if len(states) >= POPULATE_CHUNK:
+            connection.execute(review_state.insert(), states)
+            states = []
+    if state is not None:
+        states.append(state)
+    if states:
+        connection.execute(review_state.insert(), states)
+
+
+def _new_state(question_id):
+    return {
+        'question_id': question_id,
+        'repetitions': 0,
+        'interval_days': 0.0,
+        'ease': INITIAL_EASE,
+        'lapses': 0,
+        'failed_attempts': 0,
+        'last_submission_at': None,
+        'last_reviewed_at': None,
+        'next_due': None
+    }
+
+
+def _apply_submission(state, submitted_at, status):
+    """Fold one submission into a schedule (see backend/reviews.py)."""
+    state['last_submission_at'] = submitted_at
+
+    if status != 'Accepted':
+        state['failed_attempts'] += 1
+        if state['repetitions'] > 0 and state['failed_attempts'] == 1:
+            state['lapses'] += 1
+            state['repetitions'] = 0
+            state['ease'] = max(MIN_EASE, state['ease'] - LAPSE_EASE_PENALTY)
+            state['interval_days'] = LAPSE_INTERVAL_DAYS
+            state['next_due'] = submitted_at + timedelta(days=LAPSE_INTERVAL_DAYS)
+        return
+
+    last_reviewed = state['last_reviewed_at']
+    if last_reviewed is not None and submitted_at.date() <= last_reviewed.date():
+        state['failed_attempts'] = 0
+        return
+
+    quality = max(3, 5 - state['failed_attempts'])
+    penalty = 5 - quality
+    state['ease'] = max(
+        MIN_EASE, state['ease'] + 0.1 - penalty * (0.08 + penalty * 0.02))
+    state['repetitions'] += 1
+    if state['repetitions'] == 1:
+        interval = FIRST_INTERVAL_DAYS
+    elif state['repetitions'] == 2:
+        interval = SECOND_INTERVAL_DAYS
+    else:
+        interval = state['interval_days'] * state['ease']
+    state['interval_days'] = min(MAX_INTERVAL_DAYS, interval)
+    state['failed_attempts'] = 0
+    state['last_reviewed_at'] = submitted_at
+    state['next_due'] = submitted_at + timedelta(days=state['interval_days'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_review_state_next_due')
+    op.drop_table('review_state')
@@ -0,0 +1,56 @@
+"""question progress
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create question_progress rollup table
+    op.create_table(
+        'question_progress',
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('first_accepted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_accepted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_submission_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('accepted_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('question_id')
+    )
+
+    # Questions not solved since a cutoff (recommendations)
+    op.create_index('idx_question_progress_last_accepted',
+                    'question_progress', ['last_accepted_at'])
+
+    # Populate it from existing submissions
+    op.execute("""
+        INSERT INTO question_progress (
+            question_id, first_accepted_at, last_accepted_at,
+            last_submission_at, attempts, accepted_count
+        )
+        SELECT
+            question_id,
+            MIN(CASE WHEN status = 'Accepted' THEN submitted_at END),
+            MAX(CASE WHEN status = 'Accepted' THEN submitted_at END),
+            MAX(submitted_at),
+            COUNT(*),
+            SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END)
+        FROM submissions
+        GROUP BY question_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_question_progress_last_accepted')
+    op.drop_table('question_progress')
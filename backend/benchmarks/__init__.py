@@ -0,0 +1,10 @@
+"""
+Benchmarks for the LeetCode Stats backend.
+
+- ``generate``: build a synthetic SQLite database of a given size
+- ``run``: time every crud function and API endpoint against it
+- ``compare``: flag regressions between two result files
+
+Run them as modules from the repository root, e.g.
+``python -m backend.benchmarks.generate --size medium --out bench.db``.
+"""
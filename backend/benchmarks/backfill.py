@@ -0,0 +1,231 @@
+"""
+Backfill throughput benchmark against the fake LeetCode server.
+
+Starts ``backend.benchmarks.fake_leetcode`` in a subprocess, then runs the
+real historical backfill (``LeetCodeService.fetch_historical_data``) into a
+fresh SQLite database once per concurrency level. Each run happens in its
+own interpreter so module-level state (write queue, caches, metrics) never
+leaks between runs.
+
+Reported per run: wall time, stored rows and rows per second, requests and
+their outcomes at the server, peak concurrent requests, time spent throttled
+by the client rate limiter, and peak RSS. ``complete`` says whether every
+generated submission was stored, which only holds without fault injection.
+
+Usage:
+    python -m backend.benchmarks.backfill --questions 300 --submissions 6000 \\
+        --latency-ms 40 --concurrency 1,2,4,8 --rate 1000 --out backfill.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import httpx
+
+from .fake_leetcode import add_arguments
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    """Start the fake server and wait until it answers."""
+    command = [
+        sys.executable, "-m", "backend.benchmarks.fake_leetcode",
+        "--port", str(port),
+        "--questions", str(args.questions),
+        "--submissions", str(args.submissions),
+        "--days", str(args.days),
+        "--seed", str(args.seed),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--rate-429", str(args.rate_429),
+        "--retry-after", str(args.retry_after),
+        "--rps-limit", str(args.rps_limit),
+        "--rate-5xx", str(args.rate_5xx),
+        "--rate-partial", str(args.rate_partial),
+    ]
+    server = subprocess.Popen(command, cwd=REPO_ROOT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Fake LeetCode server exited during startup")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_fake/stats", timeout=1.0)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Fake LeetCode server did not start")
+
+
+def run_backfill(log_level: str) -> Dict:
+    """Run one backfill in this process; meant for a fresh interpreter.
+
+    Settings are read at import time, so the interpreter must be started
+    with the run's environment (see ``_spawn_backfill``).
+    """
+    import logging
+    logging.basicConfig(level=log_level)
+
+    return asyncio.run(_run_backfill())
+
+
+def _spawn_backfill(env: Dict[str, str], log_level: str) -> Dict:
+    """Run ``run_backfill`` in a new interpreter with ``env`` applied."""
+    context = multiprocessing.get_context("spawn")
+    previous = os.environ.copy()
+    os.environ.update(env)
+    try:
+        with context.Pool(1) as pool:
+            return pool.apply(run_backfill, (log_level,))
+    finally:
+        os.environ.clear()
+        os.environ.update(previous)
+
+
+async def _run_backfill() -> Dict:
+    import resource
+    from sqlalchemy import func, select
+
+    from .. import database
+    from ..models import Base, Question, Submission
+    from ..leetcode.service import LeetCodeService
+    from ..write_queue import write_queue
+
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    service = LeetCodeService()
+    if not await service.auth_manager.initialize_session():
+        raise RuntimeError("Could not initialize a session with the fake server")
+
+    start = time.perf_counter()
+    try:
+        await service.fetch_historical_data()
+    except Exception as e:
+        # Recorded in the result's sync_phase rather than aborting the run
+        service.progress.fail(e)
+    elapsed = time.perf_counter() - start
+
+    async with database.ReadSessionLocal() as db:
+        submissions = await db.scalar(select(func.count()).select_from(Submission))
+        questions = await db.scalar(select(func.count()).select_from(Question))
+
+    limiter = service.data_fetcher.rate_limiter.stats()
+    result = {
+        'seconds': round(elapsed, 3),
+        'questions': questions,
+        'submissions': submissions,
+        'rows_per_second': round(submissions / elapsed, 1) if elapsed else None,
+        'client_requests': service.auth_manager.requests_sent,
+        'throttle_wait_seconds': round(limiter['throttle_wait_seconds'], 3),
+        'final_rate': round(limiter['rate'], 3),
+        'sync_phase': service.progress.phase,
+        'sync_error': service.progress.error,
+        'peak_rss_mb': round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+    await service.auth_manager.close()
+    await write_queue.close()
+    await database.engine.dispose()
+    await database.read_engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the historical backfill")
+    add_arguments(parser)
+    parser.add_argument("--concurrency", default="1,2,4,8",
+                        help="Comma-separated BACKFILL_CONCURRENCY values")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="INGEST_QUEUE_SIZE (default: the configured value)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Client request rate; sets LEETCODE_RATE_LIMIT "
+                             "and LEETCODE_RATE_MAX (default: configured values)")
+    parser.add_argument("--burst", type=int, default=None,
+                        help="LEETCODE_RATE_BURST (default: the configured value)")
+    parser.add_argument("--log-level", default="CRITICAL",
+                        help="Log level of the backfill runs")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = _start_server(args, port)
+    base_url = f"http://127.0.0.1:{port}"
+    runs = []
+    try:
+        for concurrency in [int(value) for value in args.concurrency.split(",")]:
+            httpx.post(f"{base_url}/_fake/reset")
+            with tempfile.TemporaryDirectory() as directory:
+                env = {
+                    'DATABASE_URL': f"sqlite+aiosqlite:///{directory}/backfill.db",
+                    'METADATA_CACHE_PATH': '',
+                    'LEETCODE_BASE_URL': base_url,
+                    'LEETCODE_SESSION': 'benchmark',
+                    'BACKFILL_CONCURRENCY': str(concurrency),
+                }
+                if args.queue_size is not None:
+                    env['INGEST_QUEUE_SIZE'] = str(args.queue_size)
+                if args.rate is not None:
+                    env['LEETCODE_RATE_LIMIT'] = str(args.rate)
+                    env['LEETCODE_RATE_MAX'] = str(args.rate)
+                if args.burst is not None:
+                    env['LEETCODE_RATE_BURST'] = str(args.burst)
+
+                result = _spawn_backfill(env, args.log_level)
+
+            server_stats = httpx.get(f"{base_url}/_fake/stats").json()
+            result = {
+                'concurrency': concurrency,
+                **result,
+                'complete': result['submissions'] == server_stats['dataset']['submissions'],
+                'server_requests': sum(server_stats['requests'].values()),
+                'server_responses': server_stats['responses'],
+                'max_in_flight': server_stats['max_in_flight']
+            }
+            runs.append(result)
+            print(f"concurrency {concurrency:3}: {result['seconds']:8.2f}s "
+                  f"{result['rows_per_second']:9.1f} rows/s "
+                  f"{result['server_requests']:6} requests "
+                  f"max in flight {result['max_in_flight']:3} "
+                  f"complete {result['complete']}", file=sys.stderr)
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        'meta': {
+            key: getattr(args, key) for key in (
+                'questions', 'submissions', 'days', 'seed', 'latency_ms',
+                'jitter_ms', 'rate_429', 'retry_after', 'rps_limit',
+                'rate_5xx', 'rate_partial', 'queue_size', 'rate', 'burst')
+        },
+        'runs': runs
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
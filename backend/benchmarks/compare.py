@@ -0,0 +1,93 @@
+"""
+Regression check between two benchmark result files.
+
+A case regresses when its p50 or p99 grows by more than the threshold
+(default 10%) and by more than a small absolute amount, so sub-millisecond
+jitter on very fast cases isn't reported. Cases that started failing are
+regressions too. Exits with status 1 if anything regressed.
+
+Usage:
+    python -m backend.benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+# Differences below this are treated as noise, whatever the ratio
+NOISE_FLOOR_MS = 0.5
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.10,
+            noise_floor_ms: float = NOISE_FLOOR_MS) -> List[Dict]:
+    """Find cases that got slower than the baseline.
+
+    Args:
+        baseline: Dict - Results from ``backend.benchmarks.run``
+        current: Dict - Results to check
+        threshold: float - Allowed relative slowdown
+        noise_floor_ms: float - Allowed absolute slowdown
+
+    Returns:
+        List[Dict]: One entry per regressed case and metric
+    """
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None or before.get('p50_ms') is None:
+            continue
+        if now.get('p50_ms') is None:
+            regressions.append({
+                'case': name, 'metric': 'error',
+                'baseline': None, 'current': now.get('error')
+            })
+            continue
+        for metric in ('p50_ms', 'p99_ms'):
+            old, new = before[metric], now[metric]
+            if new > old * (1 + threshold) and new - old > noise_floor_ms:
+                regressions.append({
+                    'case': name, 'metric': metric,
+                    'baseline': old, 'current': new,
+                    'change': round((new - old) / old, 3) if old else None
+                })
+    return regressions
+
+
+def print_report(regressions: List[Dict], threshold: float):
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}", file=sys.stderr)
+        return
+    print(f"Regressions beyond {threshold:.0%}:", file=sys.stderr)
+    for entry in regressions:
+        if entry['metric'] == 'error':
+            print(f"  {entry['case']}: now failing ({entry['current']})",
+                  file=sys.stderr)
+            continue
+        change = f"+{entry['change']:.0%}" if entry['change'] is not None else "n/a"
+        print(f"  {entry['case']} {entry['metric']}: "
+              f"{entry['baseline']:.3f} -> {entry['current']:.3f} ms ({change})",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--noise-floor-ms", type=float, default=NOISE_FLOOR_MS)
+    args = parser.parse_args()
+
+    regressions = compare(load(args.baseline), load(args.current),
+                          args.threshold, args.noise_floor_ms)
+    print_report(regressions, args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+Local stand-in for the LeetCode GraphQL API.
+
+Serves the operations the ingest path uses (``globalData``,
+``userProblemsSolved``, ``recentAcSubmissions``, ``questionContent`` and
+its aliased ``questionContentBatch`` form, ``userProgressQuestionList`` and
+``submissionList``) from a generated dataset, so the fetcher and the
+backfill can be exercised and tuned without contacting leetcode.com.
+
+Faults can be injected to test the retry and rate limiting behaviour:
+latency with jitter, 429 responses with ``Retry-After`` (at random or above
+a requests-per-second limit), 5xx responses and partial GraphQL ``errors``.
+``globalData`` is never faulted so session setup always succeeds.
+
+Usage:
+    python -m backend.benchmarks.fake_leetcode --questions 500 --port 8765 \\
+        --latency-ms 50 --rate-429 0.02 --rate-5xx 0.01
+    LEETCODE_BASE_URL=http://127.0.0.1:8765 LEETCODE_SESSION=fake \\
+        uvicorn backend.main:app
+
+``GET /_fake/stats`` returns request counters and ``POST /_fake/reset``
+clears them.
+"""
+
+import argparse
+import asyncio
+import heapq
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .generate import STATUSES, TAGS, zipf_weights
+from ..leetcode.fetcher import operation_name
+
+USERNAME = "benchmark_user"
+
+STATUS_CODES = {
+    'Accepted': 10,
+    'Wrong Answer': 11,
+    'Time Limit Exceeded': 14,
+    'Runtime Error': 15,
+    'Compile Error': 20,
+}
+
+LANGS = (('python3', 'Python3'), ('cpp', 'C++'), ('java', 'Java'))
+
+CONTENT = "<p>Return the answer for the given <code>input</code>.</p>\n"
+
+# (id, timestamp, status, lang index), newest first
+SubmissionRow = Tuple[int, int, str, int]
+
+
+@dataclass
+class Faults:
+    """Fault injection settings; rates are probabilities per request."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    rps_limit: float = 0.0  # 429 above this many requests per second (0: off)
+    rate_5xx: float = 0.0
+    rate_partial: float = 0.0
+
+
+class FakeDataset:
+    """Questions and submissions of one synthetic user.
+
+    Submission counts per question are Zipf-skewed and every question has
+    at least one submission, so each appears in the progress list.
+
+    Args:
+        questions: int - Number of attempted questions
+        submissions: int - Total number of submissions
+        days: int - Days of history, ending now
+        seed: int - Random seed, so runs are reproducible
+    """
+
+    def __init__(self, questions: int = 300, submissions: int = 6000,
+                 days: int = 365, seed: int = 42):
+        rng = random.Random(seed)
+        now = int(time.time())
+        tag_weights = zipf_weights(len(TAGS), 1.1)
+        statuses = [name for name, _ in STATUSES]
+        status_weights = [weight for _, weight in STATUSES]
+
+        self.questions: List[Dict] = []
+        self.by_slug: Dict[str, Dict] = {}
+        self.submissions: Dict[str, List[SubmissionRow]] = {}
+
+        counts = Counter(rng.choices(
+            range(questions), zipf_weights(questions, 0.9),
+            k=max(0, submissions - questions)))
+        submission_id = 1
+        for index in range(questions):
+            frontend_id = index + 1
+            slug = f"question-{frontend_id}"
+            difficulty = rng.choices(
+                ['Easy', 'Medium', 'Hard'], [0.26, 0.52, 0.22])[0]
+            tags = sorted(set(rng.choices(
+                range(len(TAGS)), tag_weights, k=rng.randint(1, 4))))
+
+            count = counts[index] + 1
+            seconds = sorted(
+                rng.sample(range(days * 86400), count), reverse=True)
+            rows = []
+            for offset in seconds:
+                rows.append((
+                    submission_id, now - offset,
+                    rng.choices(statuses, status_weights)[0],
+                    rng.randrange(len(LANGS))))
+                submission_id += 1
+
+            question = {
+                'questionId': str(frontend_id),
+                'frontendId': str(frontend_id),
+                'title': f"Question {frontend_id}",
+                'titleSlug': slug,
+                'difficulty': difficulty,
+                'content': CONTENT * rng.randint(3, 20),
+                'topicTags': [
+                    {'name': TAGS[tag], 'id': str(tag + 1),
+                     'slug': TAGS[tag].lower().replace(' ', '-')}
+                    for tag in tags
+                ]
+            }
+            self.questions.append(question)
+            self.by_slug[slug] = question
+            self.submissions[slug] = rows
+
+        self.submission_count = submission_id - 1
+        self._recent_accepted: Optional[List[Tuple[SubmissionRow, str]]] = None
+
+    def recent_accepted(self, limit: int) -> List[Tuple[str, SubmissionRow]]:
+        """Newest accepted submissions across all questions."""
+        if self._recent_accepted is None:
+            accepted = (
+                (row, slug) for slug, rows in self.submissions.items()
+                for row in rows if row[2] == 'Accepted')
+            self._recent_accepted = heapq.nlargest(
+                5000, accepted, key=lambda item: item[0][1])
+        return [(slug, row) for row, slug in self._recent_accepted[:limit]]
+
+    def solved_difficulty_counts(self) -> Dict[str, int]:
+        counts = Counter(
+            question['difficulty'] for question in self.questions
+            if any(row[2] == 'Accepted'
+                   for row in self.submissions[question['titleSlug']]))
+        return {'All': sum(counts.values()), **counts}
+
+
+class FakeLeetCode:
+    """Request handling, fault injection and counters for the fake API."""
+
+    def __init__(self, dataset: FakeDataset, faults: Faults,
+                 seed: Optional[int] = None):
+        self.dataset = dataset
+        self.faults = faults
+        self.rng = random.Random(seed)
+        self.handlers = {
+            'globalData': self._global_data,
+            'userProblemsSolved': self._user_problems_solved,
+            'recentAcSubmissions': self._recent_ac_submissions,
+            'questionContent': self._question_content,
+            'questionContentBatch': self._question_content_batch,
+            'userProgressQuestionList': self._user_progress_question_list,
+            'submissionList': self._submission_list,
+        }
+        self.reset()
+
+    def reset(self):
+        self.requests: Counter = Counter()
+        self.responses: Counter = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._window_start = 0.0
+        self._window_count = 0
+
+    def stats(self) -> Dict:
+        return {
+            'requests': dict(self.requests),
+            'responses': dict(self.responses),
+            'max_in_flight': self.max_in_flight,
+            'dataset': {
+                'questions': len(self.dataset.questions),
+                'submissions': self.dataset.submission_count
+            }
+        }
+
+    def _over_rps_limit(self) -> bool:
+        if not self.faults.rps_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count > self.faults.rps_limit
+
+    async def handle(self, body: Dict) -> JSONResponse:
+        """Answer one GraphQL request, applying the configured faults."""
+        query = body.get('query') or ''
+        operation = body.get('operationName') or operation_name(query)
+        variables = body.get('variables') or {}
+        self.requests[operation] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            faults = self.faults
+            if faults.latency_ms or faults.jitter_ms:
+                delay = faults.latency_ms + self.rng.uniform(
+                    -faults.jitter_ms, faults.jitter_ms)
+                await asyncio.sleep(max(0.0, delay) / 1000)
+
+            handler = self.handlers.get(operation)
+            if handler is None:
+                return self._respond('unknown', {'errors': [
+                    {'message': f"Unknown operation {operation}"}]})
+
+            if operation != 'globalData':
+                if self._over_rps_limit() or self.rng.random() < faults.rate_429:
+                    self.responses['429'] += 1
+                    return JSONResponse(
+                        {'error': 'Too Many Requests'}, status_code=429,
+                        headers={'Retry-After': f"{faults.retry_after:g}"})
+                if self.rng.random() < faults.rate_5xx:
+                    status = self.rng.choice((500, 502, 503))
+                    self.responses[str(status)] += 1
+                    return JSONResponse({'error': 'Server Error'}, status_code=status)
+
+            data = handler(variables)
+            partial = (operation != 'globalData'
+                       and self.rng.random() < faults.rate_partial)
+            if partial:
+                return self._respond('partial', self._partial(data))
+            return self._respond('200', {'data': data})
+        finally:
+            self.in_flight -= 1
+
+    def _respond(self, outcome: str, payload: Dict) -> JSONResponse:
+        self.responses[outcome] += 1
+        return JSONResponse(payload)
+
+    def _partial(self, data: Dict) -> Dict:
+        """Null out one top-level field and report an error for its path."""
+        field = self.rng.choice(list(data))
+        return {
+            'data': {**data, field: None},
+            'errors': [{
+                'message': 'Injected partial failure',
+                'locations': [{'line': 1, 'column': 1}],
+                'path': [field]
+            }]
+        }
+
+    def _global_data(self, variables: Dict) -> Dict:
+        return {
+            'userStatus': {
+                'userId': 1,
+                'isSignedIn': True,
+                'isMockUser': False,
+                'isPremium': False,
+                'isVerified': True,
+                'username': USERNAME,
+                'avatar': None,
+                'isAdmin': False,
+                'isSuperuser': False,
+                'permissions': [],
+                'isTranslator': False,
+                'activeSessionId': 1,
+                'checkedInToday': False,
+                'notificationStatus': {'lastModified': 0, 'numUnread': 0}
+            }
+        }
+
+    def _user_problems_solved(self, variables: Dict) -> Dict:
+        totals = Counter(
+            question['difficulty'] for question in self.dataset.questions)
+        solved = self.dataset.solved_difficulty_counts()
+        difficulties = ['All', 'Easy', 'Medium', 'Hard']
+        return {
+            'allQuestionsCount': [
+                {'difficulty': difficulty,
+                 'count': sum(totals.values()) if difficulty == 'All' else totals[difficulty]}
+                for difficulty in difficulties
+            ],
+            'matchedUser': {
+                'problemsSolvedBeatsStats': [
+                    {'difficulty': difficulty, 'percentage': 50.0}
+                    for difficulty in difficulties[1:]
+                ],
+                'submitStatsGlobal': {
+                    'acSubmissionNum': [
+                        {'difficulty': difficulty, 'count': solved.get(difficulty, 0)}
+                        for difficulty in difficulties
+                    ]
+                }
+            }
+        }
+
+    def _recent_ac_submissions(self, variables: Dict) -> Dict:
+        limit = int(variables.get('limit') or 15)
+        return {
+            'recentAcSubmissionList': [
+                {
+                    'id': str(row[0]),
+                    'title': self.dataset.by_slug[slug]['title'],
+                    'titleSlug': slug,
+                    'timestamp': str(row[1]),
+                    'lang': LANGS[row[3]][0]
+                }
+                for slug, row in self.dataset.recent_accepted(limit)
+            ]
+        }
+
+    def _question_content(self, variables: Dict) -> Dict:
+        return {'question': self.dataset.by_slug.get(variables.get('titleSlug'))}
+
+    def _question_content_batch(self, variables: Dict) -> Dict:
+        return {
+            alias: self.dataset.by_slug.get(slug)
+            for alias, slug in variables.items()
+        }
+
+    def _user_progress_question_list(self, variables: Dict) -> Dict:
+        filters = variables.get('filters') or {}
+        skip = int(filters.get('skip') or 0)
+        limit = int(filters.get('limit') or 50)
+        page = []
+        for question in self.dataset.questions[skip:skip + limit]:
+            rows = self.dataset.submissions[question['titleSlug']]
+            solved = any(row[2] == 'Accepted' for row in rows)
+            page.append({
+                'translatedTitle': None,
+                'frontendId': question['frontendId'],
+                'title': question['title'],
+                'titleSlug': question['titleSlug'],
+                'difficulty': question['difficulty'].upper(),
+                'lastSubmittedAt': rows[0][1],
+                'numSubmitted': len(rows),
+                'questionStatus': 'SOLVED' if solved else 'ATTEMPTED',
+                'lastResult': 'AC' if rows[0][2] == 'Accepted' else 'WA',
+                'topicTags': [
+                    {'name': tag['name'], 'nameTranslated': '', 'slug': tag['slug']}
+                    for tag in question['topicTags']
+                ]
+            })
+        return {
+            'userProgressQuestionList': {
+                'totalNum': len(self.dataset.questions),
+                'questions': page
+            }
+        }
+
+    def _submission_list(self, variables: Dict) -> Dict:
+        slug = variables.get('questionSlug')
+        question = self.dataset.by_slug.get(slug)
+        if question is None:
+            return {'questionSubmissionList': None}
+        offset = int(variables.get('offset') or 0)
+        limit = int(variables.get('limit') or 20)
+        rows = self.dataset.submissions[slug]
+        page = rows[offset:offset + limit]
+        return {
+            'questionSubmissionList': {
+                'lastKey': str(page[-1][0]) if page else None,
+                'hasNext': offset + limit < len(rows),
+                'submissions': [
+                    {
+                        'id': str(submission_id),
+                        'title': question['title'],
+                        'titleSlug': slug,
+                        'status': STATUS_CODES[status],
+                        'statusDisplay': status,
+                        'lang': LANGS[lang][0],
+                        'langName': LANGS[lang][1],
+                        'runtime': f"{40 + submission_id % 60} ms",
+                        'timestamp': str(timestamp),
+                        'url': f"/submissions/detail/{submission_id}/",
+                        'isPending': 'Not Pending',
+                        'memory': f"{16 + submission_id % 5}.{submission_id % 10} MB",
+                        'hasNotes': False,
+                        'notes': '',
+                        'flagType': 'WHITE',
+                        'frontendId': int(question['frontendId']),
+                        'topicTags': [
+                            {'id': tag['id']} for tag in question['topicTags']]
+                    }
+                    for submission_id, timestamp, status, lang in page
+                ]
+            }
+        }
+
+
+def create_app(fake: FakeLeetCode) -> FastAPI:
+    """Build the ASGI app serving a fake LeetCode instance."""
+    app = FastAPI()
+
+    @app.post("/graphql")
+    @app.post("/graphql/")
+    async def graphql(request: Request):
+        return await fake.handle(await request.json())
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return fake.stats()
+
+    @app.post("/_fake/reset")
+    async def reset():
+        fake.reset()
+        return fake.stats()
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Dataset and fault options, shared with the backfill benchmark."""
+    parser.add_argument("--questions", type=int, default=300)
+    parser.add_argument("--submissions", type=int, default=6000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0,
+                        help="Probability of a 429 response")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After seconds sent with 429 responses")
+    parser.add_argument("--rps-limit", type=float, default=0.0,
+                        help="Send 429s above this many requests per second")
+    parser.add_argument("--rate-5xx", type=float, default=0.0,
+                        help="Probability of a 500/502/503 response")
+    parser.add_argument("--rate-partial", type=float, default=0.0,
+                        help="Probability of a partial GraphQL errors response")
+
+
+def faults_from_args(args: argparse.Namespace) -> Faults:
+    return Faults(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rps_limit=args.rps_limit,
+        rate_5xx=args.rate_5xx,
+        rate_partial=args.rate_partial
+    )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake LeetCode GraphQL server")
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    dataset = FakeDataset(args.questions, args.submissions, args.days, args.seed)
+    fake = FakeLeetCode(dataset, faults_from_args(args), seed=args.seed)
+    print(f"Serving {len(dataset.questions)} questions and "
+          f"{dataset.submission_count} submissions on "
+          f"http://{args.host}:{args.port}/graphql", flush=True)
+    uvicorn.run(create_app(fake), host=args.host, port=args.port,
+                log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
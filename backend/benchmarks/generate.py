@@ -0,0 +1,237 @@
+"""
+Synthetic database generator for benchmarks.
+
+Builds a SQLite database with the application schema and realistic, skewed
+data: a LeetCode-like difficulty mix, Zipf-distributed tag popularity and
+question practice, streaky daily activity ending today, and a typical
+status mix. Rollup tables are rebuilt afterwards so the database matches
+what the ingest path would have produced.
+
+Usage:
+    python -m backend.benchmarks.generate --size medium --out bench.db
+    python -m backend.benchmarks.generate --submissions 250000 --out big.db
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from ..models import Base
+from ..rollups import rebuild_rollups
+
+SIZES = {
+    'small': 1_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+
+TAGS = [
+    'Array', 'String', 'Hash Table', 'Dynamic Programming', 'Math', 'Sorting',
+    'Greedy', 'Depth-First Search', 'Binary Search', 'Database',
+    'Breadth-First Search', 'Tree', 'Matrix', 'Two Pointers', 'Binary Tree',
+    'Bit Manipulation', 'Heap (Priority Queue)', 'Stack', 'Prefix Sum',
+    'Simulation', 'Graph', 'Design', 'Counting', 'Sliding Window',
+    'Backtracking', 'Union Find', 'Linked List', 'Enumeration',
+    'Ordered Set', 'Monotonic Stack', 'Trie', 'Number Theory',
+    'Divide and Conquer', 'Recursion', 'Bitmask', 'Queue',
+    'Binary Search Tree', 'Segment Tree', 'Memoization', 'Geometry',
+    'Topological Sort', 'Binary Indexed Tree', 'Hash Function',
+    'Game Theory', 'Shortest Path', 'Combinatorics', 'String Matching',
+    'Interactive', 'Data Stream', 'Rolling Hash', 'Brainteaser',
+    'Randomized', 'Monotonic Queue', 'Merge Sort', 'Iterator',
+    'Concurrency', 'Doubly-Linked List', 'Probability and Statistics',
+    'Quickselect', 'Bucket Sort', 'Suffix Array', 'Minimum Spanning Tree',
+    'Counting Sort', 'Shell', 'Line Sweep', 'Reservoir Sampling',
+    'Strongly Connected Component', 'Eulerian Circuit', 'Radix Sort',
+    'Rejection Sampling', 'Biconnected Component',
+]
+
+DIFFICULTIES = (('easy', 0.26), ('medium', 0.52), ('hard', 0.22))
+
+STATUSES = (
+    ('Accepted', 0.46),
+    ('Wrong Answer', 0.33),
+    ('Time Limit Exceeded', 0.10),
+    ('Runtime Error', 0.08),
+    ('Compile Error', 0.03),
+)
+
+DESCRIPTION = (
+    "<p>Given an integer array <code>nums</code> and an integer "
+    "<code>target</code>, return <em>indices of the two numbers such that "
+    "they add up to <code>target</code></em>.</p>\n"
+)
+
+
+def zipf_weights(count: int, exponent: float) -> List[float]:
+    """Weights proportional to 1 / rank^exponent."""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def activity_days(rng: random.Random, days: int) -> List[int]:
+    """Pick active days (offsets from the first day) as streaky runs.
+
+    A two-state Markov chain makes active days cluster into streaks of
+    realistic length instead of being independently scattered.
+    """
+    active, days_active = [], True
+    for offset in range(days):
+        if days_active:
+            days_active = rng.random() < 0.85
+        else:
+            days_active = rng.random() < 0.35
+        if days_active:
+            active.append(offset)
+    # The newest day is always active so the current streak is non-trivial
+    if not active or active[-1] != days - 1:
+        active.append(days - 1)
+    return active
+
+
+def build_questions(rng: random.Random, count: int) -> Tuple[List[Tuple], List[Tuple]]:
+    """Generate question rows and their question_tags links."""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    tag_weights = zipf_weights(len(TAGS), 1.1)
+    difficulties = [name for name, _ in DIFFICULTIES]
+    difficulty_weights = [weight for _, weight in DIFFICULTIES]
+
+    questions, links = [], []
+    for question_id in range(1, count + 1):
+        difficulty = rng.choices(difficulties, difficulty_weights)[0]
+        description = DESCRIPTION * rng.randint(3, 20)
+        questions.append((
+            question_id, question_id, f"Question {question_id}",
+            f"question-{question_id}", difficulty, description, now, now))
+
+        tag_count = rng.choices([1, 2, 3, 4, 5], [20, 35, 25, 15, 5])[0]
+        tag_ids = set(rng.choices(
+            range(1, len(TAGS) + 1), tag_weights, k=tag_count))
+        links.extend((question_id, tag_id) for tag_id in tag_ids)
+    return questions, links
+
+
+def build_submissions(rng: random.Random, count: int, question_count: int,
+                      days: int) -> List[Tuple]:
+    """Generate submission rows with unique (question_id, submitted_at)."""
+    # Practice concentrates on a user-specific subset of questions
+    practice_order = list(range(1, question_count + 1))
+    rng.shuffle(practice_order)
+    question_weights = zipf_weights(question_count, 0.9)
+
+    active = activity_days(rng, days)
+    # Later days get more submissions, like a growing habit
+    day_weights = [1 + offset / days * 2 for offset in active]
+    first_day = datetime.now().replace(
+        hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+
+    statuses = [name for name, _ in STATUSES]
+    status_weights = [weight for _, weight in STATUSES]
+
+    questions = rng.choices(practice_order, question_weights, k=count)
+    day_offsets = rng.choices(active, day_weights, k=count)
+    status_values = rng.choices(statuses, status_weights, k=count)
+
+    seen = set()
+    rows = []
+    for question_id, offset, status in zip(questions, day_offsets, status_values):
+        second = offset * 86400 + rng.randrange(8 * 3600, 24 * 3600 - 60)
+        while (question_id, second) in seen:
+            second += 1
+        seen.add((question_id, second))
+        submitted_at = first_day + timedelta(seconds=second)
+        rows.append((question_id, submitted_at.strftime(
+            '%Y-%m-%d %H:%M:%S.%f'), status))
+    return rows
+
+
+async def _rebuild_rollups(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with AsyncSession(engine) as db:
+        await rebuild_rollups(db)
+        await db.commit()
+    await engine.dispose()
+
+
+def generate(path: str, submissions: int, questions: int = 3000,
+             days: int = 1095, seed: int = 42) -> Dict[str, int]:
+    """Create a synthetic benchmark database.
+
+    Args:
+        path: str - Output file; an existing file is replaced
+        submissions: int - Number of submissions
+        questions: int - Number of questions
+        days: int - Days of history, ending today
+        seed: int - Random seed, so runs are reproducible
+
+    Returns:
+        Dict[str, int]: Row counts per table
+    """
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    question_rows, link_rows = build_questions(rng, questions)
+    submission_rows = build_submissions(rng, submissions, questions, days)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        conn.executemany(
+            "INSERT INTO tags (id, name) VALUES (?, ?)",
+            list(enumerate(TAGS, start=1)))
+        conn.executemany(
+            "INSERT INTO questions (id, leetcode_id, title, title_slug, "
+            "difficulty, description, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", question_rows)
+        conn.executemany(
+            "INSERT INTO question_tags (question_id, tag_id) VALUES (?, ?)",
+            link_rows)
+        conn.executemany(
+            "INSERT INTO submissions (question_id, submitted_at, status) "
+            "VALUES (?, ?, ?)", submission_rows)
+    conn.execute("ANALYZE")
+    conn.close()
+
+    asyncio.run(_rebuild_rollups(path))
+
+    return {
+        'tags': len(TAGS),
+        'questions': len(question_rows),
+        'question_tags': len(link_rows),
+        'submissions': len(submission_rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a benchmark database")
+    parser.add_argument("--out", required=True, help="Output SQLite file")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--size", choices=SIZES, default="small",
+                      help="Preset submission count (default: small)")
+    size.add_argument("--submissions", type=int, help="Exact submission count")
+    parser.add_argument("--questions", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    submissions = args.submissions or SIZES[args.size]
+    start = time.perf_counter()
+    counts = generate(args.out, submissions, args.questions, args.days, args.seed)
+    print(f"Generated {args.out} in {time.perf_counter() - start:.1f}s: {counts}")
+
+
+if __name__ == "__main__":
+    main()
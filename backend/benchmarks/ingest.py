@@ -0,0 +1,358 @@
+"""
+Write-path benchmarks for DatabaseWriter.
+
+Cases:
+    submissions  Rows per second of ``store_submission`` (two lookups and
+                 a commit per row, the original write path) against
+                 ``store_submissions_bulk``.
+    tags         ``store_tags`` for every question: a cold pass into an empty
+                 tags table, a repeat pass as every poll does, and the
+                 repeat pass again with the tag cache emptied before each
+                 question. Reports time and SQL statements per question.
+    reads        Latency of ``GET /api/v1/overview`` while
+                 ``store_submissions_bulk`` ingests, once with SQLite's
+                 defaults (rollback journal, synchronous FULL, small cache,
+                 no mmap) and once with the configured connection profile.
+
+Data comes from the ``backend.benchmarks.generate`` distributions. Each
+measurement runs in its own interpreter against a fresh temporary
+database, so settings and module-level state (write queue, caches) never
+leak between runs.
+
+Usage:
+    python -m backend.benchmarks.ingest submissions --submissions 5000
+    python -m backend.benchmarks.ingest tags --questions 3000
+    python -m backend.benchmarks.ingest reads --submissions 20000
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from .generate import TAGS, build_questions, build_submissions
+
+SUBMISSION_MODES = ('per-row', 'bulk')
+
+# Connection profiles compared by the reads case; "configured" keeps the
+# SQLITE_* settings
+PROFILES = {
+    'sqlite-defaults': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_CACHE_SIZE': '-2000',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_TEMP_STORE': 'DEFAULT',
+    },
+    'configured': {},
+}
+
+
+def _spawn(env: Dict[str, str], target: Callable, *args) -> Dict:
+    """Run ``target(*args)`` in a new interpreter with ``env`` applied.
+
+    Settings are read at import time, so the environment is set before the
+    child starts and restored afterwards.
+    """
+    context = multiprocessing.get_context("spawn")
+    previous = os.environ.copy()
+    os.environ.update(env)
+    try:
+        with context.Pool(1) as pool:
+            return pool.apply(target, args)
+    finally:
+        os.environ.clear()
+        os.environ.update(previous)
+
+
+def _environment(directory: str) -> Dict[str, str]:
+    return {
+        'DATABASE_URL': f"sqlite+aiosqlite:///{directory}/ingest.db",
+        'METADATA_CACHE_PATH': '',
+        'LOG_FILE': f"{directory}/app.log",
+        'LOG_LEVEL': 'ERROR',
+    }
+
+
+def fetched_submissions(question_count: int, submission_count: int,
+                        days: int, seed: int) -> List[Dict]:
+    """Submissions shaped like the fetcher's output, newest first."""
+    rows = build_submissions(
+        random.Random(seed), submission_count, question_count, days)
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return [
+        {
+            'titleSlug': f"question-{question_id}",
+            'timestamp': str(int(datetime.strptime(
+                submitted_at, '%Y-%m-%d %H:%M:%S.%f').timestamp())),
+            'statusDisplay': status
+        }
+        for question_id, submitted_at, status in rows
+    ]
+
+
+async def _create_database(question_count: int, seed: int):
+    """Create the schema and insert the questions without timing them."""
+    from ..database import engine
+    from ..models import Base, Question
+
+    question_rows, _ = build_questions(random.Random(seed), question_count)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(Question.__table__.insert(), [
+            {'id': row[0], 'leetcode_id': row[1], 'title': row[2],
+             'title_slug': row[3], 'difficulty': row[4], 'description': ''}
+            for row in question_rows
+        ])
+
+
+async def _shutdown():
+    from .. import database
+    from ..write_queue import write_queue
+
+    await write_queue.close()
+    await database.engine.dispose()
+    await database.read_engine.dispose()
+
+
+def run_submissions(mode: str, question_count: int, submission_count: int,
+                    days: int, seed: int) -> Dict:
+    """Store the generated submissions with one write path; meant for a
+    fresh interpreter (see ``_spawn``)."""
+    return asyncio.run(_run_submissions(
+        mode, question_count, submission_count, days, seed))
+
+
+async def _run_submissions(mode: str, question_count: int, submission_count: int,
+                           days: int, seed: int) -> Dict:
+    from sqlalchemy import func, select
+
+    from .. import database
+    from ..leetcode.writer import DatabaseWriter
+    from ..models import Submission
+
+    await _create_database(question_count, seed)
+    submissions = fetched_submissions(question_count, submission_count, days, seed)
+    writer = DatabaseWriter()
+
+    start = time.perf_counter()
+    if mode == 'per-row':
+        for submission in submissions:
+            await writer.store_submission(submission)
+    else:
+        await writer.store_submissions_bulk(submissions)
+    elapsed = time.perf_counter() - start
+
+    async with database.ReadSessionLocal() as db:
+        stored = await db.scalar(select(func.count()).select_from(Submission))
+    await _shutdown()
+    return {
+        'mode': mode,
+        'seconds': round(elapsed, 3),
+        'rows': stored,
+        'rows_per_second': round(stored / elapsed, 1) if elapsed else None
+    }
+
+
+def _submissions_case(args: argparse.Namespace) -> List[Dict]:
+    runs = []
+    for mode in SUBMISSION_MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            result = _spawn(_environment(directory), run_submissions, mode,
+                            args.questions, args.submissions, args.days, args.seed)
+        runs.append(result)
+        print(f"{mode:8}: {result['seconds']:8.2f}s "
+              f"{result['rows_per_second']:9.1f} rows/s "
+              f"({result['rows']} rows)", file=sys.stderr)
+    return runs
+
+
+def run_tags(question_count: int, seed: int) -> Dict:
+    """Store the generated tags of every question in three passes; meant
+    for a fresh interpreter (see ``_spawn``)."""
+    return asyncio.run(_run_tags(question_count, seed))
+
+
+async def _run_tags(question_count: int, seed: int) -> Dict:
+    from sqlalchemy import event, select
+
+    from .. import database
+    from ..leetcode.cache import tag_cache
+    from ..leetcode.writer import DatabaseWriter
+    from ..models import Question
+
+    await _create_database(question_count, seed)
+    _, link_rows = build_questions(random.Random(seed), question_count)
+    tags_by_question: Dict[int, List[Dict]] = {}
+    for question_id, tag_id in link_rows:
+        tags_by_question.setdefault(question_id, []).append(
+            {'name': TAGS[tag_id - 1]})
+
+    async with database.ReadSessionLocal() as db:
+        questions = (await db.execute(
+            select(Question).order_by(Question.id))).scalars().all()
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(database.engine.sync_engine, "before_cursor_execute", count_statement)
+    writer = DatabaseWriter()
+
+    async def store_all(clear_cache: bool) -> Dict:
+        nonlocal statements
+        statements = 0
+        start = time.perf_counter()
+        for question in questions:
+            if clear_cache:
+                tag_cache._ids.clear()
+            await writer.store_tags(question, tags_by_question.get(question.id, []))
+        elapsed = time.perf_counter() - start
+        return {
+            'seconds': round(elapsed, 3),
+            'questions_per_second': round(len(questions) / elapsed, 1),
+            'statements_per_question': round(statements / len(questions), 2)
+        }
+
+    passes = {
+        'cold': await store_all(clear_cache=False),
+        'repeat': await store_all(clear_cache=False),
+        'repeat_uncached': await store_all(clear_cache=True),
+    }
+    await _shutdown()
+    return {
+        'questions': len(questions),
+        'links': len(link_rows),
+        'passes': passes
+    }
+
+
+def _tags_case(args: argparse.Namespace) -> List[Dict]:
+    with tempfile.TemporaryDirectory() as directory:
+        result = _spawn(_environment(directory), run_tags, args.questions, args.seed)
+    for name, summary in result['passes'].items():
+        print(f"{name:16}: {summary['seconds']:8.2f}s "
+              f"{summary['questions_per_second']:9.1f} questions/s "
+              f"{summary['statements_per_question']:6.2f} statements/question",
+              file=sys.stderr)
+    return [result]
+
+
+def run_reads(question_count: int, submission_count: int, days: int,
+              seed: int) -> Dict:
+    """Time overview requests during a bulk ingest; meant for a fresh
+    interpreter with the profile's settings (see ``_spawn``)."""
+    return asyncio.run(_run_reads(question_count, submission_count, days, seed))
+
+
+async def _run_reads(question_count: int, submission_count: int, days: int,
+                     seed: int) -> Dict:
+    import httpx
+
+    from ..config import settings
+    from ..leetcode.writer import DatabaseWriter
+    from ..main import app
+    from ..response_cache import response_cache
+    from .run import summarize
+
+    await _create_database(question_count, seed)
+    submissions = fetched_submissions(question_count, submission_count, days, seed)
+    # The older half is stored up front so reads have data to aggregate
+    preload = len(submissions) // 2
+    writer = DatabaseWriter()
+    await writer.store_submissions_bulk(submissions[preload:])
+
+    samples, errors, error = [], 0, None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport,
+                                 base_url="http://bench") as client:
+        start = time.perf_counter()
+        ingest = asyncio.create_task(
+            writer.store_submissions_bulk(submissions[:preload]))
+        while not ingest.done():
+            response_cache.clear()
+            request_start = time.perf_counter()
+            response = await client.get(f"{settings.API_V1_PREFIX}/overview")
+            if response.status_code >= 400:
+                errors += 1
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                continue
+            samples.append(time.perf_counter() - request_start)
+        await ingest
+        ingest_seconds = time.perf_counter() - start
+
+    await _shutdown()
+    return {
+        'ingest_seconds': round(ingest_seconds, 3),
+        'ingest_rows_per_second': round(preload / ingest_seconds, 1),
+        'reads': summarize(samples, errors, error)
+    }
+
+
+def _reads_case(args: argparse.Namespace) -> List[Dict]:
+    runs = []
+    for profile, profile_env in PROFILES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            result = _spawn({**_environment(directory), **profile_env}, run_reads,
+                            args.questions, args.submissions, args.days, args.seed)
+        runs.append({'profile': profile, **result})
+        reads = result['reads']
+        if reads.get('p50_ms') is None:
+            print(f"{profile:16}: reads failed: {reads['error']}", file=sys.stderr)
+            continue
+        print(f"{profile:16}: {reads['iterations']:5} reads "
+              f"p50 {reads['p50_ms']:8.2f} ms  p99 {reads['p99_ms']:8.2f} ms  "
+              f"max {reads['max_ms']:8.2f} ms  "
+              f"ingest {result['ingest_rows_per_second']:9.1f} rows/s",
+              file=sys.stderr)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DatabaseWriter write paths")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--seed", type=int, default=42)
+    cases = parser.add_subparsers(dest="case", required=True)
+
+    submissions = cases.add_parser(
+        "submissions", help="store_submission vs store_submissions_bulk")
+    submissions.add_argument("--questions", type=int, default=3000)
+    submissions.add_argument("--submissions", type=int, default=5000)
+    submissions.add_argument("--days", type=int, default=365)
+    submissions.set_defaults(run=_submissions_case)
+
+    tags = cases.add_parser("tags", help="store_tags across every question")
+    tags.add_argument("--questions", type=int, default=3000)
+    tags.set_defaults(run=_tags_case)
+
+    reads = cases.add_parser(
+        "reads", help="API read latency during a bulk ingest, per connection profile")
+    reads.add_argument("--questions", type=int, default=3000)
+    reads.add_argument("--submissions", type=int, default=20000)
+    reads.add_argument("--days", type=int, default=365)
+    reads.set_defaults(run=_reads_case)
+
+    args = parser.parse_args()
+    report = {
+        'meta': {key: value for key, value in vars(args).items() if key != 'run'},
+        'runs': args.run(args)
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Benchmark runner for the crud functions and API endpoints.
+
+Every crud function and every endpoint is timed against a database built by
+``backend.benchmarks.generate``. Endpoints go through the real application
+(middleware, routing, serialization) over an in-process ASGI transport; the
+startup event is not run, so nothing contacts LeetCode.
+
+The response cache is cleared before each endpoint call so the numbers
+reflect the query path; pass ``--cache`` to measure cached responses.
+
+Usage:
+    python -m backend.benchmarks.run --db bench.db --out results.json
+    python -m backend.benchmarks.run --db bench.db --baseline results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples: List[float], errors: int, error: str = None) -> Dict:
+    """Summarize latency samples (seconds) in milliseconds."""
+    if not samples:
+        return {'iterations': 0, 'errors': errors, 'error': error}
+    return {
+        'iterations': len(samples),
+        'errors': errors,
+        'error': error,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+        'min_ms': round(min(samples) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3)
+    }
+
+
+async def measure(call: Callable[[], Awaitable], warmup: int,
+                  iterations: int, before: Callable[[], None] = None) -> Dict:
+    """Time repeated calls of one benchmark case.
+
+    Args:
+        call: Callable - Coroutine function to time
+        warmup: int - Untimed calls made first
+        iterations: int - Timed calls
+        before: Callable - Run before every call, outside the timing
+
+    Returns:
+        Dict: Latency summary; a failing case records its error instead of
+        aborting the run
+    """
+    samples, errors, error = [], 0, None
+    for i in range(warmup + iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        try:
+            await call()
+        except Exception as e:
+            errors += 1
+            error = f"{type(e).__name__}: {str(e)[:200]}"
+            continue
+        if i >= warmup:
+            samples.append(time.perf_counter() - start)
+    return summarize(samples, errors, error)
+
+
+def _crud_cases(crud, session_factory) -> Dict[str, Callable[[], Awaitable]]:
+    now = datetime.utcnow()
+    year_ago = now - timedelta(days=365)
+
+    def with_session(func, *args, **kwargs):
+        async def call():
+            async with session_factory() as db:
+                return await func(db, *args, **kwargs)
+        return call
+
+    return {
+        'crud.get_total_solved': with_session(crud.get_total_solved),
+        'crud.get_current_streak': with_session(crud.get_current_streak),
+        'crud.get_best_streak': with_session(crud.get_best_streak),
+        'crud.get_top_tags': with_session(crud.get_top_tags),
+        'crud.get_daily_stats': with_session(crud.get_daily_stats),
+        'crud.get_tag_stats': with_session(crud.get_tag_stats, year_ago, now),
+        'crud.get_recommendations': with_session(crud.get_recommendations),
+        'crud.get_due_reviews': with_session(crud.get_due_reviews),
+    }
+
+
+def _endpoint_cases(client, api_prefix: str,
+                    debug: bool) -> Dict[str, Callable[[], Awaitable]]:
+    today = datetime.utcnow().date()
+    tags_query = (f"start_date={(today - timedelta(days=365)).isoformat()}"
+                  f"&end_date={today.isoformat()}")
+    paths = {
+        'GET /overview': f"{api_prefix}/overview",
+        'GET /daily': f"{api_prefix}/daily",
+        'GET /tags': f"{api_prefix}/tags?{tags_query}",
+        'GET /recommendations/': f"{api_prefix}/",
+        'GET /recommendations/due': f"{api_prefix}/recommendations/due",
+        'GET /sync/status': f"{api_prefix}/sync/status",
+        'GET /metrics': "/metrics",
+    }
+    if debug:
+        paths['GET /debug/queries'] = f"{api_prefix}/debug/queries"
+
+    def get(path):
+        async def call():
+            response = await client.get(path)
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f"HTTP {response.status_code}: {response.text[:200]}")
+        return call
+
+    return {name: get(path) for name, path in paths.items()}
+
+
+async def run(warmup: int, iterations: int, use_cache: bool,
+              only: List[str] = None) -> Dict[str, Dict]:
+    """Run every benchmark case against the configured database."""
+    import httpx
+    from .. import crud
+    from ..config import settings
+    from ..database import ReadSessionLocal, engine, read_engine
+    from ..main import app
+    from ..response_cache import response_cache
+
+    before = None if use_cache else response_cache.clear
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport,
+                                 base_url="http://bench") as client:
+        cases = {
+            **{name: (call, None) for name, call in
+               _crud_cases(crud, ReadSessionLocal).items()},
+            **{name: (call, before) for name, call in
+               _endpoint_cases(client, settings.API_V1_PREFIX,
+                               settings.DEBUG).items()},
+        }
+        for name, (call, hook) in cases.items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            results[name] = await measure(call, warmup, iterations, hook)
+            summary = results[name]
+            if summary.get('p50_ms') is not None:
+                print(f"{name:32} p50 {summary['p50_ms']:9.3f} ms  "
+                      f"p99 {summary['p99_ms']:9.3f} ms", file=sys.stderr)
+            else:
+                print(f"{name:32} failed: {summary['error']}", file=sys.stderr)
+
+    await engine.dispose()
+    await read_engine.dispose()
+    return results
+
+
+def _row_counts(path: str) -> Dict[str, int]:
+    import sqlite3
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('submissions', 'questions', 'tags', 'question_tags')
+        }
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crud functions and endpoints")
+    parser.add_argument("--db", required=True, help="Database built by generate")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--cache", action="store_true",
+                        help="Keep the response cache between calls")
+    parser.add_argument("--only", action="append",
+                        help="Run only cases whose name contains this (repeatable)")
+    parser.add_argument("--baseline", help="Compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist; create it with backend.benchmarks.generate")
+
+    # Settings are read at import time, so configure them before any
+    # application module is imported
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.abspath(args.db)}"
+    os.environ["METADATA_CACHE_PATH"] = ""
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+    results = asyncio.run(run(args.warmup, args.iterations, args.cache, args.only))
+    report = {
+        'meta': {
+            'db': os.path.abspath(args.db),
+            'rows': _row_counts(args.db),
+            'warmup': args.warmup,
+            'iterations': args.iterations,
+            'response_cache': args.cache,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        from .compare import compare, load, print_report
+        regressions = compare(load(args.baseline), report, args.threshold)
+        print_report(regressions, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ This module handles all configuration settings using Pydantic's BaseSettings.
 Settings are loaded from environment variables with sensible defaults.
 """
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 from functools import lru_cache
@@ -17,6 +18,22 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./leetcode_stats.db"
+    SQL_ECHO: bool = False  # Log every SQL statement
+    DB_READ_POOL_SIZE: int = 5  # Read-only connections for the API
+    WRITE_GROUP_MAX_UNITS: int = 32  # Queued writes committed together
+
+    # SQLite connection profile, applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -65536  # Negative values are KiB (64 MB)
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int = 5000  # milliseconds
+
+    # Per-statement timing (see query_stats.py)
+    QUERY_STATS_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0  # Log and explain slower statements
+    QUERY_STATS_MAX_FINGERPRINTS: int = 500
 
     # LeetCode API
     LEETCODE_SESSION: Optional[str] = None
@@ -24,12 +41,43 @@ class Settings(BaseSettings):
     # API Settings
     API_V1_PREFIX: str = "/api/v1"
     DEBUG: bool = False
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256
+    RESPONSE_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # 8 MB
 
     # Polling Settings
     POLL_INTERVAL: int = 300  # 5 minutes
+    BACKFILL_CONCURRENCY: int = 4  # Questions backfilled in parallel
+    INGEST_QUEUE_SIZE: int = 4  # Pages buffered between fetching and writing
     MAX_RETRIES: int = 3
     BACKOFF_FACTOR: float = 2.0
     HISTORICAL_FETCH_LIMIT: int = 5000
+    QUESTION_REFRESH_AGE: int = 604800  # Re-fetch question metadata after 7 days
+
+    # LeetCode HTTP client
+    LEETCODE_BASE_URL: str = "https://leetcode.com"  # Point at a local fake for load tests
+    LEETCODE_HTTP2: bool = False  # Requires the h2 package
+    LEETCODE_MAX_CONNECTIONS: int = 10
+    LEETCODE_MAX_KEEPALIVE: int = 10
+    LEETCODE_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    LEETCODE_CONNECT_TIMEOUT: float = 5.0
+    LEETCODE_READ_TIMEOUT: float = 30.0
+    LEETCODE_WRITE_TIMEOUT: float = 10.0
+    LEETCODE_POOL_TIMEOUT: float = 10.0
+
+    # LeetCode rate limiting (requests per second)
+    LEETCODE_RATE_LIMIT: float = 2.0
+    LEETCODE_RATE_BURST: int = 4
+    LEETCODE_RATE_MIN: float = 0.2
+    LEETCODE_RATE_MAX: float = 5.0
+    LEETCODE_RATE_INCREASE: float = 0.05  # Added per successful request
+    LEETCODE_RATE_DECREASE: float = 0.5  # Removed per 429 response
+
+    # Persistent question metadata cache (empty path disables it; relative
+    # paths are resolved against the backend directory)
+    METADATA_CACHE_PATH: str = "metadata_cache.db"
+    METADATA_CACHE_TTL: int = 2592000  # 30 days
+    METADATA_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MB
+    OFFLINE_MODE: bool = False  # Never call LeetCode; serve cached data only
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -39,6 +87,15 @@ class Settings(BaseSettings):
     # Timezone
     TIMEZONE: str = "UTC"
 
+    @field_validator("METADATA_CACHE_PATH")
+    @classmethod
+    def resolve_metadata_cache_path(cls, path: str) -> str:
+        """Resolve relative paths against the backend directory, so the
+        cache is the same file whatever the working directory."""
+        if not path or os.path.isabs(path):
+            return path
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
     class Config:
         # Get the directory containing this config.py file
         env_file = os.path.join(os.path.dirname(__file__), ".env")
@@ -7,16 +7,18 @@ It provides functions to:
 - Retrieve daily submission counts for visualization
 - Get tag-based statistics
 - Generate personalized problem recommendations
+- List questions due for spaced-repetition review
 
 All functions are async and use SQLAlchemy's async session.
 """
 
-from sqlalchemy import func, select, and_, desc
+from sqlalchemy import func, select, and_, desc, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import List, Optional
-from .models import Question, Tag, Submission
+from .models import Question, Tag, QuestionProgress, ReviewState
 from .schemas import DailyStats, TagStats
+from .recommendations import recommendation_engine, load_question_details
 
 
 async def get_total_solved(db: AsyncSession) -> int:
@@ -29,8 +31,9 @@ async def get_total_solved(db: AsyncSession) -> int:
         int: Total number of unique questions with accepted submissions
     """
     result = await db.execute(
-        select(func.count(func.distinct(Submission.question_id)))
-        .where(Submission.status == 'Accepted')
+        select(func.count())
+        .select_from(QuestionProgress)
+        .where(QuestionProgress.accepted_count > 0)
     )
     return result.scalar()
 
@@ -47,32 +50,9 @@ async def get_current_streak(db: AsyncSession) -> int:
     Returns:
         int: Current streak length (0 if no submissions)
     """
-    # Get all dates with accepted submissions
-    query = """
-    WITH daily_solved AS (
-        SELECT 
-            DATE(submitted_at) as solve_date,
-            COUNT(DISTINCT question_id) as problems_solved
-        FROM submissions
-        WHERE status = 'Accepted'
-        GROUP BY DATE(submitted_at)
-        HAVING problems_solved > 0
-    ),
-    streak_groups AS (
-        SELECT 
-            solve_date,
-            DATE(solve_date, '-' || ROW_NUMBER() OVER (ORDER BY solve_date) || ' days') as group_start
-        FROM daily_solved
-    )
-    SELECT COUNT(*) as current_streak
-    FROM streak_groups
-    WHERE group_start = (
-        SELECT group_start 
-        FROM streak_groups 
-        WHERE solve_date = (SELECT MAX(solve_date) FROM daily_solved)
-    )
-    """
-    result = await db.execute(query)
+    # Maintained incrementally by DatabaseWriter on ingest
+    result = await db.execute(
+        text("SELECT current_length FROM streak_state WHERE id = 1"))
     return result.scalar() or 0
 
 
@@ -88,31 +68,9 @@ async def get_best_streak(db: AsyncSession) -> int:
     Returns:
         int: Best streak length achieved (0 if no submissions)
     """
-    # Similar to current streak but find the maximum streak length
-    query = """
-    WITH daily_solved AS (
-        SELECT 
-            DATE(submitted_at) as solve_date,
-            COUNT(DISTINCT question_id) as problems_solved
-        FROM submissions
-        WHERE status = 'Accepted'
-        GROUP BY DATE(submitted_at)
-        HAVING problems_solved > 0
-    ),
-    streak_groups AS (
-        SELECT 
-            solve_date,
-            DATE(solve_date, '-' || ROW_NUMBER() OVER (ORDER BY solve_date) || ' days') as group_start
-        FROM daily_solved
-    )
-    SELECT MAX(streak_length) as best_streak
-    FROM (
-        SELECT COUNT(*) as streak_length
-        FROM streak_groups
-        GROUP BY group_start
-    )
-    """
-    result = await db.execute(query)
+    # Maintained incrementally by DatabaseWriter on ingest
+    result = await db.execute(
+        text("SELECT best_length FROM streak_state WHERE id = 1"))
     return result.scalar() or 0
 
 
@@ -129,16 +87,16 @@ async def get_top_tags(db: AsyncSession, limit: int = 5) -> List[TagStats]:
     query = """
     SELECT 
         t.name,
-        COUNT(DISTINCT s.question_id) as count
+        COUNT(*) as count
     FROM tags t
     JOIN question_tags qt ON t.id = qt.tag_id
-    JOIN submissions s ON qt.question_id = s.question_id
-    WHERE s.status = 'Accepted'
+    JOIN question_progress qp ON qt.question_id = qp.question_id
+    WHERE qp.accepted_count > 0
     GROUP BY t.name
     ORDER BY count DESC
     LIMIT :limit
     """
-    result = await db.execute(query, {"limit": limit})
+    result = await db.execute(text(query), {"limit": limit})
     return [TagStats(tag=row.name, count=row.count) for row in result]
 
 
@@ -164,16 +122,16 @@ async def get_daily_stats(
 
     query = """
     SELECT 
-        DATE(submitted_at) as date,
-        COUNT(DISTINCT question_id) as count
-    FROM submissions
-    WHERE submitted_at BETWEEN :start_date AND :end_date
-    GROUP BY DATE(submitted_at)
+        date,
+        questions_attempted as count
+    FROM daily_activity
+    WHERE date BETWEEN :start_date AND :end_date
     ORDER BY date
     """
     result = await db.execute(
-        query,
-        {"start_date": start_date, "end_date": end_date}
+        text(query),
+        {"start_date": start_date.date().isoformat(),
+         "end_date": end_date.date().isoformat()}
     )
     return [DailyStats(date=str(row.date), count=row.count) for row in result]
 
@@ -214,7 +172,7 @@ async def get_tag_stats(
     ORDER BY total_solved DESC
     """
     result = await db.execute(
-        query,
+        text(query),
         {"start_date": start_date, "end_date": end_date}
     )
     return [
@@ -236,6 +194,10 @@ async def get_recommendations(
 ) -> List[dict]:
     """Get personalized problem recommendations.
 
+    Recommends previously solved problems that haven't been solved again in
+    the last ``days_not_attempted`` days, sampled at random from cached
+    per-difficulty candidate pools (see recommendations.py).
+
     Args:
         db: AsyncSession - The database session
         difficulty_counts: dict[str, int] - Number of problems to return for each difficulty
@@ -252,67 +214,59 @@ async def get_recommendations(
     if difficulty_counts is None:
         difficulty_counts = {"easy": 3, "medium": 2, "hard": 2}
 
-    query = """
-    WITH recently_solved AS (
-        SELECT DISTINCT question_id
-        FROM submissions
-        WHERE status = 'Accepted'
-        AND submitted_at >= CURRENT_DATE - INTERVAL ':days days'
-    ),
-    candidates AS (
-        SELECT 
-            q.id,
-            q.title,
-            q.difficulty,
-            t.name as tag_name
-        FROM questions q
-        JOIN submissions s ON q.id = s.question_id
-        LEFT JOIN question_tags qt ON q.id = qt.question_id
-        LEFT JOIN tags t ON qt.tag_id = t.id
-        WHERE s.status = 'Accepted'
-        AND q.id NOT IN (SELECT question_id FROM recently_solved)
-    ),
-    ranked_candidates AS (
-        SELECT 
-            id,
-            title,
-            difficulty,
-            tag_name,
-            ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY RANDOM()) as rn
-        FROM candidates
-    ),
-    difficulty_counts AS (
-        SELECT difficulty, COUNT(*) as count
-        FROM ranked_candidates
-        GROUP BY difficulty
-    )
-    SELECT 
-        rc.id,
-        rc.title,
-        rc.difficulty,
-        rc.tag_name
-    FROM ranked_candidates rc
-    JOIN difficulty_counts dc ON rc.difficulty = dc.difficulty
-    WHERE (rc.difficulty = 'easy' AND rc.rn <= LEAST(:easy_count, dc.count))
-       OR (rc.difficulty = 'medium' AND rc.rn <= LEAST(:medium_count, dc.count))
-       OR (rc.difficulty = 'hard' AND rc.rn <= LEAST(:hard_count, dc.count))
-    ORDER BY rc.difficulty, rc.rn
+    return await recommendation_engine.recommend(
+        db, difficulty_counts, days_not_attempted)
+
+
+async def get_due_reviews(
+    db: AsyncSession,
+    limit: int = 10,
+    now: Optional[datetime] = None
+) -> dict:
+    """Get the questions whose spaced-repetition review is due.
+
+    Reads the review_state rows maintained by DatabaseWriter through the
+    next_due index, so the cost depends on ``limit``, not on the number of
+    submissions.
+
+    Args:
+        db: AsyncSession - The database session
+        limit: int - Maximum number of questions to return (default: 10)
+        now: Optional[datetime] - Reference time (default: current time)
+
+    Returns:
+        dict: ``total_due`` and the ``due`` questions, most overdue first,
+        with their schedule
     """
+    if now is None:
+        now = datetime.now()
+
     result = await db.execute(
-        query,
-        {
-            "days": days_not_attempted,
-            "easy_count": difficulty_counts.get("easy", 3),
-            "medium_count": difficulty_counts.get("medium", 2),
-            "hard_count": difficulty_counts.get("hard", 2)
-        }
+        select(ReviewState)
+        .where(ReviewState.next_due <= now)
+        .order_by(ReviewState.next_due)
+        .limit(limit)
     )
-    return [
-        {
-            "id": row.id,
-            "title": row.title,
-            "difficulty": row.difficulty,
-            "tags": [row.tag_name] if row.tag_name else []
-        }
-        for row in result
-    ]
+    states = result.scalars().all()
+    total_due = await db.scalar(
+        select(func.count()).select_from(ReviewState)
+        .where(ReviewState.next_due <= now)
+    )
+
+    details = await load_question_details(
+        db, [state.question_id for state in states])
+    due = []
+    for state in states:
+        question = details.get(state.question_id)
+        if question is None:
+            continue
+        due.append({
+            **question,
+            "next_due": state.next_due,
+            "overdue_days": round((now - state.next_due).total_seconds() / 86400, 2),
+            "interval_days": round(state.interval_days, 2),
+            "ease": round(state.ease, 2),
+            "repetitions": state.repetitions,
+            "lapses": state.lapses
+        })
+    return {"total_due": total_due, "due": due}
@@ -1,8 +1,12 @@
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from .config import settings
+from .query_stats import instrument, query_stats
 
 load_dotenv()
 
@@ -25,15 +29,77 @@ else:
 db_path = Path(DATABASE_URL.replace("sqlite+aiosqlite:///", ""))
 db_path.parent.mkdir(parents=True, exist_ok=True)
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Writes go through a single connection owned by the write queue
+# (see write_queue.py), so the writer pool holds exactly one connection
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=1,
+    max_overflow=0
+)
+
+# API reads use a separate pool of read-only connections; under WAL they
+# never wait on the writer
+READ_DATABASE_URL = f"sqlite+aiosqlite:///file:{db_path}?mode=ro&uri=true"
+read_engine = create_async_engine(
+    READ_DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_READ_POOL_SIZE
+)
+
+
+def apply_sqlite_profile(dbapi_connection, read_only: bool = False) -> None:
+    """Apply the configured SQLite pragmas to a new DBAPI connection.
+
+    Read-only connections skip journal_mode, which they cannot change; the
+    writer's WAL setting is persisted in the database file.
+    """
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+    }
+    if read_only:
+        del pragmas["journal_mode"]
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    apply_sqlite_profile(dbapi_connection)
+
+
+@event.listens_for(read_engine.sync_engine, "connect")
+def _on_read_connect(dbapi_connection, connection_record):
+    apply_sqlite_profile(dbapi_connection, read_only=True)
+
+
+# Time every statement on both engines
+if settings.QUERY_STATS_ENABLED:
+    instrument(engine.sync_engine, query_stats)
+    instrument(read_engine.sync_engine, query_stats)
+
+
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 Base = declarative_base()
 
 
 async def get_db():
-    async with AsyncSessionLocal() as session:
+    """Yield a read-only session; writes go through DatabaseWriter."""
+    async with ReadSessionLocal() as session:
         try:
             yield session
         finally:
@@ -1,7 +1,9 @@
 import httpx
+import importlib.util
 from typing import Optional, Dict
 import logging
 from .config import LEETCODE_SESSION, validate_session_token
+from ..config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +17,79 @@ class AuthenticationManager:
             )
         self.session_token = LEETCODE_SESSION
         self.session: Optional[httpx.AsyncClient] = None
-        self.base_url = "https://leetcode.com"
+        self.base_url = settings.LEETCODE_BASE_URL.rstrip('/')
         self.graphql_url = f"{self.base_url}/graphql"
+        self._auth_headers = {
+            'Content-Type': 'application/json',
+            'Cookie': f'LEETCODE_SESSION={self.session_token}'
+        }
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
         logger.info("Initialized AuthenticationManager")
 
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create the shared HTTP client with tuned pooling and timeouts.
+
+        Session and browser headers are set once as client defaults, so
+        individual requests don't rebuild them.
+        """
+        http2 = settings.LEETCODE_HTTP2
+        if http2 and importlib.util.find_spec('h2') is None:
+            logger.warning(
+                "LEETCODE_HTTP2 is enabled but the h2 package is not installed; "
+                "falling back to HTTP/1.1")
+            http2 = False
+
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+            'Accept': '*/*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Origin': self.base_url,
+            'Referer': self.base_url,
+            **self._auth_headers
+        }
+
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            http2=http2,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=settings.LEETCODE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LEETCODE_MAX_KEEPALIVE,
+                keepalive_expiry=settings.LEETCODE_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.LEETCODE_CONNECT_TIMEOUT,
+                read=settings.LEETCODE_READ_TIMEOUT,
+                write=settings.LEETCODE_WRITE_TIMEOUT,
+                pool=settings.LEETCODE_POOL_TIMEOUT
+            ),
+            event_hooks={'request': [self._on_request]}
+        )
+
+    async def _on_request(self, request: httpx.Request):
+        """Count requests and attach a trace hook for connection events."""
+        self.requests_sent += 1
+        request.extensions['trace'] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict):
+        if event_name == 'connection.connect_tcp.complete':
+            self.connections_opened += 1
+        elif event_name == 'connection.start_tls.complete':
+            self.tls_handshakes += 1
+
+    def connection_stats(self) -> Dict[str, float]:
+        """Get request and connection counters for the shared client."""
+        reused = max(0, self.requests_sent - self.connections_opened)
+        return {
+            'requests': self.requests_sent,
+            'connections_opened': self.connections_opened,
+            'tls_handshakes': self.tls_handshakes,
+            'connection_reuse_ratio': (
+                reused / self.requests_sent if self.requests_sent else 0.0)
+        }
+
     async def initialize_session(self) -> bool:
         """Initialize the session with the provided token."""
         if not self.session_token:
@@ -29,21 +100,9 @@ class AuthenticationManager:
         try:
             logger.info("Initializing session with existing token...")
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                'Content-Type': 'application/json',
-                'Accept': '*/*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Origin': self.base_url,
-                'Referer': self.base_url,
-                'Cookie': f'LEETCODE_SESSION={self.session_token}'
-            }
-
             # Create a new client if one doesn't exist
             if not self.session:
-                self.session = httpx.AsyncClient(follow_redirects=True)
+                self.session = self._create_client()
 
             # Test the session with a simple query
             test_query = {
@@ -60,8 +119,7 @@ class AuthenticationManager:
 
             response = await self.session.post(
                 self.graphql_url,
-                json=test_query,
-                headers=headers
+                json=test_query
             )
 
             if response.status_code != 200:
@@ -97,18 +155,21 @@ class AuthenticationManager:
         logger.debug("Session exists, no refresh needed")
         return True
 
-    async def get_auth_headers(self) -> Dict[str, str]:
-        """Get headers with valid session for GraphQL requests."""
+    async def ensure_session(self) -> httpx.AsyncClient:
+        """Get the shared client, initializing the session if needed."""
         if not await self.refresh_session():
             logger.error("Failed to refresh session")
             raise Exception("Failed to refresh session")
+        return self.session
 
-        headers = {
-            'Content-Type': 'application/json',
-            'Cookie': f'LEETCODE_SESSION={self.session_token}'
-        }
-        logger.debug("Generated auth headers with session cookie")
-        return headers
+    async def get_auth_headers(self) -> Dict[str, str]:
+        """Get headers with valid session for GraphQL requests.
+
+        The shared client already sends these by default; they are returned
+        for callers that issue requests through another client.
+        """
+        await self.ensure_session()
+        return self._auth_headers
 
     async def close(self):
         """Close the session."""
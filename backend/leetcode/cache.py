@@ -0,0 +1,94 @@
+from typing import Dict, Optional, Tuple
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from ..models import Question, Tag
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionCache:
+    """In-memory title slug -> question id map backed by the questions table.
+
+    Entries remember when the question row was last refreshed so callers can
+    re-fetch metadata once it is older than ``refresh_age`` seconds.
+    """
+
+    def __init__(self, refresh_age: int):
+        self.refresh_age = timedelta(seconds=refresh_age)
+        self._entries: Dict[str, Tuple[int, datetime]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def warm(self, db: AsyncSession) -> int:
+        """Load every known question from the database.
+
+        Returns:
+            int: Number of cached questions
+        """
+        # Questions stored without a description still need a metadata fetch
+        result = await db.execute(
+            select(Question.title_slug, Question.id, Question.updated_at)
+            .where(func.length(Question.description) > 0)
+        )
+        for row in result:
+            self._entries[row.title_slug] = (row.id, row.updated_at)
+        logger.info(f"Warmed question cache with {len(self._entries)} questions")
+        return len(self._entries)
+
+    def get(self, title_slug: str) -> Optional[int]:
+        """Get the question id for a slug if its metadata is still fresh."""
+        entry = self._entries.get(title_slug)
+        if entry is None or datetime.utcnow() - entry[1] > self.refresh_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def put(self, title_slug: str, question_id: int,
+            updated_at: Optional[datetime] = None):
+        """Record a question whose metadata was just stored."""
+        self._entries[title_slug] = (question_id, updated_at or datetime.utcnow())
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class TagCache:
+    """Process-wide tag name -> tag id map backed by the tags table.
+
+    Tag ids never change once assigned, so entries are never invalidated.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    async def warm(self, db: AsyncSession) -> int:
+        """Load every known tag from the database.
+
+        Returns:
+            int: Number of cached tags
+        """
+        result = await db.execute(select(Tag.name, Tag.id))
+        self._ids.update({row.name: row.id for row in result})
+        logger.info(f"Warmed tag cache with {len(self._ids)} tags")
+        return len(self._ids)
+
+    def get(self, name: str) -> Optional[int]:
+        """Get the id of a tag, if known."""
+        return self._ids.get(name)
+
+    def update(self, ids: Dict[str, int]):
+        """Record tag ids read back from the database."""
+        self._ids.update(ids)
+
+
+# Shared by every DatabaseWriter in the process
+tag_cache = TagCache()
@@ -0,0 +1,266 @@
+from typing import Dict, List, Optional
+import json
+import logging
+import math
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..models import Question, QuestionProgress, SyncCheckpoint
+from ..write_queue import WriteQueue, write_queue
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'progress'
+
+
+def question_key(title_slug: str) -> str:
+    """Checkpoint key for a question's submission pages."""
+    return f"question:{title_slug}"
+
+
+class SyncCheckpoints:
+    """Persists backfill progress so an interrupted run can resume.
+
+    Reads take a caller's session; writes go through the write queue like
+    every other write and are logged rather than raised, so a failed
+    checkpoint only costs re-fetching a page.
+    """
+
+    def __init__(self, queue: WriteQueue = write_queue):
+        self.queue = queue
+
+    async def load_progress(self, db: AsyncSession) -> Optional[Dict]:
+        """Get the solved-question list checkpoint.
+
+        Returns:
+            Optional[Dict]: ``offset``, ``total`` and ``completed``, or None
+            if no backfill is in progress
+        """
+        checkpoint = await db.get(SyncCheckpoint, PROGRESS_KEY)
+        if checkpoint is None:
+            return None
+        return {
+            'offset': checkpoint.cursor_offset,
+            'total': checkpoint.total,
+            'completed': checkpoint.completed
+        }
+
+    async def pending_questions(self, db: AsyncSession) -> List[Dict]:
+        """Get the questions whose submissions still need fetching.
+
+        Returns:
+            List[Dict]: ``question`` (the solved-list entry) and ``resume``
+            (``offset``, ``last_key`` and ``watermark``) per question
+        """
+        result = await db.execute(
+            select(SyncCheckpoint)
+            .where(SyncCheckpoint.kind == 'question',
+                   SyncCheckpoint.completed.is_(False))
+            .order_by(SyncCheckpoint.key)
+        )
+        return [
+            {
+                'question': json.loads(checkpoint.payload),
+                'resume': {
+                    'offset': checkpoint.cursor_offset,
+                    'last_key': checkpoint.last_key,
+                    'watermark': checkpoint.watermark
+                }
+            }
+            for checkpoint in result.scalars()
+        ]
+
+    async def record_progress_page(
+        self,
+        questions: List[Dict],
+        next_offset: int,
+        total: Optional[int],
+        completed: bool
+    ) -> bool:
+        """Queue a page of questions with new activity and advance the scan.
+
+        Both are written in one transaction. Questions that already have a
+        checkpoint keep it, along with its cursor and watermark.
+
+        Args:
+            questions: List[Dict] - Solved-list entries with new activity
+            next_offset: int - ``skip`` of the next page to request
+            total: Optional[int] - ``totalNum`` reported by the list
+            completed: bool - Whether this was the last page
+
+        Returns:
+            bool: True if the checkpoint was saved
+        """
+        try:
+            return await self.queue.submit(
+                lambda db: self._record_progress_page(
+                    db, questions, next_offset, total, completed))
+        except Exception as e:
+            logger.error(
+                f"Error saving progress checkpoint: {str(e)}", exc_info=True)
+            return False
+
+    @staticmethod
+    async def _record_progress_page(
+        db: AsyncSession,
+        questions: List[Dict],
+        next_offset: int,
+        total: Optional[int],
+        completed: bool
+    ) -> bool:
+        if questions:
+            slugs = [question['titleSlug'] for question in questions]
+            result = await db.execute(
+                select(Question.title_slug, QuestionProgress.last_submission_at)
+                .join(QuestionProgress, QuestionProgress.question_id == Question.id)
+                .where(Question.title_slug.in_(slugs))
+            )
+            watermarks = dict(result.all())
+
+            stmt = sqlite_insert(SyncCheckpoint).values([
+                {
+                    'key': question_key(question['titleSlug']),
+                    'kind': 'question',
+                    'title_slug': question['titleSlug'],
+                    'cursor_offset': 0,
+                    'watermark': watermarks.get(question['titleSlug']),
+                    'total': question.get('numSubmitted'),
+                    'payload': json.dumps(question),
+                    'completed': False
+                }
+                for question in questions
+            ])
+            await db.execute(stmt.on_conflict_do_nothing())
+
+        stmt = sqlite_insert(SyncCheckpoint).values(
+            key=PROGRESS_KEY,
+            kind='progress',
+            cursor_offset=next_offset,
+            total=total,
+            completed=completed
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['key'],
+            set_={
+                'cursor_offset': stmt.excluded.cursor_offset,
+                'total': stmt.excluded.total,
+                'completed': stmt.excluded.completed,
+                'updated_at': func.now()
+            }
+        )
+        await db.execute(stmt)
+        return True
+
+    async def record_question_page(
+        self,
+        title_slug: str,
+        next_offset: int,
+        last_key: Optional[str],
+        completed: bool
+    ) -> bool:
+        """Advance a question's submission cursor.
+
+        Call this after the page's submissions have been stored.
+
+        Args:
+            title_slug: str - Question title slug
+            next_offset: int - Offset of the next page to request
+            last_key: Optional[str] - Cursor returned with the page
+            completed: bool - Whether no older submissions remain
+
+        Returns:
+            bool: True if the checkpoint was saved
+        """
+        try:
+            return await self.queue.submit(
+                lambda db: self._record_question_page(
+                    db, title_slug, next_offset, last_key, completed))
+        except Exception as e:
+            logger.error(
+                f"Error saving checkpoint for question {title_slug}: {str(e)}", exc_info=True)
+            return False
+
+    @staticmethod
+    async def _record_question_page(
+        db: AsyncSession,
+        title_slug: str,
+        next_offset: int,
+        last_key: Optional[str],
+        completed: bool
+    ) -> bool:
+        checkpoint = await db.get(SyncCheckpoint, question_key(title_slug))
+        if checkpoint is None:
+            return False
+        checkpoint.cursor_offset = next_offset
+        checkpoint.last_key = last_key
+        checkpoint.completed = completed
+        checkpoint.updated_at = func.now()
+        return True
+
+    async def clear_completed(self) -> bool:
+        """Delete finished checkpoints once a backfill run ends.
+
+        Completed questions are removed. The progress row is removed once the
+        solved-question scan has finished, so the next run scans afresh while
+        still resuming any question that failed.
+
+        Returns:
+            bool: True if the checkpoints were cleared
+        """
+        try:
+            return await self.queue.submit(self._clear_completed)
+        except Exception as e:
+            logger.error(
+                f"Error clearing sync checkpoints: {str(e)}", exc_info=True)
+            return False
+
+    @staticmethod
+    async def _clear_completed(db: AsyncSession) -> bool:
+        await db.execute(
+            delete(SyncCheckpoint).where(SyncCheckpoint.completed.is_(True)))
+        return True
+
+    @staticmethod
+    async def status(db: AsyncSession, progress_page_size: int,
+                     submission_page_size: int) -> Dict:
+        """Summarize backfill progress.
+
+        The remaining request estimate assumes full pages: the rest of the
+        solved-question list plus, per pending question, its remaining
+        submissions (at least one request each).
+
+        Args:
+            db: AsyncSession - Database session
+            progress_page_size: int - Questions per solved-list request
+            submission_page_size: int - Submissions per submission request
+
+        Returns:
+            Dict: Scan offset/total/completion, question counts and
+            ``estimated_requests``
+        """
+        result = await db.execute(select(SyncCheckpoint))
+        checkpoints = result.scalars().all()
+
+        progress = next(
+            (c for c in checkpoints if c.kind == 'progress'), None)
+        questions = [c for c in checkpoints if c.kind == 'question']
+        pending = [c for c in questions if not c.completed]
+
+        estimated = 0
+        if progress is not None and not progress.completed:
+            remaining = (progress.total or 0) - progress.cursor_offset
+            estimated += max(1, math.ceil(remaining / progress_page_size))
+        for checkpoint in pending:
+            remaining = (checkpoint.total or 0) - checkpoint.cursor_offset
+            estimated += max(1, math.ceil(remaining / submission_page_size))
+
+        return {
+            'in_progress': bool(checkpoints),
+            'scan_offset': progress.cursor_offset if progress else None,
+            'scan_total': progress.total if progress else None,
+            'scan_completed': progress.completed if progress else None,
+            'questions_pending': len(pending),
+            'questions_completed': len(questions) - len(pending),
+            'estimated_requests': estimated
+        }
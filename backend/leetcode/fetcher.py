@@ -1,23 +1,78 @@
 import httpx
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 import logging
 from datetime import datetime
 import asyncio
 import json
+import re
+import time
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import select
 
 from .auth import AuthenticationManager
+from .rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from .metadata_store import MetadataStore
+from ..config import settings
+from ..models import Question, QuestionProgress
+from ..metrics import graphql_latency, graphql_retries, graphql_throttled
 
 logger = logging.getLogger(__name__)
 
+# Page sizes for the solved-question list and per-question submission list
+PROGRESS_PAGE_SIZE = 50
+SUBMISSION_PAGE_SIZE = 20
+
+OPERATION_NAME = re.compile(r'\b(?:query|mutation)\s+(\w+)')
+
+
+@lru_cache(maxsize=64)
+def operation_name(query: str) -> str:
+    """Get the GraphQL operation name of a query, for metric labels."""
+    match = OPERATION_NAME.search(query)
+    return match.group(1) if match else 'anonymous'
+
+# Fields selected for every question metadata lookup
+QUESTION_FIELDS = """
+                questionId
+                frontendId: questionFrontendId
+                title
+                titleSlug
+                difficulty
+                content
+                topicTags {
+                    name
+                    id
+                    slug
+                }
+            """
+
 
 class LeetCodeDataFetcher:
-    def __init__(self, auth_manager: AuthenticationManager):
+    def __init__(self, auth_manager: AuthenticationManager,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 metadata_store: Optional[MetadataStore] = None):
         self.auth_manager = auth_manager
-        self.base_url = "https://leetcode.com/graphql"
+        self.base_url = auth_manager.graphql_url
         self.retry_delay = 1.0  # Initial delay in seconds
         self.max_retries = 3
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(
+            rate=settings.LEETCODE_RATE_LIMIT,
+            burst=settings.LEETCODE_RATE_BURST,
+            min_rate=settings.LEETCODE_RATE_MIN,
+            max_rate=settings.LEETCODE_RATE_MAX,
+            increase=settings.LEETCODE_RATE_INCREASE,
+            decrease=settings.LEETCODE_RATE_DECREASE
+        )
+        # An empty path disables the persistent metadata cache
+        self.metadata_store = metadata_store
+        if self.metadata_store is None and settings.METADATA_CACHE_PATH:
+            self.metadata_store = MetadataStore(
+                settings.METADATA_CACHE_PATH,
+                QUESTION_FIELDS,
+                ttl=settings.METADATA_CACHE_TTL,
+                max_bytes=settings.METADATA_CACHE_MAX_BYTES
+            )
         self._username = None
         logger.info("Initialized LeetCodeDataFetcher")
 
@@ -32,32 +87,55 @@ class LeetCodeDataFetcher:
             return self._username
         return None
 
-    async def _execute_query(self, query: str, variables: Dict) -> Optional[Dict]:
-        """Execute a GraphQL query with retry logic."""
+    async def _execute_query(self, query: str, variables: Dict,
+                             allow_partial: bool = False) -> Optional[Dict]:
+        """Execute a GraphQL query with retry logic.
+
+        Results containing GraphQL ``errors`` are treated as failures unless
+        ``allow_partial`` is set, in which case they are returned as-is so
+        the caller can use whatever data did resolve. In offline mode no
+        request is made and None is returned.
+        """
+        if settings.OFFLINE_MODE:
+            logger.debug("Offline mode, skipping GraphQL query")
+            return None
+
+        operation = operation_name(query)
         for attempt in range(self.max_retries):
+            if attempt:
+                graphql_retries.labels(operation).inc()
             try:
                 logger.debug(
                     f"Executing GraphQL query (attempt {attempt + 1}/{self.max_retries})")
-                headers = await self.auth_manager.get_auth_headers()
-                response = await self.auth_manager.session.post(
+                client = await self.auth_manager.ensure_session()
+                await self.rate_limiter.acquire()
+                start = time.perf_counter()
+                response = await client.post(
                     self.base_url,
-                    json={'query': query, 'variables': variables},
-                    headers=headers
+                    json={'query': query, 'variables': variables}
                 )
+                graphql_latency.labels(operation).observe(
+                    time.perf_counter() - start)
 
                 if response.status_code == 429:  # Rate limit
-                    delay = self.retry_delay * \
-                        (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Rate limited. Waiting {delay} seconds...")
-                    await asyncio.sleep(delay)
+                    graphql_throttled.labels(operation).inc()
+                    # Pause every caller for Retry-After, falling back to
+                    # exponential backoff when the server doesn't say
+                    retry_after = parse_retry_after(
+                        response.headers.get('Retry-After'))
+                    if retry_after is None:
+                        retry_after = self.retry_delay * (2 ** attempt)
+                    self.rate_limiter.on_throttle(retry_after)
                     continue
 
                 response.raise_for_status()
+                self.rate_limiter.on_success()
                 result = response.json()
 
                 if 'errors' in result:
                     logger.error(f"GraphQL errors: {result['errors']}")
-                    return None
+                    if not allow_partial:
+                        return None
 
                 logger.debug(
                     f"Query executed successfully (attempt {attempt + 1})")
@@ -119,23 +197,19 @@ class LeetCodeDataFetcher:
 
     async def fetch_question_metadata(self, title_slug: str) -> Optional[Dict]:
         """Fetch question metadata by title slug."""
+        if self.metadata_store:
+            cached = await self.metadata_store.get(
+                title_slug, allow_stale=settings.OFFLINE_MODE)
+            if cached is not None:
+                logger.debug(f"Metadata cache hit for question: {title_slug}")
+                return cached
+
         logger.info(f"Fetching metadata for question: {title_slug}")
         query = """
         query questionContent($titleSlug: String!) {
-            question(titleSlug: $titleSlug) {
-                questionId
-                title
-                titleSlug
-                difficulty
-                content
-                topicTags {
-                    name
-                    id
-                    slug
-                }
-            }
+            question(titleSlug: $titleSlug) {%s}
         }
-        """
+        """ % QUESTION_FIELDS
 
         variables = {"titleSlug": title_slug}
 
@@ -146,10 +220,120 @@ class LeetCodeDataFetcher:
             return None
 
         question_data = result['data']['question']
+        if question_data and self.metadata_store:
+            await self.metadata_store.put(title_slug, question_data)
         logger.info(
             f"Successfully fetched metadata for question: {title_slug}")
         return question_data
 
+    async def fetch_question_metadata_many(
+        self,
+        title_slugs: List[str],
+        batch_size: int = 25
+    ) -> Dict[str, Optional[Dict]]:
+        """Fetch metadata for many questions with aliased batch queries.
+
+        Each request carries up to ``batch_size`` aliased ``question`` fields.
+        A batch the server rejects is split in half and retried, and partial
+        GraphQL errors are mapped back to the slug that caused them; a batch
+        whose request fails (transport or HTTP errors) fails as a whole.
+
+        Args:
+            title_slugs: List[str] - Question title slugs
+            batch_size: int - Maximum number of questions per request
+
+        Returns:
+            Dict[str, Optional[Dict]]: Metadata by slug (None if it failed)
+        """
+        title_slugs = list(dict.fromkeys(title_slugs))
+
+        # Persistent cache hits skip the network and the rate limiter
+        metadata: Dict[str, Optional[Dict]] = {}
+        if self.metadata_store:
+            metadata.update(await self.metadata_store.get_many(
+                title_slugs, allow_stale=settings.OFFLINE_MODE))
+        missing = [slug for slug in title_slugs if slug not in metadata]
+        logger.info(
+            f"Fetching metadata for {len(missing)} questions in batches of {batch_size} "
+            f"({len(metadata)} cached)")
+
+        for i in range(0, len(missing), batch_size):
+            fetched = await self._fetch_question_batch(missing[i:i + batch_size])
+            if self.metadata_store:
+                # One write per batch rather than one per question
+                await self.metadata_store.put_many(
+                    {slug: data for slug, data in fetched.items() if data})
+            metadata.update(fetched)
+
+        failed = [slug for slug, data in metadata.items() if data is None]
+        if failed:
+            logger.error(f"Failed to fetch metadata for questions: {failed}")
+        logger.info(
+            f"Successfully fetched metadata for {len(metadata) - len(failed)} questions")
+        return metadata
+
+    async def _fetch_question_batch(self, title_slugs: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch one aliased batch.
+
+        Only a response that arrived is worth splitting: when the server
+        rejects the whole query (e.g. as too large) the batch is split in
+        half, and questions whose alias came back with an error are retried
+        without the rest of the batch. A transport or HTTP failure has already used up
+        ``_execute_query``'s retries, so the whole batch fails instead of
+        multiplying requests against a failing server.
+        """
+        aliases = {f"q{i}": slug for i, slug in enumerate(title_slugs)}
+        query = "query questionContentBatch(%s) {%s}" % (
+            ", ".join(f"${alias}: String!" for alias in aliases),
+            "".join(
+                f"\n    {alias}: question(titleSlug: ${alias}) {{{QUESTION_FIELDS}}}"
+                for alias in aliases)
+        )
+
+        result = await self._execute_query(query, aliases, allow_partial=True)
+        if result is None:
+            logger.error(
+                f"Metadata batch of {len(title_slugs)} failed, not splitting")
+            return {slug: None for slug in title_slugs}
+
+        data = result.get('data')
+        if not data:
+            logger.warning(
+                f"Metadata batch of {len(title_slugs)} was rejected, splitting")
+            return await self._split_question_batch(title_slugs)
+
+        # Map partial errors back to the slugs that caused them
+        failed = set()
+        for error in result.get('errors', []):
+            path = error.get('path') or []
+            if path and path[0] in aliases:
+                failed.add(path[0])
+                logger.error(
+                    f"GraphQL error for question {aliases[path[0]]}: {error.get('message')}")
+
+        metadata = {
+            slug: None if alias in failed else data.get(alias)
+            for alias, slug in aliases.items()
+        }
+        if failed:
+            # Retry the failing questions apart from the rest of the batch;
+            # the retried batch is always smaller, so this terminates
+            failed_slugs = [aliases[alias] for alias in aliases if alias in failed]
+            if len(failed_slugs) < len(title_slugs):
+                metadata.update(await self._fetch_question_batch(failed_slugs))
+            else:
+                metadata.update(await self._split_question_batch(failed_slugs))
+        return metadata
+
+    async def _split_question_batch(self, title_slugs: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch a batch as two halves; a single question is not retried."""
+        if len(title_slugs) == 1:
+            return {title_slugs[0]: None}
+        middle = len(title_slugs) // 2
+        metadata = await self._fetch_question_batch(title_slugs[:middle])
+        metadata.update(await self._fetch_question_batch(title_slugs[middle:]))
+        return metadata
+
     async def fetch_user_status(self) -> Optional[Dict]:
         """Fetch user status information."""
         logger.info("Fetching user status information")
@@ -224,22 +408,38 @@ class LeetCodeDataFetcher:
 
         return result['data']
 
-    async def fetch_all_solved_questions(self, db: AsyncSession) -> List[Dict]:
-        """Fetch all questions solved by the user."""
+    async def iter_solved_question_pages(
+        self,
+        db: AsyncSession,
+        start_offset: int = 0
+    ) -> AsyncIterator[Dict]:
+        """Page through the solved-question list, filtering for new activity.
+
+        Args:
+            db: AsyncSession - Database session
+            start_offset: int - ``skip`` to resume the list from
+
+        Yields:
+            Dict: ``questions`` with new activity on the page, the
+            ``next_offset`` to request, the list's ``total`` and whether it
+            is ``completed``
+
+        Raises:
+            RuntimeError: When a page cannot be fetched, so a partial scan
+                is never mistaken for a complete one
+        """
         username = await self._get_username()
         if not username:
-            logger.error(
+            raise RuntimeError(
                 "Failed to get username for fetching solved questions")
-            return []
 
         # Get last submission timestamps from our database
-        query = """
-        SELECT q.title_slug, MAX(s.submitted_at) as last_submission
-        FROM questions q
-        LEFT JOIN submissions s ON q.id = s.question_id
-        GROUP BY q.title_slug
-        """
-        result = await db.execute(text(query))
+        result = await db.execute(
+            select(Question.title_slug,
+                   QuestionProgress.last_submission_at.label('last_submission'))
+            .outerjoin(QuestionProgress,
+                       Question.id == QuestionProgress.question_id)
+        )
         last_submissions = {
             row.title_slug: row.last_submission for row in result}
 
@@ -268,10 +468,9 @@ class LeetCodeDataFetcher:
         }
         """
 
-        # Fetch all solved questions in batches of 50
-        batch_size = 50
-        offset = 0
-        all_questions = []
+        # Fetch all solved questions in batches
+        batch_size = PROGRESS_PAGE_SIZE
+        offset = start_offset
 
         while True:
             variables = {
@@ -283,16 +482,23 @@ class LeetCodeDataFetcher:
 
             result = await self._execute_query(query, variables)
             if not result or 'data' not in result:
-                logger.error("Failed to fetch solved questions")
-                break
+                raise RuntimeError(
+                    f"Failed to fetch solved questions at offset {offset}")
 
             questions_data = result['data']['userProgressQuestionList']
             if not questions_data or not questions_data.get('questions'):
-                break
+                yield {
+                    'questions': [],
+                    'next_offset': offset,
+                    'total': (questions_data or {}).get('totalNum'),
+                    'completed': True
+                }
+                return
 
             questions = questions_data['questions']
 
             # Filter questions that have new submissions
+            page_questions = []
             for question in questions:
                 try:
                     # Handle both integer timestamps and ISO format datetime strings
@@ -310,7 +516,7 @@ class LeetCodeDataFetcher:
                         question['titleSlug'])
 
                     if not db_last_submission or last_submitted_at > db_last_submission:
-                        all_questions.append(question)
+                        page_questions.append(question)
                         logger.info(
                             f"Found new activity for question: {question['titleSlug']}")
                 except (ValueError, TypeError) as e:
@@ -318,33 +524,82 @@ class LeetCodeDataFetcher:
                         f"Error parsing timestamp for question {question['titleSlug']}: {str(e)}")
                     continue
 
+            offset += len(questions)
             # If we got fewer questions than the batch size, we're done
-            if len(questions) < batch_size:
-                break
+            done = len(questions) < batch_size
+            yield {
+                'questions': page_questions,
+                'next_offset': offset,
+                'total': questions_data.get('totalNum'),
+                'completed': done
+            }
+            if done:
+                return
 
-            offset += batch_size
-            # Add a small delay to avoid rate limiting
-            await asyncio.sleep(0.5)
+    async def fetch_all_solved_questions(
+        self,
+        db: AsyncSession,
+        start_offset: int = 0
+    ) -> List[Dict]:
+        """Fetch all questions solved by the user with new activity.
+
+        Collects ``iter_solved_question_pages`` into one list.
+
+        Args:
+            db: AsyncSession - Database session
+            start_offset: int - ``skip`` to resume the list from
+
+        Returns:
+            List[Dict]: Questions with new activity
+        """
+        all_questions = []
+        async for page in self.iter_solved_question_pages(db, start_offset):
+            all_questions.extend(page['questions'])
 
         logger.info(f"Found {len(all_questions)} questions with new activity")
         return all_questions
 
-    async def fetch_submissions_for_question(self, title_slug: str, db: AsyncSession) -> List[Dict]:
-        """Fetch all submissions for a specific question."""
+    async def iter_submission_pages(
+        self,
+        title_slug: str,
+        db: AsyncSession,
+        resume: Optional[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """Page through a question's submissions newer than the stored ones.
+
+        Pages are requested newest first and paging stops at the first
+        submission that is already stored.
+
+        Args:
+            title_slug: str - Question title slug
+            db: AsyncSession - Database session
+            resume: Optional[Dict] - ``offset``, ``last_key`` and
+                ``watermark`` of an interrupted fetch. The watermark replaces
+                the newest stored submission, which may already include
+                pages stored before the interruption.
+
+        Yields:
+            Dict: New ``submissions`` on the page, the ``next_offset`` and
+            ``last_key`` to request and whether no older submissions remain
+            (``completed``)
+
+        Raises:
+            RuntimeError: When a page cannot be fetched
+        """
         username = await self._get_username()
         if not username:
-            logger.error("Failed to get username for fetching submissions")
-            return []
+            raise RuntimeError("Failed to get username for fetching submissions")
 
-        # Get the last submission timestamp from our database
-        query = """
-        SELECT MAX(submitted_at) as last_submission
-        FROM submissions s
-        JOIN questions q ON s.question_id = q.id
-        WHERE q.title_slug = :title_slug
-        """
-        result = await db.execute(text(query), {"title_slug": title_slug})
-        last_submission = result.scalar_one_or_none()
+        if resume is not None:
+            last_submission = resume.get('watermark')
+        else:
+            # Get the last submission timestamp from our database
+            result = await db.execute(
+                select(QuestionProgress.last_submission_at)
+                .join(Question, QuestionProgress.question_id == Question.id)
+                .where(Question.title_slug == title_slug)
+            )
+            last_submission = result.scalar_one_or_none()
 
         logger.info(f"Fetching submissions for question: {title_slug}")
         query = """
@@ -382,10 +637,9 @@ class LeetCodeDataFetcher:
         }
         """
 
-        all_submissions = []
-        offset = 0
-        limit = 20
-        last_key = None
+        offset = resume.get('offset', 0) if resume else 0
+        limit = SUBMISSION_PAGE_SIZE
+        last_key = resume.get('last_key') if resume else None
 
         while True:
             variables = {
@@ -395,46 +649,63 @@ class LeetCodeDataFetcher:
                 "questionSlug": title_slug
             }
 
-            try:
-                result = await self._execute_query(query, variables)
-                if not result or 'data' not in result:
-                    logger.error(
-                        f"Failed to fetch submissions for question: {title_slug}")
-                    break
-
-                submission_list = result['data']['questionSubmissionList']
-                if not submission_list or not submission_list.get('submissions'):
-                    break
-
-                submissions = submission_list['submissions']
-
-                # Filter out submissions we already have
-                new_submissions = []
-                for submission in submissions:
-                    submission_time = datetime.fromtimestamp(
-                        int(submission['timestamp']))
-                    if not last_submission or submission_time > last_submission:
-                        new_submissions.append(submission)
-                    else:
-                        # If we hit an old submission, we can stop fetching more pages
-                        return all_submissions
-
-                all_submissions.extend(new_submissions)
-
-                # Check if there are more pages
-                if not submission_list.get('hasNext'):
+            result = await self._execute_query(query, variables)
+            if not result or 'data' not in result:
+                raise RuntimeError(
+                    f"Failed to fetch submissions for question: {title_slug}")
+
+            submission_list = result['data']['questionSubmissionList']
+            submissions = (submission_list or {}).get('submissions') or []
+
+            # Filter out submissions we already have
+            new_submissions = []
+            reached_stored = False
+            for submission in submissions:
+                submission_time = datetime.fromtimestamp(
+                    int(submission['timestamp']))
+                if not last_submission or submission_time > last_submission:
+                    new_submissions.append(submission)
+                else:
+                    # If we hit an old submission, we can stop fetching more pages
+                    reached_stored = True
                     break
 
+            if submissions:
                 last_key = submission_list.get('lastKey')
                 offset += limit
-
-                # Add a small delay to avoid rate limiting
-                await asyncio.sleep(0.5)
-
-            except Exception as e:
-                logger.error(
-                    f"Error fetching submissions for question {title_slug}: {str(e)}")
-                break
+            # Check if there are more pages
+            done = (not submissions or reached_stored
+                    or not submission_list.get('hasNext'))
+            yield {
+                'submissions': new_submissions,
+                'next_offset': offset,
+                'last_key': last_key,
+                'completed': done
+            }
+            if done:
+                return
+
+    async def fetch_submissions_for_question(
+        self,
+        title_slug: str,
+        db: AsyncSession,
+        resume: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Fetch all submissions for a question newer than the stored ones.
+
+        Collects ``iter_submission_pages`` into one list.
+
+        Args:
+            title_slug: str - Question title slug
+            db: AsyncSession - Database session
+            resume: Optional[Dict] - Position of an interrupted fetch
+
+        Returns:
+            List[Dict]: New submissions
+        """
+        all_submissions = []
+        async for page in self.iter_submission_pages(title_slug, db, resume):
+            all_submissions.extend(page['submissions'])
 
         if not all_submissions:
             logger.info(f"No new submissions found for question: {title_slug}")
@@ -0,0 +1,240 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata_cache (
+    key TEXT PRIMARY KEY,
+    slug TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_metadata_cache_accessed_at
+    ON metadata_cache (accessed_at);
+"""
+
+
+class MetadataStore:
+    """Persistent, compressed cache of question metadata responses.
+
+    Entries are keyed by title slug plus a hash of the GraphQL selection that
+    produced them, so changing the requested fields never serves stale shapes.
+    Payloads are zlib-compressed JSON in a standalone SQLite file, which
+    survives resets of the main database.
+
+    Entries older than ``ttl`` seconds are ignored unless the caller accepts
+    stale data (offline mode), and the least recently used entries are
+    evicted once the stored payloads exceed ``max_bytes``. The entry count
+    and stored size are kept as running totals, so neither eviction checks
+    nor ``stats`` scan the table.
+
+    The public lookups and writes are coroutines that run the blocking
+    ``sqlite3`` calls in a worker thread; a lock serializes them on the one
+    connection.
+    """
+
+    def __init__(self, path: str, query: str, ttl: int, max_bytes: int):
+        self.path = path
+        self.query_hash = hashlib.sha1(query.encode()).hexdigest()[:12]
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = 0
+        self.size_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            # The only full pass over the table; totals are kept from here on
+            self.entries, self.size_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM metadata_cache"
+            ).fetchone()
+            self._conn = conn
+        return self._conn
+
+    def _key(self, slug: str) -> str:
+        return f"{slug}:{self.query_hash}"
+
+    async def get(self, slug: str, allow_stale: bool = False) -> Optional[Dict]:
+        """Get cached metadata for a question.
+
+        Args:
+            slug: str - Question title slug
+            allow_stale: bool - Return entries older than the TTL
+
+        Returns:
+            Optional[Dict]: Cached metadata, or None if missing or expired
+        """
+        return (await self.get_many([slug], allow_stale)).get(slug)
+
+    async def get_many(self, slugs: Iterable[str],
+                       allow_stale: bool = False) -> Dict[str, Dict]:
+        """Get cached metadata for several questions.
+
+        Args:
+            slugs: Iterable[str] - Question title slugs
+            allow_stale: bool - Return entries older than the TTL
+
+        Returns:
+            Dict[str, Dict]: Metadata for the slugs that were cached
+        """
+        slugs = list(slugs)
+        if not slugs:
+            return {}
+        return await asyncio.to_thread(self._get_many, slugs, allow_stale)
+
+    def _get_many(self, slugs: List[str], allow_stale: bool) -> Dict[str, Dict]:
+        try:
+            with self._lock:
+                conn = self._connect()
+                now = time.time()
+                keys = [self._key(slug) for slug in slugs]
+                rows = conn.execute(
+                    "SELECT key, slug, payload, stored_at FROM metadata_cache "
+                    f"WHERE key IN ({', '.join('?' * len(keys))})",
+                    keys
+                ).fetchall()
+
+                found = {}
+                fresh_keys = []
+                for key, slug, payload, stored_at in rows:
+                    if not allow_stale and now - stored_at > self.ttl:
+                        continue
+                    found[slug] = json.loads(zlib.decompress(payload))
+                    fresh_keys.append((now, key))
+                if fresh_keys:
+                    conn.executemany(
+                        "UPDATE metadata_cache SET accessed_at = ? WHERE key = ?",
+                        fresh_keys)
+
+                self.hits += len(found)
+                self.misses += len(slugs) - len(found)
+                return found
+        except Exception as e:
+            logger.error(f"Error reading metadata cache: {str(e)}")
+            self.misses += len(slugs)
+            return {}
+
+    async def put(self, slug: str, data: Dict) -> None:
+        """Store metadata for a question and evict old entries if needed.
+
+        Args:
+            slug: str - Question title slug
+            data: Dict - Question metadata as returned by the API
+        """
+        await self.put_many({slug: data})
+
+    async def put_many(self, metadata: Dict[str, Dict]) -> None:
+        """Store metadata for several questions in one transaction, then
+        evict old entries if needed.
+
+        Args:
+            metadata: Dict[str, Dict] - Question metadata by title slug
+        """
+        if metadata:
+            await asyncio.to_thread(self._put_many, metadata)
+
+    def _put_many(self, metadata: Dict[str, Dict]) -> None:
+        try:
+            rows = []
+            now = time.time()
+            for slug, data in metadata.items():
+                payload = zlib.compress(
+                    json.dumps(data, separators=(',', ':')).encode())
+                rows.append(
+                    (self._key(slug), slug, payload, len(payload), now, now))
+            keys = [row[0] for row in rows]
+
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN")
+                try:
+                    # Replaced entries give back their old size
+                    replaced = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM metadata_cache "
+                        f"WHERE key IN ({', '.join('?' * len(keys))})",
+                        keys
+                    ).fetchone()
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO metadata_cache "
+                        "(key, slug, payload, size, stored_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    entries = self.entries + len(rows) - replaced[0]
+                    size_bytes = (self.size_bytes - replaced[1]
+                                  + sum(row[3] for row in rows))
+                    entries, size_bytes, evicted = self._evict(
+                        conn, entries, size_bytes)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self.entries, self.size_bytes = entries, size_bytes
+                self.evictions += evicted
+        except Exception as e:
+            logger.error(
+                f"Error writing metadata cache for {list(metadata)}: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection, entries: int,
+               size_bytes: int) -> Tuple[int, int, int]:
+        """Drop least recently used entries until under ``max_bytes``.
+
+        Returns:
+            Tuple[int, int, int]: Entries and bytes left, entries evicted
+        """
+        if size_bytes <= self.max_bytes:
+            return entries, size_bytes, 0
+        rows = conn.execute(
+            "SELECT key, size FROM metadata_cache ORDER BY accessed_at")
+        evicted = []
+        for key, size in rows:
+            if size_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            size_bytes -= size
+        conn.executemany("DELETE FROM metadata_cache WHERE key = ?", evicted)
+        return entries - len(evicted), size_bytes, len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and the stored size.
+
+        Reads the running totals only, so it is safe on the event loop;
+        both are 0 until the store is first used.
+        """
+        return {
+            'entries': self.entries,
+            'size_bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
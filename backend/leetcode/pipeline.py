@@ -0,0 +1,63 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+async def pipe_pages(
+    pages: AsyncIterator[Any],
+    consume: Callable[[Any], Awaitable[Any]],
+    maxsize: int
+) -> int:
+    """Consume pages from an async iterator while the next ones are fetched.
+
+    A producer task pulls pages into a bounded queue and the caller's task
+    consumes them, so fetching page N+1 overlaps with writing page N. Once
+    ``maxsize`` pages are waiting the producer blocks, which keeps memory
+    bounded when writes fall behind.
+
+    Args:
+        pages: AsyncIterator[Any] - Pages to consume, e.g. a fetcher generator
+        consume: Callable[[Any], Awaitable[Any]] - Called with each page in order
+        maxsize: int - Pages buffered between producer and consumer
+
+    Returns:
+        int: Number of pages consumed
+
+    Raises:
+        Exception: Whatever the producer or ``consume`` raised
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+    error: Optional[BaseException] = None
+
+    async def produce():
+        nonlocal error
+        try:
+            async for page in pages:
+                await queue.put(page)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            error = e
+        await queue.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    consumed = 0
+    try:
+        while True:
+            page = await queue.get()
+            if page is _DONE:
+                break
+            await consume(page)
+            consumed += 1
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+    if error is not None:
+        raise error
+    return consumed
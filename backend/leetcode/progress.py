@@ -0,0 +1,89 @@
+from typing import Dict, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SyncProgress:
+    """Progress of the background LeetCode sync, for the status endpoint.
+
+    The sync moves through phases (``starting``, ``backfilling``,
+    ``completed``, or ``failed``/``offline``). Within a phase, ``done`` and
+    ``total`` count questions; the total grows as the solved-question scan
+    discovers more of them. Updates happen on the event loop only, so plain
+    attributes are enough.
+    """
+
+    def __init__(self):
+        self.phase = 'idle'
+        self.done = 0
+        self.total = 0
+        self.submissions = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.phase_started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def set_phase(self, phase: str):
+        """Enter a new phase and reset its counters."""
+        now = time.time()
+        if self.started_at is None or phase == 'starting':
+            self.started_at = now
+            self.finished_at = None
+            self.error = None
+        self.phase = phase
+        self.phase_started_at = now
+        self.done = 0
+        self.total = 0
+        self.submissions = 0
+        logger.info(f"Sync phase: {phase}")
+
+    def add_total(self, count: int = 1):
+        """Record newly discovered work items."""
+        self.total += count
+
+    def advance(self, count: int = 1, submissions: int = 0):
+        """Record finished work items and the submissions they stored."""
+        self.done += count
+        self.submissions += submissions
+
+    def finish(self, phase: str = 'completed'):
+        """Mark the sync as finished."""
+        self.phase = phase
+        self.finished_at = time.time()
+        logger.info(f"Sync phase: {phase}")
+
+    def fail(self, error: Exception):
+        """Record a failed sync attempt."""
+        self.error = str(error)
+        self.finish('failed')
+
+    def snapshot(self) -> Dict:
+        """Get the current progress with throughput and ETA.
+
+        Returns:
+            Dict: Phase, counters, ``throughput`` in items per second over
+            the current phase and ``eta_seconds`` (None until measurable)
+        """
+        end = self.finished_at or time.time()
+        elapsed = end - self.phase_started_at if self.phase_started_at else 0.0
+        throughput = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.done)
+        eta = None
+        if self.finished_at is None and throughput > 0:
+            eta = remaining / throughput
+        return {
+            'phase': self.phase,
+            'done': self.done,
+            'total': self.total,
+            'submissions': self.submissions,
+            'throughput': round(throughput, 3),
+            'eta_seconds': round(eta, 1) if eta is not None else None,
+            'elapsed_seconds': round(end - self.started_at, 1) if self.started_at else 0.0,
+            'error': self.error
+        }
+
+
+# Process-wide progress shared by the service and the API
+sync_progress = SyncProgress()
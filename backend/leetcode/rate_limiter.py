@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by every LeetCode request.
+
+    Callers take one token per request and wait in FIFO order when the
+    bucket is empty. The refill rate adapts to the server: each 429 lowers it
+    by ``decrease`` and pauses all callers for the server's Retry-After,
+    while each success raises it by ``increase`` up to ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        decrease: float
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.throttle_wait_seconds = 0.0
+        self.throttled_responses = 0
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+
+                self.throttle_wait_seconds += wait
+                await asyncio.sleep(wait)
+
+    def on_success(self):
+        """Slowly grow the rate back after a successful request."""
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Back off after a 429 response.
+
+        Args:
+            retry_after: Optional[float] - Seconds the server asked us to wait
+        """
+        self.throttled_responses += 1
+        self.rate = max(self.min_rate, self.rate - self.decrease)
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        if retry_after:
+            self._paused_until = max(
+                self._paused_until, self._updated + retry_after)
+        logger.warning(
+            f"Rate limited; rate lowered to {self.rate:.2f} req/s"
+            + (f", pausing {retry_after:.1f}s" if retry_after else ""))
+
+    def stats(self) -> Dict[str, float]:
+        """Get the current rate and throttling counters."""
+        return {
+            'rate': self.rate,
+            'throttle_wait_seconds': self.throttle_wait_seconds,
+            'throttled_responses': self.throttled_responses
+        }
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
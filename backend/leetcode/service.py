@@ -1,6 +1,9 @@
+import asyncio
 import logging
 from typing import Optional
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 import json
@@ -8,8 +11,15 @@ import json
 from .auth import AuthenticationManager
 from .fetcher import LeetCodeDataFetcher
 from .writer import DatabaseWriter
+from .cache import QuestionCache, tag_cache
+from .checkpoints import SyncCheckpoints
+from .pipeline import pipe_pages
+from .progress import sync_progress
 from ..database import get_db
+from ..write_queue import write_queue
 from ..config import settings
+from ..models import Submission
+from ..metrics import registry, poll_duration, submission_lag
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +28,105 @@ class LeetCodeService:
     def __init__(self):
         self.auth_manager = AuthenticationManager()
         self.data_fetcher = LeetCodeDataFetcher(self.auth_manager)
+        self.question_cache = QuestionCache(settings.QUESTION_REFRESH_AGE)
+        self.writer = DatabaseWriter()
+        self.checkpoints = SyncCheckpoints()
         self.scheduler = AsyncIOScheduler()
+        self.progress = sync_progress
         self.is_running = False
+        self._sync_task: Optional[asyncio.Task] = None
+        self._register_metrics()
+
+    def _register_metrics(self):
+        """Export the service's in-memory stats as callback gauges."""
+        registry.gauge_callback(
+            "leetcode_question_cache_entries", "Questions in the slug cache",
+            lambda: self.question_cache.stats()['size'])
+        registry.gauge_callback(
+            "leetcode_question_cache_lookups", "Question cache lookups by result",
+            lambda: {('hit',): self.question_cache.hits,
+                     ('miss',): self.question_cache.misses},
+            ["result"])
+        registry.gauge_callback(
+            "leetcode_rate_limit_requests_per_second", "Current adaptive request rate",
+            lambda: self.data_fetcher.rate_limiter.rate)
+        registry.gauge_callback(
+            "leetcode_rate_limit_wait_seconds", "Total time spent waiting on the rate limiter",
+            lambda: self.data_fetcher.rate_limiter.throttle_wait_seconds)
+        registry.gauge_callback(
+            "leetcode_http_connections", "LeetCode HTTP client counters",
+            lambda: {(key,): value for key, value
+                     in self.auth_manager.connection_stats().items()},
+            ["stat"])
+        registry.gauge_callback(
+            "leetcode_metadata_cache", "Persistent metadata cache counters",
+            lambda: {(key,): value for key, value
+                     in self.data_fetcher.metadata_store.stats().items()}
+            if self.data_fetcher.metadata_store else {},
+            ["stat"])
+        registry.gauge_callback(
+            "leetcode_sync_questions", "Questions in the current sync phase",
+            lambda: {('done',): self.progress.done,
+                     ('total',): self.progress.total},
+            ["state"])
 
     async def start(self):
-        """Start the LeetCode service."""
+        """Start the LeetCode service.
+
+        Returns immediately. Session setup, polling and the historical
+        backfill run in a supervised background task, so the API serves
+        already committed data while the sync catches up.
+        """
         if self.is_running:
             return
+        self.is_running = True
+
+        if settings.OFFLINE_MODE:
+            # Serve what is already stored; never touch the network
+            logger.info("Offline mode, LeetCode sync disabled")
+            self.progress.finish('offline')
+            return
+
+        self._sync_task = asyncio.create_task(self._supervise_sync())
+
+    async def _supervise_sync(self):
+        """Run the initial sync, retrying with backoff when it fails."""
+        for attempt in range(settings.MAX_RETRIES):
+            try:
+                await self._initial_sync()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Initial sync failed (attempt {attempt + 1}/{settings.MAX_RETRIES}): {str(e)}",
+                    exc_info=True)
+                self.progress.fail(e)
+                if attempt < settings.MAX_RETRIES - 1:
+                    await asyncio.sleep(settings.BACKOFF_FACTOR ** (attempt + 1))
+
+    async def _initial_sync(self):
+        """Initialize the session, start polling and backfill history."""
+        self.progress.set_phase('starting')
 
         # Initialize session
         if not await self.auth_manager.initialize_session():
-            logger.error("Failed to initialize LeetCode session")
-            return
+            raise RuntimeError("Failed to initialize LeetCode session")
+
+        # Warm the caches so polls skip known questions and tags
+        async for db in get_db():
+            await self.question_cache.warm(db)
+            await tag_cache.warm(db)
 
         # Schedule regular polling
-        self.scheduler.add_job(
-            self.poll_data,
-            IntervalTrigger(minutes=settings.POLL_INTERVAL // 60),
-            id='leetcode_poll',
-            replace_existing=True
-        )
-        self.scheduler.start()
-        self.is_running = True
+        if not self.scheduler.running:
+            self.scheduler.add_job(
+                self.poll_data,
+                IntervalTrigger(minutes=settings.POLL_INTERVAL // 60),
+                id='leetcode_poll',
+                replace_existing=True
+            )
+            self.scheduler.start()
 
         # Initial data fetch
         await self.fetch_historical_data()
@@ -49,87 +136,263 @@ class LeetCodeService:
         if not self.is_running:
             return
 
-        self.scheduler.shutdown()
+        if self._sync_task and not self._sync_task.done():
+            self._sync_task.cancel()
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+        if self.scheduler.running:
+            self.scheduler.shutdown()
         await self.auth_manager.close()
+        if self.data_fetcher.metadata_store:
+            self.data_fetcher.metadata_store.close()
+        await write_queue.close()
         self.is_running = False
 
     async def poll_data(self):
         """Poll for new submissions and update the database."""
+        with poll_duration.time():
+            await self._poll_data()
+
+    async def _poll_data(self):
         try:
-            async for db in get_db():
-                writer = DatabaseWriter(db)
-
-                # Fetch recent submissions
-                submissions = await self.data_fetcher.fetch_recent_submissions()
-                logger.info(f"Found {len(submissions)} recent submissions")
-
-                for submission in submissions:
-                    # First fetch and store question metadata
-                    question_data = await self.data_fetcher.fetch_question_metadata(
-                        submission['titleSlug']
-                    )
-                    if question_data:
-                        question = await writer.store_question(question_data)
-                        if question and 'topicTags' in question_data:
-                            await writer.store_tags(question, question_data['topicTags'])
-
-                        # Now store the submission since we have the question
-                        await writer.store_submission(submission)
-                    else:
-                        logger.warning(
-                            f"Failed to fetch question data for submission: {submission['titleSlug']}")
+            # Fetch recent submissions
+            submissions = await self.data_fetcher.fetch_recent_submissions()
+            logger.info(f"Found {len(submissions)} recent submissions")
+
+            # Only fetch metadata for unseen or stale questions
+            slugs = list(dict.fromkeys(
+                submission['titleSlug'] for submission in submissions))
+            missing = [slug for slug in slugs
+                       if self.question_cache.get(slug) is None]
+            metadata = {}
+            if missing:
+                metadata = await self.data_fetcher.fetch_question_metadata_many(
+                    missing)
+
+            known = set(slugs) - set(missing)
+            for title_slug in missing:
+                question_data = metadata.get(title_slug)
+                if not question_data:
+                    logger.warning(
+                        f"Failed to fetch question data for submission: {title_slug}")
+                    continue
+
+                question = await self.writer.store_question(question_data)
+                if not question:
+                    continue
+                if 'topicTags' in question_data:
+                    await self.writer.store_tags(question, question_data['topicTags'])
+                self.question_cache.put(title_slug, question.id)
+                known.add(title_slug)
+
+            stored = []
+            for submission in submissions:
+                if submission['titleSlug'] not in known:
+                    continue
+                # recentAcSubmissionList only returns accepted submissions
+                submission.setdefault('statusDisplay', 'Accepted')
+                stored.append(submission)
+
+            # Now store the submissions since we have their questions
+            await self.writer.store_submissions_bulk(stored)
+            await self._update_submission_lag(submissions)
+            logger.info(
+                f"Question cache stats: {self.question_cache.stats()}")
+            logger.info(
+                f"Connection stats: {self.auth_manager.connection_stats()}")
+            if self.data_fetcher.metadata_store:
+                logger.info(
+                    f"Metadata cache stats: {self.data_fetcher.metadata_store.stats()}")
 
         except Exception as e:
             logger.error(f"Error in poll_data: {str(e)}")
 
+    async def _update_submission_lag(self, submissions: list):
+        """Set the lag between the newest fetched and newest stored submission."""
+        timestamps = [
+            self.writer._parse_timestamp(submission['timestamp'])
+            for submission in submissions
+        ]
+        timestamps = [timestamp for timestamp in timestamps if timestamp]
+        if not timestamps:
+            return
+        async for db in get_db():
+            result = await db.execute(select(func.max(Submission.submitted_at)))
+            newest_stored = result.scalar_one_or_none()
+        if newest_stored is not None:
+            submission_lag.set(max(
+                0.0, (max(timestamps) - newest_stored).total_seconds()))
+
     async def fetch_historical_data(self):
-        """Fetch all historical data from LeetCode."""
-        try:
-            async for db in get_db():
-                writer = DatabaseWriter(db)
+        """Fetch all historical data from LeetCode.
+
+        Progress is checkpointed in ``sync_checkpoints``: the solved-question
+        scan resumes from its last page and each question resumes from its
+        last stored submission page, so a restart never starts over.
+
+        The scan, the per-question fetches and the writes run as a pipeline
+        over bounded queues: questions are handed to up to
+        ``settings.BACKFILL_CONCURRENCY`` workers as soon as their page is
+        scanned, and each worker writes submission pages while the next page
+        is being fetched. Memory stays bounded by the queue sizes rather than
+        the size of the history.
 
-                # Fetch all solved questions
-                questions = await self.data_fetcher.fetch_all_solved_questions(db)
+        Raises:
+            Exception: When the scan or any question failed. Progress is only
+                marked completed after a clean run; failed questions keep
+                their checkpoints, so a retry resumes them.
+        """
+        self.progress.set_phase('backfilling')
+        async for db in get_db():
+            progress = await self.checkpoints.load_progress(db)
+            pending = await self.checkpoints.pending_questions(db)
+
+        # Bounded so the scan waits for workers instead of buffering
+        work: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.BACKFILL_CONCURRENCY * 2)
+        queued = set()
+        failed = []
+        workers = [
+            asyncio.create_task(self._backfill_worker(work, failed))
+            for _ in range(max(1, settings.BACKFILL_CONCURRENCY))
+        ]
+
+        try:
+            # Questions left over from an interrupted run go first
+            for item in pending:
+                queued.add(item['question']['titleSlug'])
+                self.progress.add_total()
+                await work.put(item)
+            if pending:
                 logger.info(
-                    f"Found {len(questions)} questions with new activity")
-
-                for question_data in questions:
-                    try:
-                        # Store question metadata
-                        question = await writer.store_question(question_data)
-                        if not question:
-                            logger.error(
-                                f"Failed to store question: {question_data['titleSlug']}")
-                            continue
-
-                        # Store tags
-                        if question_data.get('topicTags'):
-                            success = await writer.store_tags(
-                                question, question_data['topicTags'])
-                            if not success:
-                                logger.error(
-                                    f"Failed to store tags for question: {question_data['titleSlug']}")
-
-                        # Fetch and store submissions
-                        submissions = await self.data_fetcher.fetch_submissions_for_question(
-                            question_data['titleSlug'], db)
-                        logger.info(
-                            f"Found {len(submissions)} new submissions for question: {question_data['titleSlug']}")
-
-                        for submission in submissions:
-                            success = await writer.store_submission(submission)
-                            if not success:
-                                logger.error(
-                                    f"Failed to store submission for question: {question_data['titleSlug']}")
-
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing question {question_data['titleSlug']}: {str(e)}", exc_info=True)
-                        continue
+                    f"Resuming {len(pending)} questions from checkpoints")
 
-        except Exception as e:
-            logger.error(
-                f"Error fetching historical data: {str(e)}", exc_info=True)
+            if progress is None or not progress['completed']:
+                start_offset = progress['offset'] if progress else 0
+                await self._scan_solved_questions(start_offset, work, queued)
+
+            for _ in workers:
+                await work.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            # Stop the workers when the scan failed or the sync was cancelled
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if failed:
+            raise RuntimeError(
+                f"Backfill failed for {len(failed)} of {len(queued)} questions: "
+                f"{', '.join(failed[:5])}")
+        logger.info(f"Backfilled {len(queued)} questions with new activity")
+
+        await self.checkpoints.clear_completed()
+        self.progress.finish()
+
+    async def _scan_solved_questions(self, start_offset: int,
+                                     work: asyncio.Queue, queued: set):
+        """Page through solved questions, queueing those with new activity.
+
+        Each page is checkpointed before its questions are queued, so every
+        queued question already has a checkpoint to advance.
+        """
+        if start_offset:
+            logger.info(
+                f"Resuming solved question scan at offset {start_offset}")
+
+        async def record_page(page: dict):
+            await self.checkpoints.record_progress_page(
+                page['questions'], page['next_offset'],
+                page['total'], page['completed'])
+            for question_data in page['questions']:
+                if question_data['titleSlug'] in queued:
+                    continue
+                queued.add(question_data['titleSlug'])
+                self.progress.add_total()
+                await work.put({'question': question_data, 'resume': None})
+
+        async for db in get_db():
+            await pipe_pages(
+                self.data_fetcher.iter_solved_question_pages(db, start_offset),
+                record_page, settings.INGEST_QUEUE_SIZE)
+
+    async def _backfill_worker(self, queue: asyncio.Queue, failed: list):
+        """Backfill questions from the queue until it yields None.
+
+        A failed question is logged and its slug appended to ``failed``; the
+        worker moves on to the next question.
+        """
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            title_slug = item['question']['titleSlug']
+            try:
+                # Fresh session per question so reads see committed pages
+                async for db in get_db():
+                    stored = await self._backfill_question(
+                        item['question'], db, item['resume'])
+            except Exception as e:
+                logger.error(
+                    f"Error processing question {title_slug}: {str(e)}", exc_info=True)
+                failed.append(title_slug)
+                continue
+            self.progress.advance(submissions=stored)
+
+    async def _backfill_question(
+        self,
+        question_data: dict,
+        db: AsyncSession,
+        resume: Optional[dict] = None
+    ) -> int:
+        """Store a question, its tags and its new submissions.
+
+        Submission pages are written while the next page is fetched, and the
+        question's checkpoint advances after each stored page.
+
+        Returns:
+            int: Number of new submissions stored
+
+        Raises:
+            Exception: When the question or a submission page failed
+        """
+        title_slug = question_data['titleSlug']
+        # Store question metadata
+        question = await self.writer.store_question(question_data)
+        if not question:
+            raise RuntimeError(f"Failed to store question: {title_slug}")
+
+        # Store tags
+        if question_data.get('topicTags'):
+            success = await self.writer.store_tags(
+                question, question_data['topicTags'])
+            if not success:
+                logger.error(
+                    f"Failed to store tags for question: {title_slug}")
+
+        # Progress list entries carry no content, so leave those
+        # questions to be completed by the next poll
+        if question_data.get('content'):
+            self.question_cache.put(title_slug, question.id)
+
+        stored = 0
+
+        async def store_page(page: dict):
+            nonlocal stored
+            await self.writer.store_submissions_bulk(page['submissions'])
+            await self.checkpoints.record_question_page(
+                title_slug, page['next_offset'],
+                page['last_key'], page['completed'])
+            stored += len(page['submissions'])
+
+        if resume and resume.get('offset'):
+            logger.info(
+                f"Resuming submissions for question {title_slug} at offset {resume['offset']}")
+        await pipe_pages(
+            self.data_fetcher.iter_submission_pages(title_slug, db, resume),
+            store_page, settings.INGEST_QUEUE_SIZE)
+        logger.info(
+            f"Stored {stored} new submissions for question: {title_slug}")
+        return stored
 
     async def check_user_status(self) -> Optional[dict]:
         """Check the current user's status."""
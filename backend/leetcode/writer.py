@@ -1,169 +1,365 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 import logging
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update
+from sqlalchemy import select, insert, update, func, or_, tuple_
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from ..models import Question, Tag, Submission, question_tags
-from ..database import get_db
+from ..rollups import refresh_rollups
+from ..reviews import refresh_review_state
+from ..response_cache import data_version
+from ..write_queue import WriteQueue, write_queue, after_commit
+from ..metrics import rows_written
+from .cache import tag_cache
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row upsert; 3 bound parameters per row keeps each batch well
+# under SQLite's host parameter limit
+BULK_BATCH_SIZE = 250
+
 
 class DatabaseWriter:
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    """Stores LeetCode data through the process-wide write queue.
+
+    Each public method submits a write unit to the queue and waits for it to
+    be committed. The private ``_store_*`` units run on the single writer
+    session and never commit themselves; the queue commits them, possibly
+    together with other queued units.
+    """
+
+    def __init__(self, queue: WriteQueue = write_queue):
+        self.queue = queue
+
+    @staticmethod
+    def _mark_changed(db: AsyncSession):
+        """Bump the data version once the current write commits."""
+        after_commit(db, data_version.bump)
+
+    @staticmethod
+    def _count_rows(db: AsyncSession, table: str, count: int):
+        """Add written rows to the metrics once the current write commits."""
+        after_commit(db, lambda: rows_written.labels(table).inc(count))
 
     async def store_submission(self, submission: Dict) -> bool:
         """Store a submission in the database."""
         try:
-            # Get question by titleSlug
-            question = await self.db.execute(
-                select(Question).where(
-                    Question.title_slug == submission['titleSlug'])
+            return await self.queue.submit(
+                lambda db: self._store_submission(db, submission))
+        except Exception as e:
+            logger.error(f"Error storing submission: {str(e)}", exc_info=True)
+            return False
+
+    async def _store_submission(self, db: AsyncSession, submission: Dict) -> bool:
+        # Get question by titleSlug
+        question = await db.execute(
+            select(Question).where(
+                Question.title_slug == submission['titleSlug'])
+        )
+        question = question.scalar_one_or_none()
+
+        if not question:
+            logger.warning(
+                f"Question not found for submission: {submission['titleSlug']}")
+            return False
+
+        submitted_at = self._parse_timestamp(submission['timestamp'])
+        if submitted_at is None:
+            return False
+
+        status = self._map_status(submission.get('statusDisplay', ''))
+
+        # Prepare submission data
+        submission_data = {
+            'question_id': question.id,
+            'submitted_at': submitted_at,
+            'status': status
+        }
+
+        logger.debug(f"Storing submission data: {submission_data}")
+
+        # First check if submission already exists with same question_id and submitted_at
+        existing = await db.execute(
+            select(Submission).where(
+                Submission.question_id == question.id,
+                Submission.submitted_at == submitted_at
             )
-            question = question.scalar_one_or_none()
+        )
+        existing = existing.scalar_one_or_none()
+
+        if existing:
+            if existing.status == status:
+                # Already stored; nothing to refresh or invalidate
+                return True
+            # Update existing submission
+            existing.status = status
+        else:
+            # Create new submission
+            new_submission = Submission(**submission_data)
+            db.add(new_submission)
+
+        await db.flush()
+        await refresh_rollups(db, [submitted_at.date()], [question.id])
+        await refresh_review_state(db, [submission_data])
+        self._mark_changed(db)
+        self._count_rows(db, 'submissions', 1)
+        return True
+
+    @staticmethod
+    def _parse_timestamp(timestamp) -> Optional[datetime]:
+        """Convert a submission timestamp (integer or ISO format) to datetime."""
+        try:
+            if isinstance(timestamp, (int, str)) and str(timestamp).isdigit():
+                # Handle integer timestamp
+                return datetime.fromtimestamp(int(timestamp))
+            elif isinstance(timestamp, str):
+                # Handle ISO format string
+                return datetime.fromisoformat(
+                    timestamp.replace('Z', '+00:00'))
+            logger.error(f"Invalid timestamp format: {timestamp}")
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error parsing timestamp {timestamp}: {str(e)}")
+        return None
+
+    @staticmethod
+    def _map_status(status: str) -> str:
+        """Map a LeetCode status display string to a valid status value."""
+        status = status.lower()
+        if status == 'accepted':
+            return 'Accepted'
+        elif status == 'wrong answer':
+            return 'Wrong Answer'
+        elif status == 'time limit exceeded':
+            return 'Time Limit Exceeded'
+        elif status == 'memory limit exceeded':
+            return 'Time Limit Exceeded'  # Map MLE to TLE since MLE isn't in allowed values
+        elif status == 'runtime error':
+            return 'Runtime Error'
+        elif status == 'compilation error':
+            return 'Compile Error'
+        return 'Wrong Answer'  # Default to Wrong Answer instead of Unknown
+
+    async def store_submissions_bulk(
+        self,
+        submissions: List[Dict],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> List[Dict[str, int]]:
+        """Store many submissions using one transaction per batch.
+
+        Question ids for all slugs are resolved with a single query, then each
+        batch is written with one multi-row ``INSERT ... ON CONFLICT`` upsert.
+        Batches are queued as separate write units, so the write queue may
+        commit several of them together.
+
+        Args:
+            submissions: List[Dict] - Submissions as returned by the fetcher
+            batch_size: int - Maximum number of rows per transaction
+
+        Returns:
+            List[Dict[str, int]]: Per-batch counts of ``inserted`` rows and
+            ``updated`` rows whose status changed; rows stored unchanged are
+            in neither
+        """
+        if not submissions:
+            return []
+
+        slugs = {submission['titleSlug'] for submission in submissions}
+        try:
+            question_ids = await self.queue.submit(
+                lambda db: self._resolve_question_ids(db, slugs))
+        except Exception as e:
+            logger.error(
+                f"Error resolving questions for submissions: {str(e)}", exc_info=True)
+            return []
 
-            if not question:
+        # Build rows, keeping the last status seen for duplicate keys
+        rows: Dict[tuple, Dict] = {}
+        for submission in submissions:
+            question_id = question_ids.get(submission['titleSlug'])
+            if question_id is None:
                 logger.warning(
                     f"Question not found for submission: {submission['titleSlug']}")
-                return False
+                continue
 
-            # Convert timestamp to datetime (handle both integer and ISO format)
-            timestamp = submission['timestamp']
-            try:
-                if isinstance(timestamp, (int, str)) and str(timestamp).isdigit():
-                    # Handle integer timestamp
-                    submitted_at = datetime.fromtimestamp(int(timestamp))
-                elif isinstance(timestamp, str):
-                    # Handle ISO format string
-                    submitted_at = datetime.fromisoformat(
-                        timestamp.replace('Z', '+00:00'))
-                else:
-                    logger.error(f"Invalid timestamp format: {timestamp}")
-                    return False
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error parsing timestamp {timestamp}: {str(e)}")
-                return False
-
-            # Map status to valid values
-            status = submission.get('statusDisplay', '')
-            if status.lower() == 'accepted':
-                status = 'Accepted'
-            elif status.lower() == 'wrong answer':
-                status = 'Wrong Answer'
-            elif status.lower() == 'time limit exceeded':
-                status = 'Time Limit Exceeded'
-            elif status.lower() == 'memory limit exceeded':
-                status = 'Time Limit Exceeded'  # Map MLE to TLE since MLE isn't in allowed values
-            elif status.lower() == 'runtime error':
-                status = 'Runtime Error'
-            elif status.lower() == 'compilation error':
-                status = 'Compile Error'
-            else:
-                status = 'Wrong Answer'  # Default to Wrong Answer instead of Unknown
+            submitted_at = self._parse_timestamp(submission['timestamp'])
+            if submitted_at is None:
+                continue
 
-            # Prepare submission data
-            submission_data = {
-                'question_id': question.id,
+            rows[(question_id, submitted_at)] = {
+                'question_id': question_id,
                 'submitted_at': submitted_at,
-                'status': status
+                'status': self._map_status(submission.get('statusDisplay', ''))
             }
 
-            logger.debug(f"Storing submission data: {submission_data}")
+        rows = list(rows.values())
+        batch_counts = []
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            try:
+                counts = await self.queue.submit(
+                    lambda db: self._store_submission_batch(db, batch))
+            except Exception as e:
+                logger.error(
+                    f"Error storing submission batch: {str(e)}", exc_info=True)
+                counts = {'inserted': 0, 'updated': 0}
+            batch_counts.append(counts)
+
+        logger.debug(f"Stored submissions in batches: {batch_counts}")
+        return batch_counts
 
-            # First check if submission already exists with same question_id and submitted_at
-            existing = await self.db.execute(
-                select(Submission).where(
-                    Submission.question_id == question.id,
-                    Submission.submitted_at == submitted_at
-                )
+    @staticmethod
+    async def _resolve_question_ids(db: AsyncSession, slugs: Set[str]) -> Dict[str, int]:
+        result = await db.execute(
+            select(Question.title_slug, Question.id).where(
+                Question.title_slug.in_(slugs))
+        )
+        return {row.title_slug: row.id for row in result}
+
+    async def _store_submission_batch(self, db: AsyncSession, batch: List[Dict]) -> Dict[str, int]:
+        # Count keys that already exist so the changed rows can be split
+        # into inserted and updated rows
+        existing = await db.execute(
+            select(func.count()).select_from(Submission).where(
+                tuple_(Submission.question_id, Submission.submitted_at).in_(
+                    [(row['question_id'], row['submitted_at'])
+                     for row in batch])
             )
-            existing = existing.scalar_one_or_none()
+        )
+        inserted = len(batch) - existing.scalar()
 
-            if existing:
-                # Update existing submission
-                existing.status = status
-            else:
-                # Create new submission
-                new_submission = Submission(**submission_data)
-                self.db.add(new_submission)
+        # Only rows with a new status are updated, so re-storing known
+        # submissions (every poll does) changes nothing
+        stmt = sqlite_insert(Submission).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['question_id', 'submitted_at'],
+            set_={'status': stmt.excluded.status},
+            where=Submission.status != stmt.excluded.status
+        )
+        result = await db.execute(stmt)
+        changed = result.rowcount
+        if changed <= 0:
+            return {'inserted': 0, 'updated': 0}
 
-            await self.db.commit()
-            return True
+        await refresh_rollups(
+            db,
+            {row['submitted_at'].date() for row in batch},
+            {row['question_id'] for row in batch})
+        await refresh_review_state(db, batch)
+        self._mark_changed(db)
+        self._count_rows(db, 'submissions', changed)
 
-        except Exception as e:
-            logger.error(f"Error storing submission: {str(e)}", exc_info=True)
-            await self.db.rollback()
-            return False
+        return {
+            'inserted': inserted,
+            'updated': changed - inserted
+        }
 
     async def store_question(self, question_data: Dict) -> Optional[Question]:
         """Store a question in the database."""
         try:
-            # Prepare question data
-            question_dict = {
-                'leetcode_id': question_data['frontendId'],
-                'title': question_data['title'],
-                'title_slug': question_data['titleSlug'],
-                'difficulty': question_data['difficulty'].lower(),
-                'description': question_data.get('content', '')
-            }
+            return await self.queue.submit(
+                lambda db: self._store_question(db, question_data))
+        except Exception as e:
+            logger.error(f"Error storing question: {str(e)}", exc_info=True)
+            return None
 
-            logger.debug(f"Storing question data: {question_dict}")
+    async def _store_question(self, db: AsyncSession, question_data: Dict) -> Question:
+        # Prepare question data
+        question_dict = {
+            'leetcode_id': question_data['frontendId'],
+            'title': question_data['title'],
+            'title_slug': question_data['titleSlug'],
+            'difficulty': question_data['difficulty'].lower(),
+            'description': question_data.get('content', '')
+        }
 
-            # Use SQLite's UPSERT
-            stmt = sqlite_insert(Question).values(question_dict)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['leetcode_id'],
-                set_=question_dict
-            )
+        logger.debug(f"Storing question data: {question_dict}")
 
-            result = await self.db.execute(stmt)
-            await self.db.commit()
+        # Use SQLite's UPSERT, updating only when a field changed
+        stmt = sqlite_insert(Question).values(question_dict)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['leetcode_id'],
+            set_={**question_dict, 'updated_at': func.now()},
+            where=or_(*(
+                getattr(Question, name).is_distinct_from(stmt.excluded[name])
+                for name in question_dict
+            ))
+        )
 
-            # Get the question instance
-            question = await self.db.execute(
-                select(Question).where(Question.leetcode_id ==
-                                       question_data['frontendId'])
+        result = await db.execute(stmt)
+        if result.rowcount > 0:
+            self._mark_changed(db)
+            self._count_rows(db, 'questions', result.rowcount)
+        else:
+            # Unchanged metadata was still refetched; record the refresh so
+            # the question cache treats it as fresh after a restart
+            await db.execute(
+                update(Question)
+                .where(Question.leetcode_id == question_dict['leetcode_id'])
+                .values(updated_at=func.now())
             )
-            return question.scalar_one()
 
-        except Exception as e:
-            logger.error(f"Error storing question: {str(e)}", exc_info=True)
-            await self.db.rollback()
-            return None
+        # Get the question instance
+        question = await db.execute(
+            select(Question).where(Question.leetcode_id ==
+                                   question_data['frontendId'])
+        )
+        return question.scalar_one()
 
     async def store_tags(self, question: Question, tags: List[Dict]) -> bool:
         """Store tags for a question."""
         try:
-            logger.debug(
-                f"Storing {len(tags)} tags for question: {question.title_slug}")
-            for tag_data in tags:
-                # Insert tag if it doesn't exist
-                tag_stmt = sqlite_insert(Tag).values(
-                    {'name': tag_data['name']})
-                tag_stmt = tag_stmt.on_conflict_do_nothing()
-                await self.db.execute(tag_stmt)
-
-                # Get the tag
-                tag = await self.db.execute(
-                    select(Tag).where(Tag.name == tag_data['name'])
-                )
-                tag = tag.scalar_one()
-
-                # Link tag to question using the association table directly
-                link_stmt = sqlite_insert(question_tags).values({
-                    'question_id': question.id,
-                    'tag_id': tag.id
-                })
-                link_stmt = link_stmt.on_conflict_do_nothing()
-                await self.db.execute(link_stmt)
-
-            await self.db.commit()
-            return True
-
+            return await self.queue.submit(
+                lambda db: self._store_tags(db, question, tags))
         except Exception as e:
             logger.error(f"Error storing tags: {str(e)}", exc_info=True)
-            await self.db.rollback()
             return False
+
+    async def _store_tags(self, db: AsyncSession, question: Question, tags: List[Dict]) -> bool:
+        logger.debug(
+            f"Storing {len(tags)} tags for question: {question.title_slug}")
+        tag_ids = await self._resolve_tag_ids(
+            db, {tag_data['name'] for tag_data in tags})
+
+        # Link all tags to the question in one executemany
+        if tag_ids:
+            link_stmt = sqlite_insert(question_tags).on_conflict_do_nothing()
+            result = await db.execute(link_stmt, [
+                {'question_id': question.id, 'tag_id': tag_id}
+                for tag_id in tag_ids.values()
+            ])
+            if result.rowcount > 0:
+                self._mark_changed(db)
+                self._count_rows(db, 'question_tags', result.rowcount)
+
+        after_commit(db, lambda: tag_cache.update(tag_ids))
+        return True
+
+    @staticmethod
+    async def _resolve_tag_ids(db: AsyncSession, names: Set[str]) -> Dict[str, int]:
+        """Get ids for tag names, creating any tags that don't exist yet.
+
+        Known names are served from the process-wide tag cache; the rest are
+        upserted with one multi-row insert and read back with one query.
+        """
+        tag_ids = {}
+        missing = []
+        for name in names:
+            tag_id = tag_cache.get(name)
+            if tag_id is None:
+                missing.append(name)
+            else:
+                tag_ids[name] = tag_id
+
+        if missing:
+            tag_stmt = sqlite_insert(Tag).values(
+                [{'name': name} for name in missing])
+            tag_stmt = tag_stmt.on_conflict_do_nothing()
+            await db.execute(tag_stmt)
+
+            result = await db.execute(
+                select(Tag.name, Tag.id).where(Tag.name.in_(missing))
+            )
+            tag_ids.update({row.name: row.id for row in result})
+
+        return tag_ids
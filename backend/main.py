@@ -3,7 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from .setup_logging import setup_logging
 from .config import settings
 from .leetcode.service import LeetCodeService
-from .routers import stats, recommendations
+from .routers import stats, recommendations, reviews, sync, metrics, debug
+from .metrics import MetricsMiddleware
 
 # Set up logging first
 setup_logging()
@@ -20,17 +21,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route request latency
+app.add_middleware(MetricsMiddleware)
+
 # Initialize LeetCode service
 leetcode_service = LeetCodeService()
 
 # Include routers
 app.include_router(stats.router, prefix=settings.API_V1_PREFIX)
 app.include_router(recommendations.router, prefix=settings.API_V1_PREFIX)
+app.include_router(reviews.router, prefix=settings.API_V1_PREFIX)
+app.include_router(sync.router, prefix=settings.API_V1_PREFIX)
+app.include_router(metrics.router)
+
+# Diagnostics expose raw SQL and query plans, so only debug builds serve them
+if settings.DEBUG:
+    app.include_router(debug.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Start the LeetCode service on application startup."""
+    """Start the LeetCode service on application startup.
+
+    The initial sync runs in the background, so this returns immediately.
+    """
     await leetcode_service.start()
 
 
@@ -40,5 +54,14 @@ async def shutdown_event():
     await leetcode_service.stop()
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
+
+    parser = argparse.ArgumentParser(description="LeetCode Stats API server")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve stored data without contacting LeetCode")
+    args = parser.parse_args()
+    if args.offline:
+        settings.OFFLINE_MODE = True
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
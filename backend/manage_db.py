@@ -1,9 +1,13 @@
 #!/usr/bin/env python
+import asyncio
 import os
 import sys
 from alembic.config import Config
 from alembic import command
 
+# Make the backend package importable when run from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 def run_migrations():
     """Run database migrations."""
@@ -29,6 +33,64 @@ def show_migrations():
     command.history(alembic_cfg)
 
 
+def rebuild_rollups():
+    """Recompute all rollup tables and review schedules from the submissions table."""
+    from backend.database import AsyncSessionLocal
+    from backend.rollups import rebuild_rollups as rebuild
+
+    async def _rebuild():
+        async with AsyncSessionLocal() as db:
+            await rebuild(db)
+            await db.commit()
+
+    asyncio.run(_rebuild())
+    print("Rollup tables and review schedules rebuilt")
+
+
+def sync_status():
+    """Show progress of an interrupted historical backfill."""
+    from backend.database import ReadSessionLocal
+    from backend.leetcode.checkpoints import SyncCheckpoints
+    from backend.leetcode.fetcher import PROGRESS_PAGE_SIZE, SUBMISSION_PAGE_SIZE
+
+    async def _status():
+        async with ReadSessionLocal() as db:
+            return await SyncCheckpoints.status(
+                db, PROGRESS_PAGE_SIZE, SUBMISSION_PAGE_SIZE)
+
+    status = asyncio.run(_status())
+    if not status['in_progress']:
+        print("No backfill in progress")
+        return
+
+    if status['scan_offset'] is not None:
+        state = "complete" if status['scan_completed'] else "in progress"
+        print(f"Solved question scan: {status['scan_offset']}"
+              f"/{status['scan_total'] or '?'} ({state})")
+    print(f"Questions pending: {status['questions_pending']}")
+    print(f"Questions completed: {status['questions_completed']}")
+    print(f"Estimated remaining requests: {status['estimated_requests']}")
+
+
+def top_queries(limit=20, url="http://localhost:8000"):
+    """Show the slowest statements recorded by a running server."""
+    import httpx
+
+    response = httpx.get(f"{url}/api/v1/debug/queries", params={"limit": limit})
+    response.raise_for_status()
+    data = response.json()
+
+    print(f"Slow query threshold: {data['threshold_ms']:.0f} ms")
+    for query in data['queries']:
+        print()
+        print(f"{query['total_ms']:10.1f} ms total  {query['calls']:8d} calls  "
+              f"{query['mean_ms']:8.2f} ms mean  {query['max_ms']:8.2f} ms max  "
+              f"{query['slow_calls']} slow")
+        print(f"  {query['fingerprint']}")
+        for step in query['plan'] or []:
+            print(f"    plan: {step}")
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python manage_db.py [command] [args]")
@@ -37,6 +99,9 @@ def main():
         print("  create [message] Create a new migration")
         print("  rollback [rev]   Rollback to a specific migration")
         print("  show            Show migration history")
+        print("  rebuild-rollups Recompute rollups and review schedules from submissions")
+        print("  sync-status     Show progress of an interrupted backfill")
+        print("  top-queries [n] [url]  Show the slowest statements of a running server")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -55,6 +120,14 @@ def main():
         rollback_migration(sys.argv[2])
     elif command == "show":
         show_migrations()
+    elif command == "rebuild-rollups":
+        rebuild_rollups()
+    elif command == "sync-status":
+        sync_status()
+    elif command == "top-queries":
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        url = sys.argv[3] if len(sys.argv) > 3 else "http://localhost:8000"
+        top_queries(limit, url)
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -0,0 +1,357 @@
+"""
+Prometheus-style metrics for the LeetCode Stats application.
+
+Metrics live in a process-wide registry and are rendered in the Prometheus
+text exposition format by the ``/metrics`` endpoint. Every update happens on
+the event loop thread, so series are plain attributes updated without locks;
+recording a sample costs a dict lookup and an addition (plus a bisect for
+histograms), cheap enough to leave on in production.
+
+Counters, gauges and histograms take optional label names. Values for
+existing in-memory stats (cache hit counters, limiter rate, ...) are exported
+through callback gauges that are read only when ``/metrics`` is scraped.
+"""
+
+import bisect
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace(
+            "\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    """Base class holding one child series per label value tuple."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        """Get the series for the given label values, creating it if needed."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        for values, child in self._children.items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled series."""
+        self._default.value += amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        """Set the unlabelled series."""
+        self._default.value = value
+
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled series."""
+        self._default.value += amount
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing the elapsed time of its block."""
+
+    __slots__ = ("_target", "_start")
+
+    def __init__(self, target):
+        self._target = target
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._target.observe(time.perf_counter() - self._start)
+        return False
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float):
+        """Record a value in the unlabelled series."""
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        """Time a block and record it in the unlabelled series."""
+        return _Timer(self._default)
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds + (math.inf,), child.counts):
+            cumulative += count
+            labels = _format_labels(
+                self.labelnames + ("le",), values + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+CallbackResult = Union[float, Dict[LabelValues, float]]
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose values are read from a callback at scrape time.
+
+    The callback returns a number, or a dict mapping label value tuples to
+    numbers when the gauge has labels.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str,
+                 callback: Callable[[], CallbackResult],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        try:
+            result = self.callback()
+        except Exception:
+            return lines
+        if not isinstance(result, dict):
+            result = {(): result}
+        for values, value in result.items():
+            if value is None:
+                continue
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together.
+
+    Registering a metric under an existing name replaces it, so objects that
+    are recreated (e.g. a new service instance) re-bind their callbacks.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str,
+                  labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(self, name: str, documentation: str,
+                       callback: Callable[[], CallbackResult],
+                       labelnames: Sequence[str] = ()) -> CallbackGauge:
+        return self.register(
+            CallbackGauge(name, documentation, callback, labelnames))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served by /metrics
+registry = MetricsRegistry()
+
+# LeetCode GraphQL client
+graphql_latency = registry.histogram(
+    "leetcode_graphql_request_seconds",
+    "LeetCode GraphQL request latency by operation",
+    ["operation"])
+graphql_retries = registry.counter(
+    "leetcode_graphql_retries_total",
+    "LeetCode GraphQL requests retried after a failed attempt",
+    ["operation"])
+graphql_throttled = registry.counter(
+    "leetcode_graphql_throttled_total",
+    "LeetCode GraphQL responses with status 429",
+    ["operation"])
+
+# Ingest
+rows_written = registry.counter(
+    "db_rows_written_total",
+    "Rows committed by DatabaseWriter",
+    ["table"])
+poll_duration = registry.histogram(
+    "leetcode_poll_duration_seconds",
+    "Duration of each poll for recent submissions",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+submission_lag = registry.gauge(
+    "leetcode_submission_lag_seconds",
+    "Newest LeetCode submission time minus newest stored submission time")
+
+# API
+http_latency = registry.histogram(
+    "http_request_duration_seconds",
+    "API request latency by route",
+    ["method", "route", "status"])
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    The route is read from the scope after the router has matched it, so
+    path parameters don't create new series; unmatched paths share one
+    ``unmatched`` label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_latency.labels(scope["method"], path, status).observe(
+                time.perf_counter() - start)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, text
+from sqlalchemy import Column, Integer, String, Text, Boolean, Date, DateTime, Float, ForeignKey, Index, Table, UniqueConstraint, text
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -13,7 +13,8 @@ question_tags = Table(
     Column('question_id', Integer, ForeignKey(
         'questions.id', ondelete='CASCADE'), primary_key=True),
     Column('tag_id', Integer, ForeignKey(
-        'tags.id', ondelete='CASCADE'), primary_key=True)
+        'tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('idx_question_tags_tag_question', 'tag_id', 'question_id')
 )
 
 
@@ -54,6 +55,14 @@ class Tag(Base):
 
 class Submission(Base):
     __tablename__ = 'submissions'
+    __table_args__ = (
+        UniqueConstraint('question_id', 'submitted_at',
+                         name='unique_submission'),
+        Index('idx_submissions_submitted_at', 'submitted_at'),
+        Index('idx_submissions_status_question', 'status', 'question_id'),
+        Index('idx_submissions_status_submitted_question',
+              'status', 'submitted_at', 'question_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     question_id = Column(Integer, ForeignKey(
@@ -65,3 +74,104 @@ class Submission(Base):
 
     # Relationships
     question = relationship('Question', back_populates='submissions')
+
+
+class DailyActivity(Base):
+    """Per-day submission rollup maintained by DatabaseWriter."""
+    __tablename__ = 'daily_activity'
+
+    date = Column(Date, primary_key=True)
+    # Distinct questions with any submission that day
+    questions_attempted = Column(Integer, nullable=False, default=0)
+    # Distinct questions with an accepted submission that day
+    accepted_questions = Column(Integer, nullable=False, default=0)
+    total_submissions = Column(Integer, nullable=False, default=0)
+    # Distinct accepted questions by difficulty
+    easy_count = Column(Integer, nullable=False, default=0)
+    medium_count = Column(Integer, nullable=False, default=0)
+    hard_count = Column(Integer, nullable=False, default=0)
+
+
+class StreakState(Base):
+    """Single-row streak summary maintained alongside daily_activity."""
+    __tablename__ = 'streak_state'
+
+    id = Column(Integer, primary_key=True)
+    current_start = Column(Date, nullable=True)
+    current_length = Column(Integer, nullable=False, default=0)
+    best_length = Column(Integer, nullable=False, default=0)
+    last_active_date = Column(Date, nullable=True)
+
+
+class QuestionProgress(Base):
+    """Per-question submission rollup maintained by DatabaseWriter."""
+    __tablename__ = 'question_progress'
+    __table_args__ = (
+        Index('idx_question_progress_last_accepted', 'last_accepted_at'),
+    )
+
+    question_id = Column(Integer, ForeignKey(
+        'questions.id', ondelete='CASCADE'), primary_key=True)
+    # NULL while the question has no accepted submission
+    first_accepted_at = Column(DateTime(timezone=True), nullable=True)
+    last_accepted_at = Column(DateTime(timezone=True), nullable=True)
+    last_submission_at = Column(DateTime(timezone=True), nullable=False)
+    # All submissions, accepted or not
+    attempts = Column(Integer, nullable=False, default=0)
+    accepted_count = Column(Integer, nullable=False, default=0)
+
+
+class SyncCheckpoint(Base):
+    """Progress of an interrupted historical backfill.
+
+    One ``progress`` row tracks the solved-question list; one row per
+    question tracks its submission pages. Rows are cleared once the
+    backfill completes.
+    """
+    __tablename__ = 'sync_checkpoints'
+
+    # 'progress' or 'question:<title_slug>'
+    key = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)  # 'progress' or 'question'
+    title_slug = Column(String, nullable=True)
+    # Next page offset (``skip`` for the solved-question list)
+    cursor_offset = Column(Integer, nullable=False, default=0)
+    last_key = Column(String, nullable=True)
+    # Newest stored submission when the question was queued
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    # totalNum of the solved-question list, numSubmitted for a question
+    total = Column(Integer, nullable=True)
+    # Question entry from the solved-question list, as JSON
+    payload = Column(Text, nullable=True)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), server_default=text(
+        'CURRENT_TIMESTAMP'), nullable=False)
+
+
+class ReviewState(Base):
+    """Spaced-repetition schedule of a question, maintained by DatabaseWriter.
+
+    Submissions are folded in time order with the SM-2 algorithm: each
+    accepted re-solve on a later day is a successful review that grows the
+    interval, and the first failed attempt after a success is a lapse that
+    resets it. ``next_due`` is NULL until the question is first solved.
+    """
+    __tablename__ = 'review_state'
+    __table_args__ = (
+        Index('idx_review_state_next_due', 'next_due'),
+    )
+
+    question_id = Column(Integer, ForeignKey(
+        'questions.id', ondelete='CASCADE'), primary_key=True)
+    # Successful reviews in a row
+    repetitions = Column(Integer, nullable=False, default=0)
+    interval_days = Column(Float, nullable=False, default=0.0)
+    ease = Column(Float, nullable=False, default=2.5)
+    # Failed attempts that broke a run of successful reviews
+    lapses = Column(Integer, nullable=False, default=0)
+    # Failed attempts since the last accepted submission
+    failed_attempts = Column(Integer, nullable=False, default=0)
+    # Newest submission folded into this state
+    last_submission_at = Column(DateTime(timezone=True), nullable=True)
+    last_reviewed_at = Column(DateTime(timezone=True), nullable=True)
+    next_due = Column(DateTime(timezone=True), nullable=True)
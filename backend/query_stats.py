@@ -0,0 +1,177 @@
+"""
+Per-statement query timing for the LeetCode Stats application.
+
+Cursor execute events on both engines time every SQL statement and
+aggregate the timings under a normalized fingerprint: literals, bound
+parameter lists and repeated VALUES rows are collapsed, so every execution
+of the same query shape lands in one bucket regardless of its parameters.
+
+Statements slower than ``settings.SLOW_QUERY_THRESHOLD_MS`` are logged, and
+the first time a fingerprint is slow its ``EXPLAIN QUERY PLAN`` is captured
+on the same connection. The top statements by total time are served by
+``/api/v1/debug/queries`` (only when ``settings.DEBUG`` is set) and printed
+by ``manage_db.py top-queries``. Timing is off unless
+``settings.QUERY_STATS_ENABLED`` is set.
+"""
+
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_ROWS = re.compile(r"(\(\.\.\.\)|\(\s*\?\s*\))(?:\s*,\s*(?:\(\.\.\.\)|\(\s*\?\s*\)))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so executions of one query shape match.
+
+    Args:
+        statement: str - SQL as sent to the driver
+
+    Returns:
+        str: The statement with literals replaced by ``?``, placeholder
+        lists collapsed to ``(...)`` and whitespace squeezed
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _IN_LIST.sub("(...)", normalized)
+    normalized = _VALUES_ROWS.sub("(...)", normalized)
+    return normalized
+
+
+class QueryStats:
+    """Aggregated statement timings keyed by fingerprint.
+
+    At most ``max_fingerprints`` distinct fingerprints are tracked; later
+    ones are counted in ``untracked`` so memory stays bounded.
+    """
+
+    def __init__(self, threshold_ms: float, max_fingerprints: int):
+        self.threshold = threshold_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, Dict] = {}
+        self.untracked = 0
+
+    def record(self, statement: str, elapsed: float) -> Optional[Dict]:
+        """Add one execution to its fingerprint's totals.
+
+        Returns:
+            Optional[Dict]: The fingerprint's entry, or None if untracked
+        """
+        key = fingerprint(statement)
+        entry = self._stats.get(key)
+        if entry is None:
+            if len(self._stats) >= self.max_fingerprints:
+                self.untracked += 1
+                return None
+            entry = self._stats[key] = {
+                'fingerprint': key,
+                'calls': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'slow_calls': 0,
+                'plan': None
+            }
+        elapsed_ms = elapsed * 1000
+        entry['calls'] += 1
+        entry['total_ms'] += elapsed_ms
+        if elapsed_ms > entry['max_ms']:
+            entry['max_ms'] = elapsed_ms
+        if elapsed >= self.threshold:
+            entry['slow_calls'] += 1
+        return entry
+
+    def top(self, limit: int = 20) -> List[Dict]:
+        """Get the statements with the highest total time.
+
+        Args:
+            limit: int - Maximum number of statements
+
+        Returns:
+            List[Dict]: Fingerprint, calls, total/mean/max milliseconds, slow
+            call count and the captured query plan, if any
+        """
+        entries = sorted(
+            self._stats.values(), key=lambda entry: entry['total_ms'],
+            reverse=True)[:limit]
+        return [
+            {
+                **entry,
+                'total_ms': round(entry['total_ms'], 3),
+                'mean_ms': round(entry['total_ms'] / entry['calls'], 3),
+                'max_ms': round(entry['max_ms'], 3)
+            }
+            for entry in entries
+        ]
+
+    def reset(self):
+        """Forget all recorded timings."""
+        self._stats.clear()
+        self.untracked = 0
+
+
+def _explain(connection, statement: str, parameters, executemany: bool) -> List[str]:
+    """Run EXPLAIN QUERY PLAN for a statement on a fresh DBAPI cursor."""
+    if executemany and parameters:
+        parameters = parameters[0]
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def instrument(sync_engine: Engine, stats: "QueryStats") -> None:
+    """Time every statement executed through an engine.
+
+    Args:
+        sync_engine: Engine - The engine (``AsyncEngine.sync_engine``)
+        stats: QueryStats - Where timings are recorded
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        entry = stats.record(statement, elapsed)
+        if entry is None or elapsed < stats.threshold:
+            return
+
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {entry['fingerprint']}")
+        if entry['plan'] is None:
+            try:
+                entry['plan'] = _explain(conn, statement, parameters, executemany)
+                logger.warning(
+                    f"Query plan for {entry['fingerprint']}: {entry['plan']}")
+            except Exception as e:
+                entry['plan'] = []
+                logger.debug(f"Could not explain query: {str(e)}")
+
+
+# Shared by the writer and read engines
+query_stats = QueryStats(
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    settings.QUERY_STATS_MAX_FINGERPRINTS
+)
@@ -0,0 +1,156 @@
+"""
+Recommendation sampling for the LeetCode Stats application.
+
+Recommendations are previously solved questions that haven't been solved
+again within the last ``days_not_attempted`` days. The eligible question ids
+are grouped into one candidate pool per difficulty, read from the
+``question_progress`` rollup and cached until the data version or the day
+changes. A request then samples ``k`` ids per difficulty from its pool and
+loads titles and tags for just those ids, so its cost is O(k) regardless of
+how many submissions are stored.
+"""
+
+import logging
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Question, QuestionProgress, Tag, question_tags
+from .response_cache import data_version
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# Joins tag names in GROUP_CONCAT; never part of a tag name
+TAG_SEPARATOR = '\x1f'
+
+PoolKey = Tuple[str, int, int, date]
+
+
+class RecommendationEngine:
+    """Per-difficulty candidate pools and O(k) sampling from them.
+
+    Pools are keyed by data version, ``days_not_attempted`` and the current
+    date, so new submissions and the passing of days both rebuild them. Only
+    pools for the current data version are kept.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self._pools: Dict[PoolKey, Dict[str, List[int]]] = {}
+        self.builds = 0
+
+    async def get_pools(self, db: AsyncSession,
+                        days_not_attempted: int) -> Dict[str, List[int]]:
+        """Get the candidate question ids per difficulty.
+
+        Args:
+            db: AsyncSession - The database session
+            days_not_attempted: int - Days a candidate must not have been solved in
+
+        Returns:
+            Dict[str, List[int]]: Question ids by difficulty
+        """
+        today = date.today()
+        key = (data_version.epoch, data_version.value, days_not_attempted, today)
+        pools = self._pools.get(key)
+        if pools is None:
+            pools = await self._build_pools(db, days_not_attempted, today)
+            # Pools of older versions can never be hit again
+            self._pools = {
+                cached_key: cached for cached_key, cached in self._pools.items()
+                if cached_key[:2] == key[:2] and cached_key[3] == today
+            }
+            self._pools[key] = pools
+        return pools
+
+    async def _build_pools(self, db: AsyncSession, days_not_attempted: int,
+                           today: date) -> Dict[str, List[int]]:
+        cutoff = datetime.combine(
+            today - timedelta(days=days_not_attempted), datetime.min.time())
+        # Solved at least once, and not since the cutoff
+        result = await db.execute(
+            select(Question.id, Question.difficulty)
+            .join(QuestionProgress, QuestionProgress.question_id == Question.id)
+            .where(QuestionProgress.last_accepted_at < cutoff)
+        )
+        pools: Dict[str, List[int]] = {difficulty: [] for difficulty in DIFFICULTIES}
+        for row in result:
+            pools.setdefault(row.difficulty, []).append(row.id)
+
+        self.builds += 1
+        sizes = {difficulty: len(ids) for difficulty, ids in pools.items()}
+        logger.debug(
+            f"Built recommendation pools for {days_not_attempted} days: {sizes}")
+        return pools
+
+    async def recommend(self, db: AsyncSession, difficulty_counts: Dict[str, int],
+                        days_not_attempted: int) -> List[dict]:
+        """Sample recommendations from the candidate pools.
+
+        Args:
+            db: AsyncSession - The database session
+            difficulty_counts: Dict[str, int] - Number of problems per difficulty
+            days_not_attempted: int - Days a candidate must not have been solved in
+
+        Returns:
+            List[dict]: Recommended problems with id, title, difficulty and
+            tags, grouped by difficulty; fewer than requested if a pool is small
+        """
+        pools = await self.get_pools(db, days_not_attempted)
+
+        sampled: List[int] = []
+        for difficulty, count in difficulty_counts.items():
+            pool = pools.get(difficulty, [])
+            if count > 0 and pool:
+                sampled.extend(self.rng.sample(pool, min(count, len(pool))))
+        if not sampled:
+            return []
+
+        details = await load_question_details(db, sampled)
+        return [details[question_id] for question_id in sampled
+                if question_id in details]
+
+
+async def load_question_details(db: AsyncSession,
+                                question_ids: List[int]) -> Dict[int, dict]:
+    """Load title, difficulty and tags of a few questions in one query.
+
+    Args:
+        db: AsyncSession - The database session
+        question_ids: List[int] - Question ids
+
+    Returns:
+        Dict[int, dict]: ``id``, ``title``, ``difficulty`` and sorted
+        ``tags`` by question id
+    """
+    result = await db.execute(
+        select(
+            Question.id,
+            Question.title,
+            Question.difficulty,
+            func.group_concat(Tag.name, TAG_SEPARATOR).label('tag_names')
+        )
+        .outerjoin(question_tags, question_tags.c.question_id == Question.id)
+        .outerjoin(Tag, Tag.id == question_tags.c.tag_id)
+        .where(Question.id.in_(question_ids))
+        .group_by(Question.id)
+    )
+    return {
+        row.id: {
+            'id': row.id,
+            'title': row.title,
+            'difficulty': row.difficulty,
+            'tags': sorted(row.tag_names.split(TAG_SEPARATOR))
+            if row.tag_names else []
+        }
+        for row in result
+    }
+
+
+# Shared by the recommendations endpoint
+recommendation_engine = RecommendationEngine()
@@ -0,0 +1,214 @@
+"""
+In-process response cache for the LeetCode Stats API.
+
+Responses are cached per route and query parameters and tagged with the data
+version that was current when they were computed. DatabaseWriter bumps the
+version whenever a commit changes rows, which invalidates every cached
+response at once; until then, cached requests never touch the database.
+
+The same data version drives HTTP validation: responses carry a strong ETag
+and requests whose If-None-Match still matches are answered with
+304 Not Modified before any query runs.
+"""
+
+import hashlib
+import json
+import uuid
+import logging
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersion:
+    """Monotonically increasing counter of committed data changes.
+
+    The counter restarts with the process, so ``epoch`` tells versions from
+    different runs apart.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.value = 0
+
+    def bump(self) -> int:
+        """Record that committed data changed.
+
+        Returns:
+            int: The new data version
+        """
+        self.value += 1
+        return self.value
+
+
+class ResponseCache:
+    """LRU cache of endpoint results bounded by entry count and size."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any, int]]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: int) -> Tuple[bool, Any]:
+        """Look up a response computed at the given data version.
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was found, and the cached value
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, key: Hashable, version: int, value: Any):
+        """Store a response computed at the given data version."""
+        size = len(json.dumps(jsonable_encoder(value)))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (version, value, size)
+        self.size_bytes += size
+
+        while (len(self._entries) > self.max_entries
+               or self.size_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached response."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+
+data_version = DataVersion()
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    settings.RESPONSE_CACHE_MAX_BYTES
+)
+
+registry.gauge_callback(
+    "response_cache", "Response cache counters",
+    lambda: {(key,): value for key, value in response_cache.stats().items()},
+    ["stat"])
+registry.gauge_callback(
+    "data_version", "Committed data changes since startup",
+    lambda: data_version.value)
+
+
+def current_dates() -> Tuple[date, date]:
+    """Local and UTC date; crud defaults use both to place date windows."""
+    return date.today(), datetime.utcnow().date()
+
+
+def cached_response(route: str, by_date: bool = False) -> Callable:
+    """Cache an endpoint's result until the data version changes.
+
+    The cache key is the route name plus every endpoint argument except the
+    database session. Exceptions are never cached.
+
+    Args:
+        route: str - Name identifying the endpoint in cache keys
+        by_date: bool - The result depends on the current date (default date
+            ranges, windows of "the last N days"), so the date is part of the
+            cache key and of the ETag
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            params = tuple(sorted(
+                (name, value) for name, value in kwargs.items()
+                if not isinstance(value, AsyncSession)
+            ))
+            key = (route, params, current_dates() if by_date else None)
+            version = data_version.value
+
+            found, value = response_cache.get(key, version)
+            if found:
+                return value
+
+            value = await endpoint(**kwargs)
+            response_cache.put(key, version, value)
+            return value
+        # Read by compute_etag through the matched route's endpoint
+        wrapper.etag_by_date = by_date
+        return wrapper
+    return decorator
+
+
+def compute_etag(request: Request) -> str:
+    """Build a strong ETag from the data version and the request.
+
+    Routes cached with ``by_date`` also include the current date.
+
+    Args:
+        request: Request - The incoming request
+
+    Returns:
+        str: Quoted ETag value
+    """
+    query = "&".join(sorted(
+        f"{name}={value}" for name, value in request.query_params.multi_items()
+    ))
+    validator = f"{request.url.path}?{query}"
+    if getattr(request.scope.get("endpoint"), "etag_by_date", False):
+        validator += "#" + "/".join(day.isoformat() for day in current_dates())
+    digest = hashlib.sha1(validator.encode()).hexdigest()[:16]
+    return f'"{data_version.epoch}-{data_version.value}-{digest}"'
+
+
+async def check_etag(request: Request, response: Response):
+    """Answer 304 Not Modified when the client's copy is still current.
+
+    Used as a router dependency, so it runs before the endpoint and before
+    any crud query or response serialization.
+
+    Raises:
+        HTTPException: 304 if If-None-Match matches the current ETag
+    """
+    etag = compute_etag(request)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        if etag in candidates or "*" in candidates:
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+
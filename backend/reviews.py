@@ -0,0 +1,203 @@
+"""
+Spaced-repetition review schedule for the LeetCode Stats application.
+
+Every question with submissions has a ``review_state`` row holding its SM-2
+schedule: repetitions, interval, ease, lapses and the ``next_due`` time of
+its next review. DatabaseWriter refreshes the rows of the questions it writes
+in the same transaction as the submissions, so the due queue is read from
+the ``next_due`` index and requests never scan the submission history.
+
+Submissions that arrive in time order are folded into the stored state. A
+batch that reaches back before a question's newest folded submission (the
+backfill pages newest-first, and upserts may change old statuses) replays
+that question's own history instead. ``python manage_db.py rebuild-rollups``
+recomputes every row.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import ReviewState, Submission
+
+logger = logging.getLogger(__name__)
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# Ease removed by a lapse
+LAPSE_EASE_PENALTY = 0.2
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+LAPSE_INTERVAL_DAYS = 1.0
+MAX_INTERVAL_DAYS = 365.0
+
+# States written per upsert during a full rebuild
+REBUILD_CHUNK = 500
+
+STATE_COLUMNS = [column.name for column in ReviewState.__table__.columns]
+
+
+def new_state(question_id: int) -> Dict:
+    """Schedule of a question without any folded submissions."""
+    return {
+        'question_id': question_id,
+        'repetitions': 0,
+        'interval_days': 0.0,
+        'ease': INITIAL_EASE,
+        'lapses': 0,
+        'failed_attempts': 0,
+        'last_submission_at': None,
+        'last_reviewed_at': None,
+        'next_due': None
+    }
+
+
+def apply_submission(state: Dict, submitted_at: datetime, status: str) -> None:
+    """Fold one submission into a schedule with the SM-2 algorithm.
+
+    An accepted submission on a later day than the last review is a review
+    graded 5, minus one per failed attempt before it (at least 3). Accepted
+    re-solves on the same day only clear the failed attempts. The first
+    failed attempt after a successful review is a lapse: the run of
+    repetitions restarts and the question is due again the next day.
+
+    Args:
+        state: Dict - Schedule to update in place
+        submitted_at: datetime - Submission time, not older than the state's
+            last folded submission
+        status: str - Submission status
+    """
+    state['last_submission_at'] = submitted_at
+
+    if status != 'Accepted':
+        state['failed_attempts'] += 1
+        if state['repetitions'] > 0 and state['failed_attempts'] == 1:
+            state['lapses'] += 1
+            state['repetitions'] = 0
+            state['ease'] = max(MIN_EASE, state['ease'] - LAPSE_EASE_PENALTY)
+            state['interval_days'] = LAPSE_INTERVAL_DAYS
+            state['next_due'] = submitted_at + timedelta(days=LAPSE_INTERVAL_DAYS)
+        return
+
+    last_reviewed = state['last_reviewed_at']
+    if last_reviewed is not None and submitted_at.date() <= last_reviewed.date():
+        state['failed_attempts'] = 0
+        return
+
+    quality = max(3, 5 - state['failed_attempts'])
+    penalty = 5 - quality
+    state['ease'] = max(
+        MIN_EASE, state['ease'] + 0.1 - penalty * (0.08 + penalty * 0.02))
+    state['repetitions'] += 1
+    if state['repetitions'] == 1:
+        interval = FIRST_INTERVAL_DAYS
+    elif state['repetitions'] == 2:
+        interval = SECOND_INTERVAL_DAYS
+    else:
+        interval = state['interval_days'] * state['ease']
+    state['interval_days'] = min(MAX_INTERVAL_DAYS, interval)
+    state['failed_attempts'] = 0
+    state['last_reviewed_at'] = submitted_at
+    state['next_due'] = submitted_at + timedelta(days=state['interval_days'])
+
+
+async def refresh_review_state(db: AsyncSession, submissions: Iterable[Dict]) -> None:
+    """Update the schedules of the questions of newly written submissions.
+
+    Expects the submissions to be written already. Does not commit.
+
+    Args:
+        db: AsyncSession - The database session
+        submissions: Iterable[Dict] - Written rows with ``question_id``,
+            ``submitted_at`` and ``status``
+    """
+    new_rows: Dict[int, List[Tuple[datetime, str]]] = defaultdict(list)
+    for submission in submissions:
+        new_rows[submission['question_id']].append(
+            (submission['submitted_at'], submission['status']))
+    if not new_rows:
+        return
+
+    result = await db.execute(
+        select(*ReviewState.__table__.columns).where(
+            ReviewState.question_id.in_(list(new_rows)))
+    )
+    stored = {row.question_id: dict(row._mapping) for row in result}
+
+    states = []
+    replay = []
+    for question_id, rows in new_rows.items():
+        rows.sort()
+        state = stored.get(question_id)
+        if (state is None or state['last_submission_at'] is None
+                or rows[0][0] <= state['last_submission_at']):
+            replay.append(question_id)
+            continue
+        for submitted_at, status in rows:
+            apply_submission(state, submitted_at, status)
+        states.append(state)
+
+    if replay:
+        states.extend(await _replay_questions(db, replay))
+    await _upsert_states(db, states)
+
+
+async def _replay_questions(db: AsyncSession, question_ids: List[int]) -> List[Dict]:
+    """Recompute schedules from each question's full submission history."""
+    result = await db.execute(
+        select(Submission.question_id, Submission.submitted_at, Submission.status)
+        .where(Submission.question_id.in_(question_ids))
+        .order_by(Submission.question_id, Submission.submitted_at)
+    )
+    states: Dict[int, Dict] = {}
+    for row in result:
+        state = states.get(row.question_id)
+        if state is None:
+            state = states[row.question_id] = new_state(row.question_id)
+        apply_submission(state, row.submitted_at, row.status)
+    return list(states.values())
+
+
+async def _upsert_states(db: AsyncSession, states: List[Dict]) -> None:
+    if not states:
+        return
+    stmt = sqlite_insert(ReviewState)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['question_id'],
+        set_={name: stmt.excluded[name] for name in STATE_COLUMNS
+              if name != 'question_id'}
+    )
+    await db.execute(stmt, states)
+
+
+async def rebuild_review_state(db: AsyncSession) -> None:
+    """Recompute every schedule from the submissions table. Does not commit."""
+    await db.execute(delete(ReviewState))
+
+    result = await db.stream(
+        select(Submission.question_id, Submission.submitted_at, Submission.status)
+        .order_by(Submission.question_id, Submission.submitted_at)
+        .execution_options(yield_per=REBUILD_CHUNK * 10)
+    )
+    chunk: List[Dict] = []
+    state = None
+    # Fetch whole partitions; iterating rows one by one costs a context
+    # switch per row in the async driver
+    async for rows in result.partitions():
+        for row in rows:
+            if state is None or state['question_id'] != row.question_id:
+                if state is not None:
+                    chunk.append(state)
+                state = new_state(row.question_id)
+            apply_submission(state, row.submitted_at, row.status)
+        if len(chunk) >= REBUILD_CHUNK:
+            await _upsert_states(db, chunk)
+            chunk = []
+    if state is not None:
+        chunk.append(state)
+    await _upsert_states(db, chunk)
@@ -0,0 +1,328 @@
+"""
+Rollup tables for the LeetCode Stats application.
+
+Rollups are summaries of the submissions table that the stats queries read
+instead of scanning every submission. They are refreshed by DatabaseWriter
+inside the same transaction that writes the submissions, and can be rebuilt
+from scratch with ``python manage_db.py rebuild-rollups``.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .reviews import rebuild_review_state
+
+
+# Aggregates one day of submissions into its daily_activity row
+DAILY_ACTIVITY_UPSERT = """
+INSERT INTO daily_activity (
+    date,
+    questions_attempted,
+    accepted_questions,
+    total_submissions,
+    easy_count,
+    medium_count,
+    hard_count
+)
+SELECT
+    DATE(s.submitted_at),
+    COUNT(DISTINCT s.question_id),
+    COUNT(DISTINCT CASE WHEN s.status = 'Accepted' THEN s.question_id END),
+    COUNT(*),
+    COUNT(DISTINCT CASE WHEN s.status = 'Accepted' AND q.difficulty = 'easy' THEN s.question_id END),
+    COUNT(DISTINCT CASE WHEN s.status = 'Accepted' AND q.difficulty = 'medium' THEN s.question_id END),
+    COUNT(DISTINCT CASE WHEN s.status = 'Accepted' AND q.difficulty = 'hard' THEN s.question_id END)
+FROM submissions s
+JOIN questions q ON s.question_id = q.id
+WHERE {where}
+GROUP BY DATE(s.submitted_at)
+ON CONFLICT (date) DO UPDATE SET
+    questions_attempted = excluded.questions_attempted,
+    accepted_questions = excluded.accepted_questions,
+    total_submissions = excluded.total_submissions,
+    easy_count = excluded.easy_count,
+    medium_count = excluded.medium_count,
+    hard_count = excluded.hard_count
+"""
+
+
+# Aggregates the submissions of questions into their question_progress rows
+QUESTION_PROGRESS_UPSERT = """
+INSERT INTO question_progress (
+    question_id,
+    first_accepted_at,
+    last_accepted_at,
+    last_submission_at,
+    attempts,
+    accepted_count
+)
+SELECT
+    s.question_id,
+    MIN(CASE WHEN s.status = 'Accepted' THEN s.submitted_at END),
+    MAX(CASE WHEN s.status = 'Accepted' THEN s.submitted_at END),
+    MAX(s.submitted_at),
+    COUNT(*),
+    SUM(CASE WHEN s.status = 'Accepted' THEN 1 ELSE 0 END)
+FROM submissions s
+WHERE {where}
+GROUP BY s.question_id
+ON CONFLICT (question_id) DO UPDATE SET
+    first_accepted_at = excluded.first_accepted_at,
+    last_accepted_at = excluded.last_accepted_at,
+    last_submission_at = excluded.last_submission_at,
+    attempts = excluded.attempts,
+    accepted_count = excluded.accepted_count
+"""
+
+
+# Recomputes the streak_state row from daily_activity
+STREAK_STATE_REBUILD = """
+WITH active_days AS (
+    SELECT date AS solve_date
+    FROM daily_activity
+    WHERE accepted_questions > 0
+),
+streak_groups AS (
+    SELECT
+        solve_date,
+        DATE(solve_date, '-' || ROW_NUMBER() OVER (ORDER BY solve_date) || ' days') AS group_start
+    FROM active_days
+),
+streaks AS (
+    SELECT
+        MIN(solve_date) AS streak_start,
+        MAX(solve_date) AS streak_end,
+        COUNT(*) AS streak_length
+    FROM streak_groups
+    GROUP BY group_start
+)
+INSERT INTO streak_state (
+    id, current_start, current_length, best_length, last_active_date
+)
+SELECT
+    1,
+    streak_start,
+    streak_length,
+    (SELECT MAX(streak_length) FROM streaks),
+    streak_end
+FROM streaks
+ORDER BY streak_end DESC
+LIMIT 1
+"""
+
+STREAK_STATE_UPSERT = """
+INSERT INTO streak_state (
+    id, current_start, current_length, best_length, last_active_date
+)
+VALUES (1, :current_start, :current_length, :best_length, :last_active_date)
+ON CONFLICT (id) DO UPDATE SET
+    current_start = excluded.current_start,
+    current_length = excluded.current_length,
+    best_length = excluded.best_length,
+    last_active_date = excluded.last_active_date
+"""
+
+# Number of active days read per query while walking a streak boundary
+STREAK_WALK_CHUNK = 64
+
+
+async def refresh_rollups(db: AsyncSession, days: Iterable[date],
+                          question_ids: Iterable[int]) -> None:
+    """Refresh every rollup affected by changed submissions.
+
+    Args:
+        db: AsyncSession - The database session
+        days: Iterable[date] - Days whose submissions changed
+        question_ids: Iterable[int] - Questions whose submissions changed
+    """
+    await refresh_question_progress(db, question_ids)
+
+    days = sorted(set(days))
+    if not days:
+        return
+
+    before = await _accepted_by_day(db, days)
+    await refresh_daily_activity(db, days)
+    after = await _accepted_by_day(db, days)
+
+    activated = [day for day in days
+                 if not before.get(day) and after.get(day)]
+    deactivated = [day for day in days
+                   if before.get(day) and not after.get(day)]
+    if deactivated:
+        # A day lost its only accepted submission; streaks may have split
+        await rebuild_streak_state(db)
+    elif activated:
+        await update_streak_state(db, activated)
+
+
+async def refresh_daily_activity(db: AsyncSession, days: Iterable[date]) -> None:
+    """Recompute the daily_activity rows for the given days.
+
+    Each day is re-aggregated from its own submissions only, using the
+    submitted_at index, so the cost depends on that day's activity rather
+    than on the size of the submissions table. Does not commit.
+
+    Args:
+        db: AsyncSession - The database session
+        days: Iterable[date] - Days whose submissions changed
+    """
+    params = [
+        {
+            "day_start": day.isoformat(),
+            "day_end": (day + timedelta(days=1)).isoformat()
+        }
+        for day in sorted(set(days))
+    ]
+    if not params:
+        return
+
+    query = DAILY_ACTIVITY_UPSERT.format(
+        where="s.submitted_at >= :day_start AND s.submitted_at < :day_end")
+    await db.execute(text(query), params)
+
+
+async def rebuild_daily_activity(db: AsyncSession) -> None:
+    """Recompute the whole daily_activity table. Does not commit."""
+    await db.execute(text("DELETE FROM daily_activity"))
+    await db.execute(text(DAILY_ACTIVITY_UPSERT.format(where="1 = 1")))
+
+
+async def refresh_question_progress(db: AsyncSession,
+                                    question_ids: Iterable[int]) -> None:
+    """Recompute the question_progress rows for the given questions.
+
+    Each question is re-aggregated from its own submissions through the
+    question_id index, which also keeps the counts right when an upsert
+    changes the status of a stored submission. Does not commit.
+
+    Args:
+        db: AsyncSession - The database session
+        question_ids: Iterable[int] - Questions whose submissions changed
+    """
+    question_ids = sorted(set(question_ids))
+    if not question_ids:
+        return
+
+    query = QUESTION_PROGRESS_UPSERT.format(where="s.question_id IN :question_ids")
+    await db.execute(
+        text(query).bindparams(bindparam("question_ids", expanding=True)),
+        {"question_ids": question_ids}
+    )
+
+
+async def rebuild_question_progress(db: AsyncSession) -> None:
+    """Recompute the whole question_progress table. Does not commit."""
+    await db.execute(text("DELETE FROM question_progress"))
+    await db.execute(text(QUESTION_PROGRESS_UPSERT.format(where="1 = 1")))
+
+
+async def update_streak_state(db: AsyncSession, activated: Iterable[date]) -> None:
+    """Fold newly active days into the streak_state row.
+
+    Days after the last active day extend or restart the current streak in
+    constant time. Backfilled days that land before it recompute only the
+    streak they belong to, by walking outwards to the nearest inactive days.
+    Expects daily_activity to already include the new days. Does not commit.
+
+    Args:
+        db: AsyncSession - The database session
+        activated: Iterable[date] - Days that just got their first accepted
+            submission
+    """
+    result = await db.execute(text(
+        "SELECT current_start, current_length, best_length, last_active_date "
+        "FROM streak_state WHERE id = 1"
+    ))
+    row = result.first()
+    current_start = _as_date(row.current_start) if row else None
+    current_length = row.current_length if row else 0
+    best_length = row.best_length if row else 0
+    last_active = _as_date(row.last_active_date) if row else None
+
+    for day in sorted(set(activated)):
+        if last_active is None or day > last_active + timedelta(days=1):
+            # Gap since the last active day starts a new streak
+            current_start, current_length = day, 1
+            last_active = day
+        elif day == last_active + timedelta(days=1):
+            current_length += 1
+            last_active = day
+        else:
+            # Out-of-order day: recompute the streak containing it
+            streak_start = await _streak_edge(db, day, backwards=True)
+            streak_end = await _streak_edge(db, day, backwards=False)
+            streak_length = (streak_end - streak_start).days + 1
+            best_length = max(best_length, streak_length)
+            if streak_end >= last_active:
+                current_start, current_length = streak_start, streak_length
+                last_active = streak_end
+            continue
+        best_length = max(best_length, current_length)
+
+    await db.execute(text(STREAK_STATE_UPSERT), {
+        "current_start": current_start.isoformat() if current_start else None,
+        "current_length": current_length,
+        "best_length": best_length,
+        "last_active_date": last_active.isoformat() if last_active else None
+    })
+
+
+async def rebuild_streak_state(db: AsyncSession) -> None:
+    """Recompute the streak_state row from daily_activity. Does not commit."""
+    await db.execute(text("DELETE FROM streak_state"))
+    await db.execute(text(STREAK_STATE_REBUILD))
+
+
+async def rebuild_rollups(db: AsyncSession) -> None:
+    """Recompute every rollup table from the submissions table. Does not commit.
+
+    Also rebuilds the review schedule (see reviews.py), which is derived from
+    the same history.
+    """
+    await rebuild_daily_activity(db)
+    await rebuild_streak_state(db)
+    await rebuild_question_progress(db)
+    await rebuild_review_state(db)
+
+
+async def _accepted_by_day(db: AsyncSession, days: Iterable[date]) -> Dict[date, int]:
+    """Get the accepted question count of each day from daily_activity."""
+    result = await db.execute(
+        text("SELECT date, accepted_questions FROM daily_activity "
+             "WHERE date IN :days").bindparams(bindparam("days", expanding=True)),
+        {"days": [day.isoformat() for day in days]}
+    )
+    return {_as_date(row.date): row.accepted_questions for row in result}
+
+
+async def _streak_edge(db: AsyncSession, day: date, backwards: bool) -> date:
+    """Find the first or last day of the streak that contains an active day."""
+    query = text(
+        "SELECT date FROM daily_activity "
+        "WHERE accepted_questions > 0 AND date {op} :day "
+        "ORDER BY date {order} LIMIT :limit".format(
+            op="<" if backwards else ">",
+            order="DESC" if backwards else "ASC")
+    )
+    step = timedelta(days=-1 if backwards else 1)
+    edge = day
+    while True:
+        result = await db.execute(
+            query, {"day": edge.isoformat(), "limit": STREAK_WALK_CHUNK})
+        active = [_as_date(row.date) for row in result]
+        for candidate in active:
+            if candidate != edge + step:
+                return edge
+            edge = candidate
+        if len(active) < STREAK_WALK_CHUNK:
+            return edge
+
+
+def _as_date(value) -> Optional[date]:
+    """Convert a DATE value read through raw SQL into a date."""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
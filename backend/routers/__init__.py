@@ -1 +1 @@
-from . import stats, recommendations
+from . import stats, recommendations, reviews, sync, metrics, debug
@@ -0,0 +1,32 @@
+"""
+Debug router for the LeetCode Stats API.
+
+This router exposes internal diagnostics:
+- Top SQL statements by total time, with their captured query plans
+"""
+
+from fastapi import APIRouter, Query
+from ..query_stats import query_stats
+
+router = APIRouter()
+
+
+@router.get("/debug/queries")
+async def get_query_stats(limit: int = Query(20, ge=1, le=500)):
+    """Get the SQL statements with the highest total execution time.
+
+    Args:
+        limit: Maximum number of statements to return (default: 20)
+
+    Returns:
+        dict: Object containing:
+            - threshold_ms: Slow query threshold
+            - untracked: Executions of fingerprints beyond the tracking limit
+            - queries: Per fingerprint calls, total/mean/max ms, slow calls
+              and the EXPLAIN QUERY PLAN captured for slow statements
+    """
+    return {
+        'threshold_ms': query_stats.threshold * 1000,
+        'untracked': query_stats.untracked,
+        'queries': query_stats.top(limit)
+    }
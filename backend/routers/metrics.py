@@ -0,0 +1,21 @@
+"""
+Metrics router for the LeetCode Stats API.
+
+Serves the process-wide metrics registry in the Prometheus text format:
+- LeetCode GraphQL latency, retries and 429 responses per operation
+- Rows written, poll duration and submission lag
+- API latency per route, plus cache, rate limiter and connection stats
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..metrics import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Get all metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4")
@@ -12,11 +12,13 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from ..crud import get_recommendations
 from ..schemas import Recommendation
+from ..response_cache import cached_response, check_etag
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(check_etag)])
 
 
 @router.get("/", response_model=dict)
+@cached_response("recommendations", by_date=True)
 async def get_recommendations_endpoint(
     easy_count: int = Query(
         3, ge=0, le=10, description="Number of easy problems to recommend"),
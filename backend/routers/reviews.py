@@ -0,0 +1,47 @@
+"""
+Reviews router for the LeetCode Stats API.
+
+This router serves the spaced-repetition review queue:
+- Solved questions whose next review is due, most overdue first
+
+Due items change as time passes, not only when data is written, so these
+responses are neither cached nor validated with data-version ETags.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..crud import get_due_reviews
+from ..schemas import DueReviews
+
+router = APIRouter()
+
+
+@router.get("/recommendations/due", response_model=DueReviews)
+async def get_due_reviews_endpoint(
+    limit: int = Query(
+        10, ge=1, le=100, description="Maximum number of due questions to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the questions due for review.
+
+    Args:
+        limit: int - Maximum number of due questions to return (default: 10)
+        db: AsyncSession - Database session (injected)
+
+    Returns:
+        DueReviews: Object containing:
+            - total_due: Number of questions currently due
+            - due: Most overdue questions first, with tags, next_due,
+              overdue_days, interval_days, ease, repetitions and lapses
+
+    Raises:
+        HTTPException: 500 if database error occurs
+
+    Example:
+        GET /api/v1/recommendations/due?limit=5
+    """
+    try:
+        return await get_due_reviews(db, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -22,11 +22,13 @@ from ..crud import (
     get_tag_stats
 )
 from ..schemas import OverviewStats, DailyStats
+from ..response_cache import cached_response, check_etag
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(check_etag)])
 
 
 @router.get("/overview", response_model=OverviewStats)
+@cached_response("stats.overview", by_date=True)
 async def get_overview(db: AsyncSession = Depends(get_db)):
     """Get high-level statistics about LeetCode activity.
 
@@ -60,6 +62,7 @@ async def get_overview(db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/daily", response_model=dict)
+@cached_response("stats.daily", by_date=True)
 async def get_daily_stats_endpoint(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -93,6 +96,7 @@ async def get_daily_stats_endpoint(
 
 
 @router.get("/tags")
+@cached_response("stats.tags")
 async def get_tag_stats_endpoint(
     start_date: str,
     end_date: str,
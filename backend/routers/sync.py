@@ -0,0 +1,31 @@
+"""
+Sync router for the LeetCode Stats API.
+
+This router reports on the background LeetCode sync that runs after startup:
+- Current phase (starting, backfilling, completed, failed, offline)
+- Questions done and discovered so far, submissions stored
+- Throughput and estimated time remaining
+"""
+
+from fastapi import APIRouter
+from ..schemas import SyncStatus
+from ..leetcode.progress import sync_progress
+
+router = APIRouter()
+
+
+@router.get("/sync/status", response_model=SyncStatus)
+async def get_sync_status():
+    """Get the progress of the background LeetCode sync.
+
+    Returns:
+        SyncStatus: Object containing:
+            - phase: Current sync phase
+            - done/total: Questions backfilled and discovered so far
+            - submissions: New submissions stored in this phase
+            - throughput: Questions per second in this phase
+            - eta_seconds: Estimated seconds remaining, if known
+            - elapsed_seconds: Time since the sync started
+            - error: Last error, if the sync failed
+    """
+    return sync_progress.snapshot()
@@ -81,3 +81,32 @@ class Recommendation(BaseModel):
     question: Question
     last_attempted: Optional[datetime]
     difficulty: str
+
+
+class SyncStatus(BaseModel):
+    phase: str
+    done: int
+    total: int
+    submissions: int
+    throughput: float
+    eta_seconds: Optional[float]
+    elapsed_seconds: float
+    error: Optional[str]
+
+
+class DueReview(BaseModel):
+    id: int
+    title: str
+    difficulty: str
+    tags: List[str]
+    next_due: datetime
+    overdue_days: float
+    interval_days: float
+    ease: float
+    repetitions: int
+    lapses: int
+
+
+class DueReviews(BaseModel):
+    total_due: int
+    due: List[DueReview]
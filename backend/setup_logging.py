@@ -4,6 +4,7 @@ Setup logging configuration for the LeetCode Stats application.
 
 import os
 import logging
+import logging.handlers
 from pathlib import Path
 from .config import settings
 
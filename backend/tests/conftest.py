@@ -0,0 +1,87 @@
+"""
+Shared fixtures for the backend tests.
+
+Settings are read when the application modules are imported, so the test
+database, log file and metadata cache are configured here, before any test
+module imports them. Every test runs against the same SQLite file; the
+``fresh_db`` fixture empties it.
+
+Run from the repository root:
+    python -m pytest backend/tests
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+TEST_DIR = tempfile.mkdtemp(prefix="leetcode-stats-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DIR}/test.db"
+os.environ["LOG_FILE"] = f"{TEST_DIR}/app.log"
+os.environ["METADATA_CACHE_PATH"] = ""
+os.environ["LEETCODE_SESSION"] = "test"
+
+
+async def _shutdown():
+    from backend import database
+    from backend.write_queue import write_queue
+
+    await write_queue.close()
+    await database.engine.dispose()
+    await database.read_engine.dispose()
+
+
+def run_async(coro):
+    """Run a coroutine on a new event loop, then release every connection.
+
+    Pooled aiosqlite connections must not outlive the loop that opened them.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await _shutdown()
+    return asyncio.run(main())
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion; see ``run_async``."""
+    return run_async
+
+
+@pytest.fixture
+def db_path() -> str:
+    """Path of the test database file."""
+    from backend import database
+    return str(database.db_path)
+
+
+@pytest.fixture
+def fresh_db(db_path):
+    """Empty database with the current schema, and empty in-process caches."""
+    from backend.database import engine
+    from backend.leetcode.cache import tag_cache
+    from backend.models import Base
+    from backend.recommendations import recommendation_engine
+    from backend.response_cache import response_cache
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    run_async(create())
+
+    tag_cache._ids.clear()
+    recommendation_engine._pools.clear()
+    response_cache.clear()
+    return db_path
@@ -0,0 +1,92 @@
+"""
+ETag and If-None-Match handling of the cached API routes.
+"""
+
+from datetime import date
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import database
+from backend.config import settings
+from backend.main import app
+from backend.response_cache import data_version, response_cache
+
+OVERVIEW = f"{settings.API_V1_PREFIX}/overview"
+DAILY = f"{settings.API_V1_PREFIX}/daily"
+TAGS = f"{settings.API_V1_PREFIX}/tags?start_date=2024-01-01&end_date=2024-12-31"
+TOMORROW = (date(2030, 1, 2), date(2030, 1, 2))
+
+
+@pytest.fixture
+def client(fresh_db, run):
+    # The startup event is not run, so nothing contacts LeetCode
+    yield TestClient(app)
+    run(database.read_engine.dispose())
+
+
+def test_first_request_returns_etag(client):
+    response = client.get(OVERVIEW)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"')
+
+
+def test_matching_if_none_match_returns_304_without_queries(client):
+    etag = client.get(OVERVIEW).headers["ETag"]
+    # Without the cached result, running the endpoint would query the database
+    response_cache.clear()
+
+    with mock.patch("backend.routers.stats.get_total_solved") as get_total_solved:
+        response = client.get(OVERVIEW, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    get_total_solved.assert_not_called()
+
+
+def test_data_change_gives_new_etag(client):
+    etag = client.get(OVERVIEW).headers["ETag"]
+
+    data_version.bump()
+    response = client.get(OVERVIEW, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_query_params_are_part_of_etag(client):
+    first = client.get(DAILY, params={"start_date": "2024-01-01"})
+    second = client.get(DAILY, params={"start_date": "2024-02-01"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+    response = client.get(DAILY, params={"start_date": "2024-02-01"},
+                          headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+
+
+def test_date_dependent_routes_change_with_the_date(client):
+    etag = client.get(DAILY).headers["ETag"]
+
+    with mock.patch("backend.response_cache.current_dates", return_value=TOMORROW), \
+            mock.patch("backend.routers.stats.get_daily_stats",
+                       return_value=[]) as get_daily_stats:
+        response = client.get(DAILY, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    # Computed again for the new date rather than served from the cache
+    get_daily_stats.assert_called_once()
+
+
+def test_explicit_date_ranges_ignore_the_date(client):
+    etag = client.get(TAGS).headers["ETag"]
+
+    with mock.patch("backend.response_cache.current_dates", return_value=TOMORROW):
+        response = client.get(TAGS, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
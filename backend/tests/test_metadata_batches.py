@@ -0,0 +1,69 @@
+"""
+Splitting of aliased question metadata batches.
+
+``_execute_query`` is replaced by a scripted server, so every request the
+fetcher would send is recorded with the slugs it asked for.
+"""
+
+from unittest import mock
+
+from backend.leetcode.fetcher import LeetCodeDataFetcher
+
+SLUGS = [f"question-{i}" for i in range(8)]
+
+
+def _fetcher(respond):
+    """A fetcher whose queries are answered by ``respond(slugs)``."""
+    fetcher = LeetCodeDataFetcher(mock.Mock(graphql_url="http://fake/graphql"))
+    requests = []
+
+    async def execute_query(query, variables, allow_partial=False):
+        slugs = list(variables.values())
+        requests.append(slugs)
+        return respond(variables)
+
+    fetcher._execute_query = execute_query
+    return fetcher, requests
+
+
+def _answer(variables, failing=()):
+    return {
+        'data': {alias: None if slug in failing else {'titleSlug': slug}
+                 for alias, slug in variables.items()},
+        'errors': [{'path': [alias], 'message': 'not found'}
+                   for alias, slug in variables.items() if slug in failing]
+    }
+
+
+def test_transport_failure_fails_the_whole_batch(run):
+    fetcher, requests = _fetcher(lambda variables: None)
+
+    metadata = run(fetcher.fetch_question_metadata_many(SLUGS, batch_size=8))
+
+    assert metadata == {slug: None for slug in SLUGS}
+    assert requests == [SLUGS]
+
+
+def test_rejected_batch_is_split(run):
+    def respond(variables):
+        if len(variables) > 2:
+            return {'data': None, 'errors': [{'message': 'query too complex'}]}
+        return _answer(variables)
+
+    fetcher, requests = _fetcher(respond)
+
+    metadata = run(fetcher.fetch_question_metadata_many(SLUGS, batch_size=8))
+
+    assert all(metadata[slug] == {'titleSlug': slug} for slug in SLUGS)
+    assert [len(slugs) for slugs in requests] == [8, 4, 2, 2, 4, 2, 2]
+
+
+def test_failed_alias_is_retried_alone(run):
+    fetcher, requests = _fetcher(
+        lambda variables: _answer(variables, failing={'question-3'}))
+
+    metadata = run(fetcher.fetch_question_metadata_many(SLUGS, batch_size=8))
+
+    assert metadata['question-3'] is None
+    assert all(metadata[slug] for slug in SLUGS if slug != 'question-3')
+    assert requests == [SLUGS, ['question-3']]
@@ -0,0 +1,49 @@
+"""
+Running totals and eviction of the persistent metadata cache.
+"""
+
+import sqlite3
+
+from backend.leetcode.metadata_store import MetadataStore
+
+
+def _table_totals(path: str) -> tuple:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM metadata_cache"
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def _metadata(start: int, count: int, text: str = "x") -> dict:
+    return {f"question-{i}": {'titleSlug': f"question-{i}", 'content': text * i}
+            for i in range(start, start + count)}
+
+
+def test_running_totals_follow_inserts_replacements_and_evictions(tmp_path, run):
+    path = str(tmp_path / "metadata.db")
+    store = MetadataStore(path, "fields", ttl=3600, max_bytes=2000)
+
+    async def fill():
+        for start in range(0, 200, 20):
+            await store.put_many(_metadata(start, 20))
+        # Replacing entries gives back their old size
+        await store.put_many(_metadata(190, 10, text="y"))
+        await store.put("question-0", {'titleSlug': 'question-0'})
+    run(fill())
+
+    stats = store.stats()
+    assert stats['evictions'] > 0
+    assert stats['size_bytes'] <= 2000
+    assert (stats['entries'], stats['size_bytes']) == _table_totals(path)
+    store.close()
+
+    # Totals are loaded again when a new process opens the file
+    reopened = MetadataStore(path, "fields", ttl=3600, max_bytes=2000)
+    found = run(reopened.get_many(["question-199", "question-1"]))
+    assert found["question-199"]['content'] == "y" * 199
+    assert (reopened.stats()['entries'],
+            reopened.stats()['size_bytes']) == _table_totals(path)
+    reopened.close()
@@ -0,0 +1,136 @@
+"""
+Query plan checks for the crud read paths.
+
+Every statement a crud function runs is explained with EXPLAIN QUERY PLAN
+against a small synthetic database (``backend.benchmarks.generate``, with
+ANALYZE statistics). A ``SCAN`` of any table, under its own name or a query
+alias, reads the whole table and fails the test unless it is listed in
+``ALLOWED_SCANS`` with the reason it stays cheap as the history grows.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from backend import crud, database
+from backend.benchmarks.generate import generate
+from backend.models import Base
+from backend.query_stats import _explain
+from backend.recommendations import recommendation_engine
+
+TABLES = set(Base.metadata.tables)
+
+# (crud function, table) -> why a full scan is acceptable there
+ALLOWED_SCANS = {
+    ('get_recommendations', 'questions'):
+        "builds the per-difficulty pools over the question catalogue; the "
+        "pools are cached until the data changes",
+    ('get_top_tags', 'tags'):
+        "the tag catalogue has a few dozen rows and each drives an index "
+        "search into question_tags",
+    ('get_total_solved', 'question_progress'):
+        "one row per attempted question, bounded by the catalogue; nearly "
+        "every row is solved, so an index would not narrow the count",
+}
+
+# A table reference followed by its alias, e.g. "submissions s" or
+# "question_tags AS qt"
+TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+NOT_ALIASES = {'on', 'where', 'join', 'left', 'inner', 'outer', 'group',
+               'order', 'limit', 'using', 'natural', 'cross', 'union'}
+
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+
+CRUD_CASES = {
+    'get_tag_stats': lambda: (_now() - timedelta(days=365), _now()),
+    'get_top_tags': lambda: (),
+    'get_daily_stats': lambda: (),
+    'get_total_solved': lambda: (),
+    'get_current_streak': lambda: (),
+    'get_best_streak': lambda: (),
+    'get_recommendations': lambda: (),
+    'get_due_reviews': lambda: (),
+}
+
+
+@pytest.fixture(scope="module")
+def synthetic_db(run):
+    path = str(database.db_path)
+    run(database.engine.dispose())
+    generate(path, submissions=5000, questions=500, days=365)
+    return path
+
+
+def _table_names(statement: str) -> dict:
+    """Map every name a table goes by in a statement, aliases included,
+    to the table."""
+    names = {table: table for table in TABLES}
+    for table, alias in TABLE_REFERENCE.findall(statement):
+        if table in TABLES and alias and alias.lower() not in NOT_ALIASES:
+            names[alias] = table
+    return names
+
+
+def _full_scans(statement: str, plan: list) -> list:
+    """Tables a plan scans in full, as (table, plan detail) pairs.
+
+    CTEs, subqueries and constant rows are not tables and are ignored.
+    """
+    names = _table_names(statement)
+    scans = []
+    for detail in plan:
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in names:
+            scans.append((names[match.group(1)], detail))
+    return scans
+
+
+async def _explain_crud(name: str) -> list:
+    """Run a crud function and explain every SELECT it issued."""
+    explained = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            explained.append(
+                (statement, _explain(conn, statement, parameters, executemany)))
+
+    # Build the recommendation pools instead of serving cached ones
+    recommendation_engine._pools.clear()
+
+    sync_engine = database.read_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with database.ReadSessionLocal() as db:
+            await getattr(crud, name)(db, *CRUD_CASES[name]())
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    return explained
+
+
+@pytest.mark.parametrize("name", sorted(CRUD_CASES))
+def test_crud_query_has_no_full_scan(name, synthetic_db, run):
+    explained = run(_explain_crud(name))
+
+    assert explained, f"{name} ran no queries"
+    for statement, plan in explained:
+        scans = [detail for table, detail in _full_scans(statement, plan)
+                 if (name, table) not in ALLOWED_SCANS]
+        assert not scans, f"{name} scans a table: {scans}\n{statement}"
+
+
+def test_alias_scans_are_detected():
+    statement = ("SELECT s.id FROM submissions s JOIN question_tags AS qt ON 1 "
+                 "JOIN questions ON 1")
+    assert _full_scans(statement, ["SCAN s"]) == [('submissions', "SCAN s")]
+    assert _full_scans(statement, ["SCAN qt USING COVERING INDEX x"]) == [
+        ('question_tags', "SCAN qt USING COVERING INDEX x")]
+    assert _full_scans(statement, ["SCAN questions"]) == [
+        ('questions', "SCAN questions")]
+    assert not _full_scans(statement, ["SEARCH s USING INDEX x (status=?)"])
+    assert not _full_scans(statement, ["SCAN daily_solved", "SCAN CONSTANT ROW"])
@@ -0,0 +1,109 @@
+"""
+Randomized check of the incrementally maintained streak_state row.
+
+Random batches of submissions, in random order and with status flips of
+already stored submissions, are written through DatabaseWriter. After every
+batch the streak_state row must match the window-function streak query the
+crud functions used before the rollup, run over the raw submissions.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from backend import crud, database
+from backend.leetcode.writer import DatabaseWriter
+from backend.models import StreakState
+
+STATUSES = ['Accepted', 'Wrong Answer', 'Runtime Error']
+QUESTIONS = 5
+DAYS = 60
+BATCHES = 25
+
+# Streaks recomputed from scratch: consecutive days with an accepted
+# submission share DATE(day, -row_number days)
+BASELINE_STREAKS = """
+WITH daily_solved AS (
+    SELECT DISTINCT DATE(submitted_at) AS solve_date
+    FROM submissions
+    WHERE status = 'Accepted'
+),
+streak_groups AS (
+    SELECT
+        solve_date,
+        DATE(solve_date, '-' || ROW_NUMBER() OVER (ORDER BY solve_date) || ' days') AS group_start
+    FROM daily_solved
+),
+streaks AS (
+    SELECT group_start, MAX(solve_date) AS streak_end, COUNT(*) AS streak_length
+    FROM streak_groups
+    GROUP BY group_start
+)
+SELECT
+    (SELECT streak_length FROM streaks ORDER BY streak_end DESC LIMIT 1) AS current_length,
+    (SELECT MAX(streak_length) FROM streaks) AS best_length
+"""
+
+
+def _random_batch(rng: random.Random, start: datetime, stored: dict) -> list:
+    """New submissions on random days, plus status flips of stored ones."""
+    batch = []
+    for _ in range(rng.randint(1, 8)):
+        submitted_at = start + timedelta(
+            days=rng.randrange(DAYS), seconds=rng.randrange(86400))
+        batch.append({
+            'titleSlug': f"q{rng.randrange(QUESTIONS)}",
+            'timestamp': str(int(submitted_at.timestamp())),
+            'statusDisplay': rng.choice(STATUSES)
+        })
+    for key in rng.sample(sorted(stored), min(len(stored), rng.randint(0, 3))):
+        flipped = 'Wrong Answer' if stored[key] == 'Accepted' else 'Accepted'
+        batch.append({'titleSlug': key[0], 'timestamp': key[1],
+                      'statusDisplay': flipped})
+    rng.shuffle(batch)
+    return batch
+
+
+async def _check_streaks(seed: int):
+    rng = random.Random(seed)
+    writer = DatabaseWriter()
+    for i in range(QUESTIONS):
+        await writer.store_question({
+            'frontendId': str(i + 1),
+            'title': f"Question {i}",
+            'titleSlug': f"q{i}",
+            'difficulty': 'Easy'
+        })
+
+    start = datetime.now().replace(microsecond=0) - timedelta(days=DAYS)
+    stored = {}
+    for number in range(BATCHES):
+        batch = _random_batch(rng, start, stored)
+        if rng.random() < 0.3:
+            for submission in batch:
+                await writer.store_submission(submission)
+        else:
+            await writer.store_submissions_bulk(batch)
+        for submission in batch:
+            stored[(submission['titleSlug'], submission['timestamp'])] = \
+                submission['statusDisplay']
+
+        async with database.ReadSessionLocal() as db:
+            expected = (await db.execute(text(BASELINE_STREAKS))).one()
+            state = (await db.execute(select(StreakState))).scalar_one_or_none()
+            current = await crud.get_current_streak(db)
+            best = await crud.get_best_streak(db)
+
+        context = f"seed {seed}, batch {number}"
+        assert current == (expected.current_length or 0), context
+        assert best == (expected.best_length or 0), context
+        if state is not None:
+            assert state.current_length == current, context
+            assert state.best_length == best, context
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_incremental_streaks_match_full_recompute(seed, fresh_db, run):
+    run(_check_streaks(seed))
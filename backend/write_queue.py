@@ -0,0 +1,149 @@
+"""
+Serialized database writer for the LeetCode Stats application.
+
+SQLite allows a single writer at a time. Instead of letting every caller
+open its own write transaction and contend for the lock, write units are
+queued and executed by one task on the writer connection. Units that are
+already waiting when a transaction starts are committed together (group
+commit), so a burst of small writes costs one fsync instead of many.
+
+A write unit is an async callable that takes an AsyncSession, performs its
+statements without committing, and returns a result. Side effects that must
+only happen once the data is durable are registered with ``after_commit``.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .database import AsyncSessionLocal
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+WriteUnit = Callable[[AsyncSession], Awaitable[Any]]
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Run a callback once the current write transaction has committed.
+
+    Args:
+        session: AsyncSession - Session passed to the write unit
+        callback: Callable[[], Any] - Function to call after the commit
+    """
+    session.info.setdefault('after_commit', []).append(callback)
+
+
+class WriteQueue:
+    """Queue of write units executed by a single writer task."""
+
+    def __init__(self, session_factory=AsyncSessionLocal,
+                 max_group: int = settings.WRITE_GROUP_MAX_UNITS):
+        self.session_factory = session_factory
+        self.max_group = max(1, max_group)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.commits = 0
+        self.units = 0
+
+    async def submit(self, unit: WriteUnit) -> Any:
+        """Queue a write unit and wait until it has been committed.
+
+        Args:
+            unit: WriteUnit - Async callable taking the writer session
+
+        Returns:
+            Any: The unit's return value
+
+        Raises:
+            Exception: Whatever the unit raised; its writes are rolled back
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((unit, future))
+        return await future
+
+    async def close(self):
+        """Finish queued writes and stop the writer task."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            group = [await self._queue.get()]
+            while len(group) < self.max_group and not self._queue.empty():
+                group.append(self._queue.get_nowait())
+
+            try:
+                await self._commit_group(group)
+            except Exception as e:
+                logger.error(f"Write queue error: {str(e)}", exc_info=True)
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in group:
+                    self._queue.task_done()
+
+    async def _commit_group(self, group: List[Tuple[WriteUnit, asyncio.Future]]):
+        """Run a group of units in one transaction.
+
+        If any unit fails, the transaction is rolled back and each unit is
+        retried in its own transaction so one bad write doesn't sink the rest.
+        """
+        async with self.session_factory() as session:
+            try:
+                results = [await unit(session) for unit, _ in group]
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                if len(group) == 1:
+                    if not group[0][1].done():
+                        group[0][1].set_exception(e)
+                    return
+                logger.warning(
+                    f"Group commit of {len(group)} writes failed, retrying individually: {str(e)}")
+                for item in group:
+                    await self._commit_group([item])
+                return
+
+            callbacks = session.info.pop('after_commit', [])
+
+        self.commits += 1
+        self.units += len(group)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"After-commit callback failed: {str(e)}", exc_info=True)
+        for (_, future), result in zip(group, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Shared by every DatabaseWriter in the process
+write_queue = WriteQueue()
+
+registry.gauge_callback(
+    "write_queue_commits", "Transactions committed by the write queue",
+    lambda: write_queue.commits)
+registry.gauge_callback(
+    "write_queue_units", "Write units executed by the write queue",
+    lambda: write_queue.units)